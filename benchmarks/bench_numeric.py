@@ -0,0 +1,54 @@
+"""Benchmark of value text formatting/parsing, run with `python benchmarks/bench_numeric.py`"""
+
+import random
+import timeit
+from array import array
+
+from animl2.models.data_type import (
+    SERIALIZE_DOUBLE,
+    SERIALIZE_FLOAT,
+    SERIALIZE_INT,
+    SERIALIZE_LONG,
+)
+from animl2.utils.numeric import format_values, parse_values
+
+COUNT = 1_000_000
+
+SERIALIZERS = {
+    "Float64": SERIALIZE_DOUBLE,
+    "Float32": SERIALIZE_FLOAT,
+    "Int32": SERIALIZE_INT,
+    "Int64": SERIALIZE_LONG,
+}
+
+
+def bench(name: str, stmt, number: int = 3):
+    s = min(timeit.repeat(stmt, number=1, repeat=number))
+    print(f"{name:<40} {s * 1e3:8.0f} ms")
+
+
+def main():
+    rng = random.Random(0)
+    data = {
+        "Float64": array("d", (rng.uniform(-1e6, 1e6) for _ in range(COUNT))),
+        "Float32": array("d", (rng.uniform(-1e6, 1e6) for _ in range(COUNT))),
+        "Int32": array("i", (rng.randint(-(2**31), 2**31 - 1) for _ in range(COUNT))),
+        "Int64": array("q", (rng.randint(-(2**63), 2**63 - 1) for _ in range(COUNT))),
+    }
+
+    for type_name, values in data.items():
+        serializer = SERIALIZERS[type_name]
+        serialize = serializer["on_serialize"]
+        deserialize = serializer["on_deserialize"]
+        texts = format_values(values, type_name)
+        assert texts == [serialize(v) for v in values]
+
+        print(f"{type_name} ({COUNT:,} values)")
+        bench("format, per value", lambda: [serialize(v) for v in values])
+        bench("format_values", lambda: format_values(values, type_name))
+        bench("parse, per value", lambda: [deserialize(t) for t in texts])
+        bench("parse_values", lambda: parse_values(texts, type_name))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,41 @@
+"""Micro-benchmark of field validation, run with `python benchmarks/bench_validators.py`"""
+
+import re
+import timeit
+
+from animl2.core import ATTRIB
+from animl2.utils.regex import NC_NAME, SHA256, TOKEN
+from animl2.utils.validators import is_nc_name, is_sha256, is_token
+
+NUMBER = 1_000_000
+
+
+def bench(name: str, stmt, number: int = NUMBER):
+    ns = timeit.timeit(stmt, number=number) / number * 1e9
+    print(f"{name:<40} {ns:8.0f} ns")
+
+
+def main():
+    nc_name = "sample-id_00042.a"
+    token = "Token with spaces"
+    sha256 = "0123456789abcdef" * 4
+
+    field = ATTRIB(regex=NC_NAME)
+    field.name = "id"
+
+    print("NCName")
+    bench("re.match(NC_NAME, value)", lambda: re.match(NC_NAME, nc_name))
+    bench("is_nc_name(value)", lambda: is_nc_name(nc_name))
+    bench("Field.validate_ex(value)", lambda: field.validate_ex(nc_name))
+
+    print("Token")
+    bench("re.match(TOKEN, value)", lambda: re.match(TOKEN, token))
+    bench("is_token(value)", lambda: is_token(token))
+
+    print("SHA256")
+    bench("re.match(SHA256, value)", lambda: re.match(SHA256, sha256))
+    bench("is_sha256(value)", lambda: is_sha256(sha256))
+
+
+if __name__ == "__main__":
+    main()
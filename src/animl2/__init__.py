@@ -1,7 +1,8 @@
-from .models import AnIMLDoc, create_document, open_document
+from .models import AnIMLDoc, create_document, iter_experiment_steps, open_document
 
 __all__ = [
     AnIMLDoc,
     create_document,
+    iter_experiment_steps,
     open_document,
 ]
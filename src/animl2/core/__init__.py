@@ -1,11 +1,22 @@
 from .base import XmlModel, scrub_namespace
 from .fields import ATTRIB, CHILD, TEXT, Field
+from .plan import FieldPlan
+from .query import Query
+from .select import Selection
+from .stream import iterparse_model, iterparse_models, strip_namespace, write_model
 
 __all__ = [
     "ATTRIB",
     "CHILD",
     "Field",
+    "FieldPlan",
+    "iterparse_model",
+    "iterparse_models",
+    "Query",
     "scrub_namespace",
+    "Selection",
+    "strip_namespace",
     "TEXT",
+    "write_model",
     "XmlModel",
 ]
@@ -1,9 +1,20 @@
 from __future__ import annotations
 
 import re
-from dataclasses import dataclass
+from collections.abc import MutableSequence
+from dataclasses import dataclass, field
+from functools import cached_property
 from pydoc import locate
-from typing import Any, Type, Union, _GenericAlias, _SpecialForm, _UnionGenericAlias
+from typing import (
+    Any,
+    Mapping,
+    Optional,
+    Type,
+    Union,
+    _GenericAlias,
+    _SpecialForm,
+    _UnionGenericAlias,
+)
 
 NoneType = type(None)
 
@@ -13,11 +24,20 @@ class Annotation:
     tType: Union[str, type, None]
     subType: tuple[Union[Annotation, None], ...] = tuple()
 
-    @property
+    # Resolved types and the registry they were resolved with (see resolve_types)
+    _resolved: Optional[tuple[Mapping[str, Type], tuple[type, ...]]] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+    # Types that can not be created from values of a type, keyed by value type
+    _mismatches: dict[type, tuple[type, ...]] = field(
+        default_factory=dict, init=False, repr=False, compare=False
+    )
+
+    @cached_property
     def isList(self):
         return self.validtype(list)
 
-    @property
+    @cached_property
     def isOptional(self):
         return self.tType == Union and self.validsubtype(NoneType)
 
@@ -29,45 +49,78 @@ class Annotation:
             return re
         return [self.tType]
 
-    # TODO: Refactor this function to prevent C901
-    # flake8: noqa: C901
-    def check_type_ex(self, value: Any, name: str, registered_types: dict[str, Type]):
+    def content_types(self):
+        """Get all types accepted as content, unwrapping unions and lists (excluding None)"""
+        if self.tType == Union or self.tType == list:
+            re = []
+            for t in self.subType:
+                re.extend(x for x in t.content_types() if x not in re)
+            return re
+        if self.tType is NoneType:
+            return []
+        return [self.tType]
+
+    def resolve_types(self, registered_types: Mapping[str, Type]) -> tuple[type, ...]:
+        """Get the python types matching this annotation, resolved once per registry
+
+        Args:
+            registered_types (Mapping[str, Type]): Registry used to look up type names, \
+                must not be modified after being passed in (see XmlDocBase.get_registered_types_view)
+        """
+        cached = self._resolved
+        if cached is not None and cached[0] is registered_types:
+            return cached[1]
+
+        all_types = [t for t in self.all_types() if t is not NoneType]
+        names = [t for t in all_types if isinstance(t, str)]
+
+        found = [t for t in all_types if not isinstance(t, str)]
+        found.extend(registered_types.get(t) for t in names)
+        if names:
+            reg_types_true_names = {v.__name__: v for v in registered_types.values()}
+            found.extend(reg_types_true_names.get(t) for t in names)
+            found.extend(locate(t) for t in names)  # Use for built in types
+
+        types: list[type] = []
+        for t in found:
+            if isinstance(t, type) and t not in types:
+                types.append(t)
+
+        self._resolved = (registered_types, tuple(types))
+        return self._resolved[1]
+
+    def check_type_ex(
+        self, value: Any, name: str, registered_types: Mapping[str, Type]
+    ):
         """Check if provided value is valid for this annotation, if not raise an exception"""
-        if value is None and not self.isOptional:
-            raise ValueError(f"Field '{name}' is not optional")
         if value is None:
+            if not self.isOptional:
+                raise ValueError(f"Field '{name}' is not optional")
             return  # No value is ok
 
-        def get_types():
-            all_types = self.all_types()
-            for t in all_types:
-                yield None if isinstance(t, str) else t  # Not string
-            for t in all_types:
-                yield registered_types.get(t)
-            reg_types_true_names = {v.__name__: v for v in registered_types.values()}
-            for t in all_types:
-                yield reg_types_true_names.get(t)
-            for t in all_types:
-                yield locate(t)  # Use for built in types
-            # raise TypeError(f"Type '{self.tType}' not found")
+        types = self.resolve_types(registered_types)
+        if isinstance(value, types):  # Matching type
+            return
+        if self.isList and isinstance(value, MutableSequence):  # list or list-like
+            return
 
         # self can be a range of types
-        # Need check if any can be created from the value
-
-        for t in get_types():
-            if t is None:
+        # Need check if any can be created from the value, e.g. an enum from a str.
+        # Types that fail with anything but a ValueError can not be created from
+        # this type of value at all, and are skipped from then on.
+        value_type = type(value)
+        mismatches = self._mismatches.get(value_type, ())
+        for t in types:
+            if t in mismatches:
                 continue
-            if isinstance(value, t):  # Matching type
-                return
-            if isinstance(value, list) and self.isList:
-                return
             try:
                 t(value)  # Try to convert
                 return  # Conversion successful
             except ValueError:
                 raise
             except Exception:
-                pass
+                mismatches += (t,)
+                self._mismatches[value_type] = mismatches
 
         raise TypeError(
             f"Type mismatch. Expected: '{self.tType}', got: '{type(value).__name__}'"
@@ -1,9 +1,17 @@
 from __future__ import annotations
 
 import logging
+from contextvars import ContextVar
 from enum import Enum
+from types import MappingProxyType
 from typing import (
     Any,
+    Callable,
+    Iterable,
+    Iterator,
+    Mapping,
+    Optional,
+    Union,
     _AnnotatedAlias,
     _SpecialForm,
     get_args,
@@ -11,12 +19,20 @@ from typing import (
     overload,
 )
 from xml.etree import ElementTree as ET
+from xml.sax.saxutils import escape
 
 from .annotations import Annotation
+from .compiler import get_compiled
 from .fields import Field
+from .plan import ChildRoute, FieldPlan
+from .query import Query
+from .select import Selection
 
 logger = logging.getLogger(__name__)
 
+# Cleared while loading trusted (previously validated) documents
+_validating: ContextVar[bool] = ContextVar("validating", default=True)
+
 
 class XmlMeta(type):
     """Meta class used to evaluate fields on class definition"""
@@ -98,7 +114,14 @@ class XmlMeta(type):
 
 
 class XmlDocBase:
-    """Base class for registering XmlModel classes for deserialization"""
+    """Base class for registering XmlModel classes for deserialization
+
+    Args:
+        compile_models (bool): If True, registered models generate specialized \
+            load/dump functions on first use instead of interpreting their fields
+    """
+
+    compile_models: bool = False
 
     @classmethod
     def get_registered_types(cls):
@@ -107,6 +130,15 @@ class XmlDocBase:
             cls._static_dict: dict[str, type] = {}
         return cls._static_dict.copy()
 
+    @classmethod
+    def get_registered_types_view(cls) -> Mapping[str, type]:
+        """Get a read-only snapshot of all registered types, replaced on register"""
+        view = cls.__dict__.get("_static_view")
+        if view is None:
+            view = MappingProxyType(cls.get_registered_types())
+            cls._static_view = view
+        return view
+
     @classmethod
     def register(cls, key, value):
         """Register a type for deserialization"""
@@ -118,8 +150,34 @@ class XmlDocBase:
         #    return
         if key in cls._static_dict and not cls.equal(cls._static_dict[key], value):
             raise ValueError(f"Type '{key}' already registered")
-        else:
-            cls._static_dict[key] = value
+        if isinstance(value, type) and issubclass(value, XmlModel):
+            other = cls.get_tag_index().get(value.tag)
+            if other is not None and not cls.equal(other, value):
+                raise ValueError(f"Multiple classes with tag '{value.tag}'")
+        cls._static_dict[key] = value
+        cls._tag_index = None  # Invalidate, rebuilt on next lookup
+        cls._static_view = None
+
+    @classmethod
+    def get_tag_index(cls) -> dict[str, type[XmlModel]]:
+        """Get all registered XmlModel types, keyed by their XML tag"""
+        index = cls.__dict__.get("_tag_index")
+        if index is None:
+            index = {
+                v.tag: v
+                for v in getattr(cls, "_static_dict", {}).values()
+                if isinstance(v, type) and issubclass(v, XmlModel)
+            }
+            cls._tag_index = index
+        return index
+
+    @classmethod
+    def lookup_tag(cls, tag: str) -> type[XmlModel]:
+        """Get the registered XmlModel type matching an XML tag"""
+        try:
+            return cls.get_tag_index()[tag]
+        except KeyError:
+            raise ValueError(f"Unable to find class with tag '{tag}'") from None
 
     @classmethod
     def equal(cls, cls1: object, cls2: object):
@@ -152,9 +210,13 @@ class XmlModel(metaclass=XmlMeta):
     Args:
         tag (str): Element tag to use when serializing this model, if None will use class name
         _fields (list[Field.Base]): List of all serializable fields (attributes, children, text)
+        _load_whole_ (bool): If True, streaming loads pass the complete element to \
+            load_xml, instead of loading the children one by one first. Set on models \
+            overriding _load_xml_children_.
     """
 
     tag: str = None  # Override in subclass if tag is different from class name
+    _load_whole_ = False
 
     def __init__(self, *args, **kwargs):
         raise Exception(
@@ -164,7 +226,8 @@ class XmlModel(metaclass=XmlMeta):
     def __post_init__(self) -> None:
         type(self)._register_fields_()  # Initialize fields
 
-        self._validate_fields_()  # Validate fields
+        if _validating.get():
+            self._validate_fields_()  # Validate fields
 
     @classmethod
     def _check_restrictions_(cls, fields: list[Field.Base]):
@@ -175,10 +238,11 @@ class XmlModel(metaclass=XmlMeta):
             raise TypeError(f"Only one text field allowed ({cls.__name__})")
 
     def _validate_fields_(self) -> None:
+        registered_types = self.regclass.get_registered_types_view()
         for i in self._fields:
             name = i.name
             value = getattr(self, name)
-            i.annotation.check_type_ex(value, name, type(self).get_registered_types())
+            i.annotation.check_type_ex(value, name, registered_types)
             i.validate_ex(value)
 
     @classmethod
@@ -209,8 +273,28 @@ class XmlModel(metaclass=XmlMeta):
 
         cls._check_restrictions_(cls._fields)
 
+        cls._plan = FieldPlan(cls._fields, resolve=cls._resolve_child_type_)
+
         setattr(cls, "_fields_initialized", True)
 
+    @classmethod
+    def _resolve_child_type_(cls, t: Union[type, str]) -> Optional[type[XmlModel]]:
+        """Helper function for mapping a child field type to the model loading it"""
+        if isinstance(t, str):  # Forward reference, look up by name
+            registered = cls.get_registered_types()
+            if t not in registered:
+                registered = {v.__name__: v for v in registered.values()}
+            t = registered.get(t)
+        if isinstance(t, type) and issubclass(t, XmlModel) and t is not XmlModel:
+            return t
+        return None
+
+    @classmethod
+    def get_field_plan(cls) -> FieldPlan:
+        """Get the precomputed field lookup tables for this model"""
+        cls._register_fields_()  # Initialize fields
+        return cls._plan
+
     @overload
     @classmethod
     def _get_fields_(
@@ -230,6 +314,12 @@ class XmlModel(metaclass=XmlMeta):
         """Helper function for getting fields of a specific type"""
         if mask is None:
             return cls._fields
+        if mask is Field.Attribute:
+            return list(cls._plan.attributes)
+        if mask is Field.Child:
+            return list(cls._plan.children)
+        if mask is Field.Text:
+            return [cls._plan.text] if cls._plan.text is not None else []
         return list(filter(lambda x: isinstance(x, mask), cls._fields))
 
     def dump_xml(self) -> ET.Element:
@@ -237,6 +327,11 @@ class XmlModel(metaclass=XmlMeta):
 
         type(self)._register_fields_()  # Initialize fields
 
+        if self.regclass.compile_models:
+            compiled = get_compiled(type(self))
+            if compiled is not None:
+                return compiled.dump(self)
+
         x = ET.Element(self.tag)
 
         # Dump attributes
@@ -253,7 +348,7 @@ class XmlModel(metaclass=XmlMeta):
     def _dump_xml_attributes_(self):
         """Helper function for dumping attributes to XML"""
         items: dict[str, Any] = {}
-        for field in type(self)._get_fields_(Field.Attribute):
+        for name, field in type(self)._plan.attributes_by_name.items():
             if getattr(self, field.name) is None:
                 continue
 
@@ -266,15 +361,17 @@ class XmlModel(metaclass=XmlMeta):
                     raise TypeError(f"Enum value must be string '{self.tag}'")
                 attr = attr.value  # Return value of enum i.e. string
 
-            items[field.get_name()] = attr
+            items[name] = attr
 
         return items
 
     def _dump_xml_children_(self) -> list[ET.Element]:
         """Helper function for dumping children to XML"""
-        items = []
+        return [i.dump_xml() for i in self._iter_xml_children_()]
 
-        for field in type(self)._get_fields_(Field.Child):
+    def _iter_xml_children_(self) -> Iterator[XmlModel]:
+        """Helper function for getting the child models to serialize, in order"""
+        for field in type(self)._plan.children:
             try:
                 model = field.validate_ex(getattr(self, field.name))
             except AttributeError:
@@ -284,22 +381,28 @@ class XmlModel(metaclass=XmlMeta):
             if isinstance(model, list):
                 for i in model:
                     if isinstance(i, XmlModel):
-                        items.append(i.dump_xml())
+                        yield i
                     else:
-                        raise TypeError
+                        raise TypeError(
+                            f"Expected XmlModel in '{field.name}', got {type(i).__name__}"
+                        )
             elif isinstance(model, XmlModel):
-                items.append(model.dump_xml())
+                yield model
             else:
-                raise TypeError
+                raise TypeError(
+                    f"Expected XmlModel or list in '{field.name}', "
+                    f"got {type(model).__name__}"
+                )
 
-        return items
+    def _write_xml_text_(self, write: Callable[[bytes], Any]) -> None:
+        """Helper function for writing text content as escaped UTF-8, see `write_model`"""
+        text = self._dump_xml_text_()
+        if text is not None:
+            write(escape(text).encode("utf-8"))
 
     def _dump_xml_text_(self):
         """Helper function for dumping text content to XML"""
-        try:
-            text = type(self)._get_fields_(Field.Text)[0]  # There can be only one
-        except IndexError:
-            text = None
+        text = type(self)._plan.text  # There can be only one
 
         if text is not None:  # There is a text field
             t = text.validate_ex(text.serialize(getattr(self, text.name)))
@@ -324,12 +427,64 @@ class XmlModel(metaclass=XmlMeta):
 
         return None
 
+    def select(self, path: str) -> list[XmlModel]:
+        """Get the models at a path below this one, e.g. `Result/SeriesSet/Series`
+
+        Steps may be '*' and have attribute predicates, e.g. `Series[@seriesID='x']`,
+        see `Selection` for the syntax. Compiled queries are cached by path,
+        use `Query` directly to run one on many models.
+        """
+        return Query.compile(path).run(self)
+
+    def validate(self) -> None:
+        """Validate this model and all of its children, raises on the first invalid field
+
+        Used to check models that were loaded with validation disabled.
+        """
+        type(self)._register_fields_()  # Initialize fields
+
+        self._validate_fields_()
+
+        for field in type(self)._plan.children:
+            value = getattr(self, field.name)
+            for child in value if isinstance(value, list) else [value]:
+                if isinstance(child, XmlModel):
+                    child.validate()
+
     @classmethod
-    def load_xml(cls, x: ET.Element):
-        """Create an XmlModel from an XML etree object"""
+    def load_xml(
+        cls,
+        x: ET.Element,
+        validate: Optional[bool] = None,
+        include: Union[Selection, Iterable[str], None] = None,
+    ):
+        """Create an XmlModel from an XML etree object
+
+        Args:
+            x (ET.Element): XML Element to load
+            validate (bool | None): If False, fields are not validated, use for \
+                trusted input only (see `validate()`). Defaults to the setting of \
+                the enclosing load, or True.
+            include (Selection | Iterable[str] | None): Only load these paths, \
+                relative to x, see `Selection`. Defaults to everything.
+        """
+        if include is not None:
+            return cls.load_xml(Selection.create(include).prune(x), validate=validate)
+
+        if validate is not None and validate != _validating.get():
+            token = _validating.set(validate)
+            try:
+                return cls.load_xml(x)
+            finally:
+                _validating.reset(token)
 
         cls._register_fields_()  # Initialize fields
 
+        if cls.regclass.compile_models:
+            compiled = get_compiled(cls)
+            if compiled is not None:
+                return compiled.load(x)
+
         # Check matching tag
         if x.tag != cls.tag:
             raise ValueError(f"Expected tag '{cls.tag}', got '{x.tag}'")
@@ -349,6 +504,37 @@ class XmlModel(metaclass=XmlMeta):
         # Create instance and return
         return cls(**arguments)
 
+    @classmethod
+    def _build_xml_(cls, x: ET.Element, children: Iterable[tuple[str, XmlModel]]):
+        """
+        Create an XmlModel from an XML etree object whose children are already loaded
+
+        Used when parsing incrementally, where the child elements of x are
+        consumed (and cleared) before x itself is complete.
+
+        Args:
+            x (ET.Element): XML Element to load attributes and text from
+            children (Iterable[tuple[str, XmlModel]]): Tag and model of each child, in order
+        """
+        cls._register_fields_()  # Initialize fields
+
+        if cls.regclass.compile_models:
+            compiled = get_compiled(cls)
+            if compiled is not None:
+                return compiled.build(x, children)
+
+        # Check matching tag
+        if x.tag != cls.tag:
+            raise ValueError(f"Expected tag '{cls.tag}', got '{x.tag}'")
+
+        arguments = {}
+        arguments.update(cls._load_xml_attributes_(x))
+        arguments.update(cls._load_xml_text_(x))
+        for tag, child_inst in children:
+            cls._assign_xml_child_(arguments, tag, child_inst)
+
+        return cls(**arguments)
+
     @classmethod
     def _load_xml_attributes_(cls, x: ET.Element):
         """
@@ -358,12 +544,10 @@ class XmlModel(metaclass=XmlMeta):
             x (ET.Element): XML Element to load attributes from
         """
         arguments = {}
+        validate = _validating.get()
 
         # TODO: Check that no additional fields are present
-        for attr in cls._get_fields_(Field.Attribute):
-            # Replace name with alias if present
-            name = attr.alias if attr.alias is not None else attr.name
-
+        for name, attr in cls._plan.attributes_by_name.items():
             if attr.annotation.isOptional:
                 if name not in x.attrib:
                     continue  # Skip optional fields that are not present
@@ -371,7 +555,9 @@ class XmlModel(metaclass=XmlMeta):
             if name not in x.attrib:
                 raise ValueError(f"Missing attribute '{x.tag}.{name}'")
 
-            val = attr.validate_ex(attr.deserialize(x.attrib[name]))
+            val = attr.deserialize(x.attrib[name])
+            if validate:
+                val = attr.validate_ex(val)
 
             # Check if should be enum -> Convert to enum if so
             # Coverage is not 100% here, but good enough for now
@@ -393,33 +579,40 @@ class XmlModel(metaclass=XmlMeta):
         """
         arguments = {}
 
-        child_fields = cls._get_fields_(Field.Child)
+        routes = cls._plan.routes
         for child in x:
-            # Create child instance from xml
-            child_inst = cls.class_from_tag(child.tag).load_xml(child)
-
-            # Find a field that matches the child
-            a = [x for x in child_fields if x.annotation.validcontent(type(child_inst))]
-
-            if len(a) > 1:
-                # Check if any but the last is lists -> error
-                if any([x.annotation.isList for x in a[:-1]]):
-                    raise ValueError(f"Unreachable field found for child '{child.tag}'")
-                # Check which ones are occupied (in arguments), and filter a
-                a = [x for x in a if x.name not in arguments]
-            if len(a) == 0:
+            route = routes.get(child.tag)
+            if route is None:  # Not a declared child type, resolve through registry
+                child_inst = cls.class_from_tag(child.tag).load_xml(child)
+                cls._assign_xml_child_(arguments, child.tag, child_inst)
+            elif not route.assign(arguments, route.model.load_xml(child)):
                 raise ValueError(f"Unable to find field for child '{child.tag}'")
 
-            child_field = a[0]
+        return arguments
 
-            if child_field.annotation.isList:
-                if child_field.name not in arguments:  # No list found
-                    arguments[child_field.name] = list()
-                arguments[child_field.name].append(child_inst)
-            else:
-                arguments[child_field.name] = child_inst
+    @classmethod
+    def _assign_xml_child_(cls, arguments: dict[str, Any], tag: str, child_inst):
+        """
+        Helper function for storing a loaded child in the field it belongs to
 
-        return arguments
+        Args:
+            arguments (dict[str, Any]): Arguments collected so far, updated in place
+            tag (str): XML tag of the child
+            child_inst (XmlModel): Loaded child
+        """
+        route = cls._plan.routes.get(tag)
+        if route is None or route.model is not type(child_inst):
+            # Find the fields that match the child
+            a = cls._plan.match_children(type(child_inst))
+            # Check if any but the last is lists -> error
+            if any([x.annotation.isList for x in a[:-1]]):
+                raise ValueError(f"Unreachable field found for child '{tag}'")
+            route = ChildRoute(
+                type(child_inst), a, tuple(x.annotation.isList for x in a)
+            )
+
+        if not route.assign(arguments, child_inst):
+            raise ValueError(f"Unable to find field for child '{tag}'")
 
     @classmethod
     def _load_xml_text_(cls, x: ET.Element):
@@ -432,17 +625,15 @@ class XmlModel(metaclass=XmlMeta):
         arguments = {}
 
         # TODO: Check that text is not present if not allowed
-        try:
-            txt = cls._get_fields_(Field.Text)[0]
-        except IndexError:
+        txt = cls._plan.text
+        if txt is None:
             return arguments
-        except Exception as e:
-            raise e
 
         if x.text is None and not txt.annotation.isOptional:
             raise ValueError(f"Missing required text field '{x.tag}.{txt.name}'")
 
-        arguments[txt.name] = txt.validate_ex(txt.deserialize(x.text))
+        val = txt.deserialize(x.text)
+        arguments[txt.name] = txt.validate_ex(val) if _validating.get() else val
 
         return arguments
 
@@ -459,16 +650,7 @@ class XmlModel(metaclass=XmlMeta):
     @classmethod
     def class_from_tag(cls, tag: str):
         """Helper function for getting an XmlModel subclass from a name-string"""
-
-        all_models = cls.get_registered_types().values()
-        L = list(filter(lambda x: issubclass(x, XmlModel) and x.tag == tag, all_models))
-
-        if len(L) == 0:
-            raise ValueError(f"Unable to find class with tag '{tag}'")
-        elif len(L) > 1:
-            raise ValueError(f"Multiple classes with tag '{tag}'")
-        else:
-            return L[0]
+        return cls.regclass.lookup_tag(tag)
 
 
 def scrub_namespace(x: ET.Element):
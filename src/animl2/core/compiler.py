@@ -0,0 +1,251 @@
+from __future__ import annotations
+
+import logging
+from enum import Enum
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Iterable,
+    NamedTuple,
+    Optional,
+    _AnnotatedAlias,
+    _SpecialForm,
+)
+from xml.etree import ElementTree as ET
+
+from .fields import Field
+
+if TYPE_CHECKING:
+    from .base import XmlModel
+
+logger = logging.getLogger(__name__)
+
+
+class CompiledModel(NamedTuple):
+    """Specialized load/dump functions generated for a single XmlModel subclass
+
+    Attributes:
+        load (Callable[[ET.Element], XmlModel]): Replacement for `XmlModel.load_xml`
+        build (Callable[[ET.Element, Iterable], XmlModel]): Replacement for `XmlModel._build_xml_`
+        dump (Callable[[XmlModel], ET.Element]): Replacement for `XmlModel.dump_xml`
+        source (str): Generated python source, kept for debugging
+    """
+
+    load: Callable[[ET.Element], XmlModel]
+    build: Callable[[ET.Element, Iterable[tuple[str, XmlModel]]], XmlModel]
+    dump: Callable[[XmlModel], ET.Element]
+    source: str
+
+
+def get_compiled(cls: type[XmlModel]) -> Optional[CompiledModel]:
+    """Get the compiled functions of a model, compiling them on first use
+
+    Returns None if the model could not be compiled, in which case the
+    interpreted load/dump path is to be used.
+    """
+    compiled = cls.__dict__.get("_compiled")
+    if compiled is None:
+        try:
+            compiled = compile_model(cls)
+        except Exception as e:
+            logger.warning(f"Unable to compile '{cls.__name__}', using fallback: {e}")
+            compiled = False
+        cls._compiled = compiled
+    return compiled if compiled is not False else None
+
+
+def compile_model(cls: type[XmlModel]) -> CompiledModel:
+    """Generate straight-line load/dump functions from the field plan of a model"""
+    from .base import XmlModel, _validating
+
+    plan = cls.get_field_plan()
+
+    namespace: dict[str, Any] = {
+        "_cls": cls,
+        "_tag": cls.tag,
+        "_Element": ET.Element,
+        "_Enum": Enum,
+        "_XmlModel": XmlModel,
+        "_routes": plan.routes,
+        "_assign": cls._assign_xml_child_,
+        "_lookup": cls.class_from_tag,
+        "_validating": _validating,
+    }
+
+    load = ["def load(x):"]
+    load.append("    if x.tag != _tag:")
+    load.append("        raise ValueError(f\"Expected tag '{_tag}', got '{x.tag}'\")")
+    load.append("    kw = {}")
+    load.append("    check = _validating.get()")
+    dump = ["def dump(self):"]
+    dump.append("    x = _Element(self.tag)")
+    dump.append("    a = {}")
+
+    # Attributes
+    if plan.attributes:
+        load.append("    a = x.attrib")
+    for i, (xml_name, attr) in enumerate(plan.attributes_by_name.items()):
+        f = f"_a{i}"
+        namespace[f] = attr
+        namespace[f"{f}_name"] = xml_name
+
+        load.append(f"    v = a.get({xml_name!r})")
+        load.append("    if v is None:")
+        if attr.annotation.isOptional:
+            load.append("        pass")
+        else:
+            load.append(
+                f"        raise ValueError(f\"Missing attribute '{{x.tag}}.{{{f}_name}}'\")"
+            )
+        load.append("    else:")
+        if attr.on_deserialize is not None:
+            namespace[f"{f}_des"] = attr.on_deserialize
+            load.append(f"        v = {f}_des(v)")
+        if attr.validator is not None:
+            load.append("        if check:")
+            load.append(f"            v = {f}.validate_ex(v)")
+        if _is_enum(attr):
+            namespace[f"{f}_enum"] = attr.annotation.tType
+            load.append(f"        v = {f}_enum(v)")
+        load.append(f"        kw[{attr.name!r}] = v")
+
+        dump.append(f"    v = self.{attr.name}")
+        dump.append("    if v is not None:")
+        if attr.on_serialize is not None:
+            namespace[f"{f}_ser"] = attr.on_serialize
+            dump.append(f"        v = {f}_ser(v)")
+        dump.append("        if isinstance(v, _Enum):")
+        dump.append("            if not isinstance(v.value, str):")
+        dump.append(
+            "                raise TypeError(f\"Enum value must be string '{self.tag}'\")"
+        )
+        dump.append("            v = v.value")
+        dump.append(f"        a[{xml_name!r}] = v")
+    dump.append("    x.attrib = a")
+
+    # Text
+    text = plan.text
+    if text is not None:
+        namespace["_t"] = text
+        namespace["_t_name"] = text.name
+
+        load.append("    v = x.text")
+        if not text.annotation.isOptional:
+            load.append("    if v is None:")
+            load.append(
+                "        raise ValueError(f\"Missing required text field '{x.tag}.{_t_name}'\")"
+            )
+        if text.on_deserialize is not None:
+            namespace["_t_des"] = text.on_deserialize
+            load.append("    v = _t_des(v)")
+        if text.validator is not None:
+            load.append("    if check:")
+            load.append("        v = _t.validate_ex(v)")
+        load.append(f"    kw[{text.name!r}] = v")
+
+    # Models dumping their text themselves are called as is
+    if text is not None and _overrides(cls, XmlModel, "_dump_xml_text_"):
+        dump.append("    x.text = self._dump_xml_text_()")
+    elif text is not None:
+        dump.append(f"    v = self.{text.name}")
+        if text.on_serialize is not None:
+            namespace["_t_ser"] = text.on_serialize
+            dump.append("    v = _t_ser(v)")
+        if text.validator is not None:
+            dump.append("    v = _t.validate_ex(v)")
+        dump.append("    if v is None:")
+        if text.annotation.isOptional:
+            dump.append("        pass")
+        else:
+            dump.append(
+                "        raise Exception(f\"Missing text field '{self.tag}.{_t_name}'\")"
+            )
+        dump.append("    else:")
+        dump.append("        if not isinstance(v, str):")
+        dump.append(
+            "            raise TypeError(f\"Type must be string '{self.tag}.{_t_name}'\")"
+        )
+        dump.append("        if isinstance(v, _Enum):")
+        dump.append("            if not isinstance(v.value, str):")
+        dump.append(
+            "                raise TypeError(f\"Enum value must be string '{self.tag}'\")"
+        )
+        dump.append("            v = v.value")
+        dump.append("        x.text = v")
+
+    # Children, build() gets them already loaded
+    build = ["def build(x, children):"] + load[1:]
+    build.append("    for t, c in children:")
+    build.append("        r = _routes.get(t)")
+    build.append("        if r is None or r.model is not type(c):")
+    build.append("            _assign(kw, t, c)")
+    build.append("        elif not r.assign(kw, c):")
+    build.append(
+        "            raise ValueError(f\"Unable to find field for child '{t}'\")"
+    )
+    # Models handling their children themselves are called as is
+    if _overrides(cls, XmlModel, "_load_xml_children_"):
+        namespace["_children"] = cls._load_xml_children_
+        load.append("    kw.update(_children(x))")
+    else:
+        load.append("    for c in x:")
+        load.append("        r = _routes.get(c.tag)")
+        load.append("        if r is None:")
+        load.append("            _assign(kw, c.tag, _lookup(c.tag).load_xml(c))")
+        load.append("        elif not r.assign(kw, r.model.load_xml(c)):")
+        load.append(
+            "            raise ValueError(f\"Unable to find field for child '{c.tag}'\")"
+        )
+    if _overrides(cls, XmlModel, "_dump_xml_children_"):
+        dump.append("    x.extend(self._dump_xml_children_())")
+        dump_children = ()
+    else:
+        dump_children = plan.children
+    for i, child in enumerate(dump_children):
+        f = f"_c{i}"
+        namespace[f] = child
+
+        dump.append(f"    v = getattr(self, {child.name!r}, None)")
+        if child.validator is not None:
+            dump.append(f"    v = {f}.validate_ex(v)")
+        dump.append("    if v is None:")
+        dump.append("        pass")
+        dump.append("    elif isinstance(v, list):")
+        dump.append("        for i in v:")
+        dump.append("            if not isinstance(i, _XmlModel):")
+        dump.append("                raise TypeError")
+        dump.append("            x.append(i.dump_xml())")
+        dump.append("    elif isinstance(v, _XmlModel):")
+        dump.append("        x.append(v.dump_xml())")
+        dump.append("    else:")
+        dump.append("        raise TypeError")
+
+    load.append("    return _cls(**kw)")
+    build.append("    return _cls(**kw)")
+    dump.append("    return x")
+
+    source = "\n\n\n".join("\n".join(x) for x in (load, build, dump)) + "\n"
+    code = compile(source, f"<compiled {cls.__module__}.{cls.__qualname__}>", "exec")
+    exec(code, namespace)
+
+    return CompiledModel(
+        load=namespace["load"],
+        build=namespace["build"],
+        dump=namespace["dump"],
+        source=source,
+    )
+
+
+def _overrides(cls: type, base: type, name: str) -> bool:
+    """Check if a model replaces one of the XmlModel load/dump helpers"""
+    a, b = getattr(cls, name), getattr(base, name)
+    return getattr(a, "__func__", a) is not getattr(b, "__func__", b)
+
+
+def _is_enum(field: Field.Base) -> bool:
+    """Check if a loaded value is to be converted to an enum (mirrors XmlModel)"""
+    tType = field.annotation.tType
+    if isinstance(tType, (_SpecialForm, _AnnotatedAlias)):
+        return False
+    return issubclass(tType, Enum)
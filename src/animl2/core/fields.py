@@ -1,6 +1,6 @@
-import re
-from typing import Any
+from typing import Any, Callable, Optional
 
+from ..utils.validators import compile_validator
 from .annotations import Annotation
 
 
@@ -26,6 +26,7 @@ class Field:
             on_serialize=None,
             on_deserialize=None,
             regex=None,
+            validator=None,
         ) -> None:
             if type(self) is Field.Base:
                 raise ("Field.Base cannot be directly instantiated")
@@ -33,6 +34,11 @@ class Field:
             self.on_deserialize = on_deserialize
             self.regex = regex
 
+            # Compiled once, called with the value to check
+            if validator is None and regex is not None:
+                validator = compile_validator(regex)
+            self.validator: Optional[Callable[[Any], Any]] = validator
+
             self.annotation: Annotation = None
             self.name: str = None
 
@@ -47,10 +53,12 @@ class Field:
             return value
 
         def validate_ex(self, value: Any) -> Any:
-            # Regex
-            if self.regex is not None and value is not None:
-                if not re.match(self.regex, value):
-                    raise ValueError(f"{self.name} must match regex {self.regex}")
+            # Regex / validator
+            if self.validator is not None and value is not None:
+                if not self.validator(value):
+                    if self.regex is not None:
+                        raise ValueError(f"{self.name} must match regex {self.regex}")
+                    raise ValueError(f"Invalid value for {self.name}: '{value}'")
 
             # Add more checks here...
 
@@ -74,6 +82,7 @@ class Field:
             on_serialize (function): Function that is called when serializing the attribute to xml.
             on_deserialize (function): Function that is called when deserializing the attribute from xml.
             regex (str): Regular expression that the attribute must match.
+            validator (function): Function that returns True if a value is valid, replaces regex.
         """
 
         def __init__(self, *, alias: str = None, **kwargs) -> None:
@@ -119,6 +128,7 @@ class Field:
             on_serialize (function): Function that is called when serializing the attribute to xml.
             on_deserialize (function): Function that is called when deserializing the attribute from xml.
             regex (str): Regular expression that the text must match.
+            validator (function): Function that returns True if a value is valid, replaces regex.
         """
 
         def __init__(self, **kwargs) -> None:
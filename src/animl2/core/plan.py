@@ -0,0 +1,131 @@
+from __future__ import annotations
+
+from types import MappingProxyType
+from typing import Any, Callable, Iterable, Mapping, NamedTuple, Optional, Union
+
+from .fields import Field
+
+
+class ChildRoute(NamedTuple):
+    """Target fields for child elements with a specific tag.
+
+    Fields are filled in order: the first free non-list field takes the child,
+    a list field takes all remaining children. A repeated child of a single
+    non-list field replaces the earlier one.
+
+    Attributes:
+        model (type[XmlModel]): Model to load the child element with
+        fields (tuple[Field.Child]): Fields accepting the child, in declaration order
+        lists (tuple[bool]): Whether each of the fields is a list
+    """
+
+    model: type
+    fields: tuple[Field.Child, ...]
+    lists: tuple[bool, ...]
+
+    def assign(self, arguments: dict[str, Any], child_inst: Any) -> bool:
+        """Store a loaded child in the next free field, returns False if all are occupied"""
+        for field, is_list in zip(self.fields, self.lists):
+            if is_list:
+                if field.name not in arguments:
+                    arguments[field.name] = list()
+                arguments[field.name].append(child_inst)
+                return True
+            if field.name not in arguments:
+                arguments[field.name] = child_inst
+                return True
+        if len(self.fields) == 1:
+            arguments[self.fields[0].name] = child_inst  # Last one wins
+            return True
+        return False
+
+
+class FieldPlan:
+    """Precomputed lookup tables for the serializable fields of a model.
+
+    Built once per XmlModel subclass, so that loading and dumping elements does
+    not need to filter the field list over and over again.
+
+    Attributes:
+        fields (tuple[Field.Base]): All fields, in declaration order
+        attributes (tuple[Field.Attribute]): Attribute fields, in declaration order
+        attributes_by_name (Mapping[str, Field.Attribute]): Attribute fields keyed by XML name
+        children (tuple[Field.Child]): Child fields, in declaration order
+        children_by_type (Mapping[type | str, tuple[Field.Child]]): Child fields keyed by \
+            accepted child type (or type name, for forward references)
+        text (Field.Text | None): The text field, if any
+        routes (Mapping[str, ChildRoute]): Child fields keyed by the XML tag of the child
+
+    Args:
+        fields (Iterable[Field.Base]): Fields of the model
+        resolve (Callable | None): Maps an accepted child type to the model class \
+            used to load it, or None if it is not a loadable model
+    """
+
+    __slots__ = (
+        "fields",
+        "attributes",
+        "attributes_by_name",
+        "children",
+        "children_by_type",
+        "text",
+        "routes",
+    )
+
+    def __init__(
+        self,
+        fields: Iterable[Field.Base],
+        resolve: Optional[Callable[[Union[type, str]], Optional[type]]] = None,
+    ) -> None:
+        self.fields: tuple[Field.Base, ...] = tuple(fields)
+
+        self.attributes: tuple[Field.Attribute, ...] = tuple(
+            x for x in self.fields if isinstance(x, Field.Attribute)
+        )
+        self.attributes_by_name: Mapping[str, Field.Attribute] = MappingProxyType(
+            {x.get_name(): x for x in self.attributes}
+        )
+
+        self.children: tuple[Field.Child, ...] = tuple(
+            x for x in self.fields if isinstance(x, Field.Child)
+        )
+        by_type: dict[Union[type, str], tuple[Field.Child, ...]] = {}
+        for child in self.children:
+            for t in child.annotation.content_types():
+                if child not in by_type.get(t, ()):
+                    by_type[t] = by_type.get(t, ()) + (child,)
+        self.children_by_type: Mapping[Union[type, str], tuple[Field.Child, ...]] = (
+            MappingProxyType(by_type)
+        )
+
+        # Restrictions (at most one text field) are checked by the model
+        texts = [x for x in self.fields if isinstance(x, Field.Text)]
+        self.text: Optional[Field.Text] = texts[0] if texts else None
+
+        routes: dict[str, ChildRoute] = {}
+        for t in by_type if resolve is not None else ():
+            model = resolve(t)
+            if model is None:
+                continue  # Not loadable, left to the fallback in XmlModel
+            matches = self.match_children(model)
+            if any([x.annotation.isList for x in matches[:-1]]):
+                raise ValueError(f"Unreachable field found for child '{model.tag}'")
+            if model.tag in routes and routes[model.tag].model is not model:
+                raise ValueError(f"Multiple classes with tag '{model.tag}'")
+            lists = tuple(x.annotation.isList for x in matches)
+            routes[model.tag] = ChildRoute(model, matches, lists)
+        self.routes: Mapping[str, ChildRoute] = MappingProxyType(routes)
+
+    def match_children(self, child_type: type) -> tuple[Field.Child, ...]:
+        """Get all child fields accepting the provided type, in declaration order"""
+        matches = self.children_by_type.get(child_type, ())
+        matches += self.children_by_type.get(child_type.__name__, ())
+        return tuple(x for x in self.children if x in matches)
+
+    def __repr__(self) -> str:
+        return (
+            f"{type(self).__name__}("
+            f"attributes={list(self.attributes_by_name)}, "
+            f"children={[x.name for x in self.children]}, "
+            f"text={self.text.name if self.text is not None else None})"
+        )
@@ -0,0 +1,122 @@
+from __future__ import annotations
+
+from collections.abc import MutableSequence
+from enum import Enum
+from functools import lru_cache
+from typing import TYPE_CHECKING, Any, Iterable, Optional
+
+from .fields import Field
+from .select import _STEP, Step
+
+if TYPE_CHECKING:
+    from .base import XmlModel
+
+QUERY_CACHE_SIZE = 256  # Compiled queries kept by Query.compile
+
+
+class Query:
+    """Compiled path selecting models from a model tree, see `XmlModel.select`
+
+    Paths use the syntax of `Selection`, relative to the model a query is run
+    on, e.g. `ExperimentStepSet/ExperimentStep[@name='HPLC']/Result`. Steps
+    are matched against the models directly, no element tree is built.
+
+    For each model class reached, the child fields that can hold a match of
+    the next step are looked up once, from the routing table of the class's
+    FieldPlan, and reused by all later runs. Other fields are never visited.
+
+    Any mutable sequence held by a field is searched item by item. For a
+    `ValueArray` these are the value items it creates on access, e.g. the `I`
+    elements of an IndividualValueSet, so changing a match does not change the
+    array.
+
+    Args:
+        path (str): Path to select
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.steps: tuple[Step, ...] = tuple(Step.parse(s) for s in _STEP.findall(path))
+        if not self.steps:
+            raise ValueError("Empty query path")
+        # Child fields to visit, keyed by model class and step number
+        self._fields: dict[tuple[type, int], tuple[Field.Child, ...]] = {}
+
+    @staticmethod
+    @lru_cache(maxsize=QUERY_CACHE_SIZE)
+    def compile(path: str) -> Query:
+        """Get the compiled query of a path, reused for equal paths"""
+        return Query(path)
+
+    def __repr__(self) -> str:
+        return f"Query({self.path!r})"
+
+    def run(self, model: XmlModel) -> list[XmlModel]:
+        """Get the models matching the path below model, in document order"""
+        matches = [model]
+        for i, step in enumerate(self.steps):
+            found = []
+            for parent in matches:
+                for field in self._child_fields(type(parent), i):
+                    value = getattr(parent, field.name, None)
+                    if value is None:
+                        continue
+                    for child in _items(value):
+                        if self._matches(step, child):
+                            found.append(child)
+            matches = found
+            if not matches:
+                break
+        return matches
+
+    def run_many(self, models: Iterable[XmlModel]) -> list[list[XmlModel]]:
+        """Run the query on each model, e.g. many documents, in the given order"""
+        return [self.run(x) for x in models]
+
+    def _child_fields(self, cls: type, i: int) -> tuple[Field.Child, ...]:
+        """Helper function for getting the fields of cls that can match step i"""
+        key = (cls, i)
+        fields = self._fields.get(key)
+        if fields is None:
+            plan = cls.get_field_plan()
+            tag = self.steps[i].tag
+            if tag == "*":
+                fields = plan.children
+            else:
+                route = plan.routes.get(tag)
+                fields = route.fields if route is not None else ()
+            self._fields[key] = fields
+        return fields
+
+    @staticmethod
+    def _matches(step: Step, x: XmlModel) -> bool:
+        """Helper function for checking a model against a step, like `Step.matches`"""
+        if step.tag != "*" and step.tag != x.tag:
+            return False
+        for name, expected in step.attributes:
+            if _attribute(x, name) != expected:
+                return False
+        return True
+
+
+def _items(value: Any) -> Iterable[Any]:
+    """Helper function for iterating the models held by a field value"""
+    if isinstance(value, list):
+        return value
+    if isinstance(value, MutableSequence) and not isinstance(value, (bytes, str)):
+        return value
+    return (value,)
+
+
+def _attribute(x: XmlModel, name: str) -> Optional[str]:
+    """Get an attribute of a model as it is written to XML, None if unset/unknown"""
+    field = type(x).get_field_plan().attributes_by_name.get(name)
+    if field is None:
+        return None
+    value = getattr(x, field.name, None)
+    if value is None:
+        return None
+    value: Any = field.serialize(value)
+    if isinstance(value, Enum):
+        value = value.value
+    return value if isinstance(value, str) else str(value)
@@ -0,0 +1,121 @@
+from __future__ import annotations
+
+import re
+from typing import Iterable, NamedTuple, Optional, Union
+from xml.etree import ElementTree as ET
+
+_STEP = re.compile(r"(?:[^/'\"]|'[^']*'|\"[^\"]*\")+")
+_TAG = re.compile(r"\*|[A-Za-z_][\w.\-]*")
+_PREDICATE = re.compile(r"\[@([\w:.\-]+)=(?:'([^']*)'|\"([^\"]*)\")\]")
+
+
+class Step(NamedTuple):
+    """One level of a selection path, i.e. `Tag[@name='value']`
+
+    Attributes:
+        tag (str): Tag to match, or '*' for any tag
+        attributes (tuple[tuple[str, str]]): Attribute names and values that must match
+    """
+
+    tag: str
+    attributes: tuple[tuple[str, str], ...] = ()
+
+    @classmethod
+    def parse(cls, text: str) -> Step:
+        """Parse a single path step"""
+        m = _TAG.match(text)
+        if m is None:
+            raise ValueError(f"Invalid path step '{text}'")
+
+        attributes, pos = [], m.end()
+        while pos < len(text):
+            p = _PREDICATE.match(text, pos)
+            if p is None:
+                raise ValueError(f"Invalid path step '{text}'")
+            value = p.group(2) if p.group(2) is not None else p.group(3)
+            attributes.append((p.group(1), value))
+            pos = p.end()
+
+        return cls(m.group(), tuple(attributes))
+
+    def matches(self, x: ET.Element) -> bool:
+        """Check if an element (with namespace already removed) matches this step"""
+        if self.tag != "*" and self.tag != x.tag:
+            return False
+        return all(x.get(k) == v for k, v in self.attributes)
+
+
+# Selection state of an element: ALL if its whole subtree is selected,
+# otherwise the remaining steps of each path it is a prefix of (empty -> skip)
+ALL = None
+State = Optional[tuple[tuple[Step, ...], ...]]
+
+
+class Selection:
+    """Compiled set of paths selecting parts of a document to load
+
+    Paths are relative to the root element and separated by '/'. Each step is
+    a tag, or '*', optionally followed by attribute predicates, e.g.
+    `ExperimentStepSet/ExperimentStep[@experimentStepID='S1']/Result`.
+
+    A selected element is loaded with all of its descendants. Its ancestors are
+    loaded with their attributes and text, but only the children leading to a
+    selected element, everything else is skipped.
+
+    Args:
+        paths (Iterable[str]): Paths to select
+    """
+
+    def __init__(self, paths: Iterable[str]):
+        self.paths: tuple[tuple[Step, ...], ...] = tuple(
+            tuple(Step.parse(s) for s in _STEP.findall(p)) for p in paths
+        )
+        if any(len(p) == 0 for p in self.paths):
+            raise ValueError("Empty selection path")
+
+    @classmethod
+    def create(
+        cls, include: Union[Selection, Iterable[str], None]
+    ) -> Optional[Selection]:
+        """Get a Selection from a Selection, paths, or None (select everything)"""
+        if include is None or isinstance(include, Selection):
+            return include
+        if isinstance(include, str):
+            return cls([include])
+        return cls(include)
+
+    @property
+    def root(self) -> State:
+        """Selection state of the root element"""
+        return self.paths
+
+    @staticmethod
+    def child(state: State, x: ET.Element) -> State:
+        """Selection state of child element x, given the state of its parent"""
+        if state is ALL:
+            return ALL
+        remaining = []
+        for steps in state:
+            if steps[0].matches(x):
+                if len(steps) == 1:
+                    return ALL
+                remaining.append(steps[1:])
+        return tuple(remaining)
+
+    def prune(self, x: ET.Element) -> ET.Element:
+        """Get a copy of x without the unselected subtrees
+
+        Selected subtrees are shared with x, not copied.
+        """
+        return self._prune(x, self.root)
+
+    def _prune(self, x: ET.Element, state: State) -> ET.Element:
+        pruned = ET.Element(x.tag, x.attrib)
+        pruned.text = x.text
+        for child in x:
+            s = self.child(state, child)
+            if s is ALL:
+                pruned.append(child)
+            elif s:
+                pruned.append(self._prune(child, s))
+        return pruned
@@ -0,0 +1,240 @@
+from __future__ import annotations
+
+from typing import (
+    IO,
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Collection,
+    Iterable,
+    Iterator,
+    NamedTuple,
+    Optional,
+    Sequence,
+    TypeVar,
+    Union,
+)
+from xml.etree import ElementTree as ET
+from xml.sax.saxutils import quoteattr
+
+from .select import ALL, Selection, State
+
+if TYPE_CHECKING:
+    from .base import XmlModel
+
+T = TypeVar("T", bound="XmlModel")
+
+
+class _Frame(NamedTuple):
+    """An element that is being parsed, and its children loaded so far
+
+    Frames of elements that are not built into models (skipped subtrees, or
+    ancestors of the elements of interest) have no children list. Elements of
+    models loading whole (see `XmlModel._load_whole_`) keep their subtree, which
+    is loaded in one go once complete.
+    """
+
+    model: Optional[type[XmlModel]]
+    element: ET.Element
+    children: Optional[list[tuple[str, XmlModel]]]
+    state: State = ALL
+    whole: bool = False
+
+
+def _new_frame(
+    model: type[XmlModel], elem: ET.Element, state: State, build: bool
+) -> _Frame:
+    """Frame of an element of a known model, built into a model if build"""
+    if build and state is ALL and model._load_whole_:
+        return _Frame(model, elem, None, state, whole=True)
+    return _Frame(model, elem, [] if build else None, state)
+
+
+def _load(frame: _Frame) -> XmlModel:
+    """Create the model of a completed element"""
+    if frame.whole:
+        return frame.model.load_xml(frame.element)
+    return frame.model._build_xml_(frame.element, frame.children)
+
+
+def strip_namespace(tag: str) -> str:
+    """Remove the namespace from an element tag, i.e. '{ns}Tag' -> 'Tag'"""
+    if tag[:1] == "{":
+        return tag.split("}", 1)[1]
+    return tag
+
+
+def iterparse_model(
+    model: type[T],
+    source: Union[str, IO],
+    validate: Optional[bool] = None,
+    include: Union[Selection, Iterable[str], None] = None,
+    on_load: Optional[Callable[[XmlModel], Any]] = None,
+) -> T:
+    """Load a model from an XML file, building it bottom-up while parsing
+
+    Each element is turned into a model as soon as it is complete, after
+    which it is cleared and dropped from the tree. The parsed tree therefore
+    never holds more than the currently open elements and their direct
+    children, and namespaces are stripped from tags as they are read.
+
+    Args:
+        model (type[XmlModel]): Model of the root element
+        source (str | IO): File name or file object to parse
+        validate (bool | None): If False, skip validation of loaded models, \
+            see `XmlModel.load_xml`
+        include (Selection | Iterable[str] | None): Only load these paths, \
+            see `Selection`. Other subtrees are discarded unparsed.
+        on_load (Callable[[XmlModel], Any] | None): Called with each model \
+            once built, see `iterparse_models`
+    """
+    for inst in iterparse_models(
+        model, source, validate=validate, include=include, on_load=on_load
+    ):
+        return inst
+    raise ValueError("No root element found")
+
+
+def iterparse_models(
+    model: type[XmlModel],
+    source: Union[str, IO],
+    path: Sequence[str] = (),
+    skip: Collection[str] = (),
+    validate: Optional[bool] = None,
+    include: Union[Selection, Iterable[str], None] = None,
+    on_load: Optional[Callable[[XmlModel], Any]] = None,
+) -> Iterator[XmlModel]:
+    """Yield the models found at a path below the root element, one at a time
+
+    Only elements at `path` and their descendants are built into models, each
+    one is yielded as soon as it is complete and then dropped from the tree.
+    The enclosing elements are never turned into models, so arbitrarily large
+    documents can be scanned without holding more than one item in memory.
+
+    Args:
+        model (type[XmlModel]): Model of the root element
+        source (str | IO): File name or file object to parse
+        path (Sequence[str]): Tags leading from the root element to the items, \
+            e.g. ("ExperimentStepSet", "ExperimentStep"). Empty yields the root.
+        skip (Collection[str]): Tags of child elements to leave out of the built \
+            models, their subtrees are discarded unparsed
+        validate (bool | None): If False, skip validation of loaded models, \
+            see `XmlModel.load_xml`
+        include (Selection | Iterable[str] | None): Only load these paths, \
+            relative to the root element, see `Selection`
+        on_load (Callable[[XmlModel], Any] | None): Called with each model as \
+            soon as it is built, before it is added to its parent. Models that \
+            load whole (see `XmlModel._load_whole_`) are passed, their \
+            descendants are not.
+    """
+    from .base import _validating
+
+    selection = Selection.create(include)
+    depth = len(path)
+    stack: list[_Frame] = []
+
+    for event, elem in ET.iterparse(source, events=("start", "end")):
+        if event == "start":
+            elem.tag = strip_namespace(elem.tag)
+
+            if not stack:
+                if elem.tag != model.tag:
+                    raise ValueError(f"Expected tag '{model.tag}', got '{elem.tag}'")
+                state = selection.root if selection is not None else ALL
+                stack.append(_new_frame(model, elem, state, depth == 0))
+                continue
+
+            parent = stack[-1]
+            if parent.whole:
+                stack.append(_Frame(None, elem, None, whole=True))  # Loaded with parent
+                continue
+            level = len(stack)
+            if parent.model is None or (level <= depth and elem.tag != path[level - 1]):
+                stack.append(_Frame(None, elem, None))  # Not of interest
+                continue
+            if level > depth and elem.tag in skip:
+                stack.append(_Frame(None, elem, None))
+                continue
+            state = Selection.child(parent.state, elem)
+            if state is not ALL and not state:
+                stack.append(_Frame(None, elem, None))  # Not selected
+                continue
+
+            # Resolve child model using the parent's routing table
+            route = parent.model.get_field_plan().routes.get(elem.tag)
+            child = route.model if route else parent.model.class_from_tag(elem.tag)
+            stack.append(_new_frame(child, elem, state, level >= depth))
+            continue
+
+        frame = stack.pop()
+        if frame.whole and frame.model is None:
+            continue  # Part of an element that is loaded whole
+        if frame.whole or frame.children is not None:
+            if validate is None:
+                inst = _load(frame)
+            else:
+                token = _validating.set(validate)
+                try:
+                    inst = _load(frame)
+                finally:
+                    _validating.reset(token)
+            if on_load is not None:
+                on_load(inst)
+
+            if len(stack) == depth:
+                yield inst
+            else:
+                stack[-1].children.append((elem.tag, inst))
+
+        # Consumed, free the element and detach it from its parent
+        elem.clear()
+        if stack:
+            del stack[-1].element[-1]
+
+
+def write_model(model: XmlModel, stream: IO[bytes], xml_declaration: bool = True):
+    """Write a model and its children as UTF-8 XML to a binary stream
+
+    Elements are written one by one as the model tree is walked, so no element
+    tree or string of the whole document is built. Models may write their text
+    directly into the stream, see `XmlModel._write_xml_text_`.
+
+    Args:
+        model (XmlModel): Model of the root element
+        stream (IO[bytes]): Binary stream to write to
+        xml_declaration (bool): If True, start with an XML declaration
+    """
+    write = stream.write
+    if xml_declaration:
+        write(b"<?xml version='1.0' encoding='utf-8'?>\n")
+    _write_model(model, write)
+
+
+def _write_model(model: XmlModel, write) -> None:
+    from .base import XmlModel
+    from .compiler import _overrides
+
+    cls = type(model)
+    cls._register_fields_()  # Initialize fields
+
+    attributes = model._dump_xml_attributes_()
+    head = "<" + model.tag
+    head += "".join(f" {k}={quoteattr(v)}" for k, v in attributes.items())
+
+    if _overrides(cls, XmlModel, "_dump_xml_children_"):
+        children = model._dump_xml_children_()  # Elements
+    else:
+        children = list(model._iter_xml_children_())
+
+    if cls.get_field_plan().text is None and not children:
+        write((head + " />").encode("utf-8"))
+        return
+
+    write((head + ">").encode("utf-8"))
+    model._write_xml_text_(write)
+    for child in children:
+        if isinstance(child, ET.Element):
+            write(ET.tostring(child))
+        else:
+            _write_model(child, write)
+    write(f"</{model.tag}>".encode("utf-8"))
@@ -2,7 +2,13 @@ from .author import Author
 from .category import Category
 from .common import Manufacturer, Name
 from .device import Device, DeviceIdentifier, FirmwareVersion, SerialNumber
-from .doc import AnIMLDoc, create_document, open_document
+from .doc import (
+    AnIMLDoc,
+    create_document,
+    index_tags,
+    iter_experiment_steps,
+    open_document,
+)
 from .experiment import ExperimentStep, ExperimentStepSet, Result, Template
 from .infrastructure import (
     EndValue,
@@ -20,19 +26,28 @@ from .infrastructure import (
 from .method import Method
 from .parameter import Parameter, ParameterType
 from .sample import Sample, SampleSet
-from .series import Dependency, PlotScale, Series, SeriesSet
+from .series import Column, Dependency, PlotScale, Series, SeriesSet
+from .sidecar import Sidecar, SidecarSlice
 from .software import OperatingSystem, Software, Version
 from .tags import Tag, TagSet
 from .technique import Extension, Technique
 from .unit import SIUnit, Unit, UnitText
-from .valuesets import AutoIncrementedValueSet, EncodedValueSet, IndividualValueSet
+from .valuesets import (
+    AutoIncrementedValueSet,
+    EncodedValueSet,
+    IndividualValueSet,
+    ValueArray,
+)
 
 __all__ = [
     "AnIMLDoc",
     "Author",
     "AutoIncrementedValueSet",
     "Category",
+    "Column",
     "create_document",
+    "index_tags",
+    "iter_experiment_steps",
     "open_document",
     "Dependency",
     "Device",
@@ -66,6 +81,8 @@ __all__ = [
     "SerialNumber",
     "Series",
     "SeriesSet",
+    "Sidecar",
+    "SidecarSlice",
     "SIUnit",
     "Software",
     "StartValue",
@@ -75,5 +92,6 @@ __all__ = [
     "Template",
     "Unit",
     "UnitText",
+    "ValueArray",
     "Version",
 ]
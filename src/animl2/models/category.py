@@ -1,7 +1,8 @@
 from __future__ import annotations
 
+import weakref
 from dataclasses import dataclass, field
-from typing import Annotated, Optional, TypeVar, Union, overload
+from typing import Annotated, Any, Iterable, Optional, TypeVar, Union, overload
 
 from ..core import ATTRIB, CHILD, XmlModel
 from .base import AnIMLDocBase
@@ -75,4 +76,108 @@ class Category(XmlModel, regclass=AnIMLDocBase):
                 f"Expected Parameter, SeriesSet, or Category, got {type(item)}"
             )
 
+        self._invalidate_()
         return item
+
+    def get(self, path: str) -> Optional[Union[Parameter, SeriesSet]]:
+        """Get a Parameter or SeriesSet by its path, None if there is none
+
+        Paths are the names of the sub-categories leading to the item, and the
+        name of the item, separated by '/', e.g. "Column/Temperature". If names
+        repeat, the first item wins, Parameters before SeriesSets.
+
+        Uses a flattened index of the whole tree, built on first use. Appending
+        to a Category drops its index and those of the Categories it was indexed
+        under, call `reindex` after changing the lists directly.
+        """
+        return self._path_index_().get(path)
+
+    def get_many(
+        self, paths: Iterable[str]
+    ) -> list[Optional[Union[Parameter, SeriesSet]]]:
+        """Get the Parameters or SeriesSets of many paths at once, see `get`"""
+        index = self._path_index_()
+        return [index.get(x) for x in paths]
+
+    def get_value(self, path: str, default: Any = None) -> Any:
+        """Get the plain value of a Parameter by its path, e.g. a float
+
+        Returns default if there is no such Parameter or it has no value.
+
+        Raises:
+            TypeError: If the path refers to a SeriesSet
+        """
+        return _plain_value(self._path_index_().get(path), path, default)
+
+    def get_values(self, paths: Iterable[str], default: Any = None) -> list[Any]:
+        """Get the plain values of many Parameters at once, see `get_value`"""
+        index = self._path_index_()
+        return [_plain_value(index.get(x), x, default) for x in paths]
+
+    def reindex(self) -> None:
+        """Drop the path indexes of this tree and its parents, rebuilt on next use"""
+        stack = [self]
+        while stack:
+            category = stack.pop()
+            category.__dict__.pop("_paths", None)
+            stack.extend(category.sub_categories or ())
+        self._invalidate_()
+
+    def _path_index_(self) -> dict[str, Union[Parameter, SeriesSet]]:
+        """Helper function for getting the (cached) flattened path index"""
+        index = self.__dict__.get("_paths")
+        if index is not None:
+            return index
+
+        index = {}
+        for item in self.parameters or ():
+            index.setdefault(item.name, item)
+        for item in self.series_sets or ():
+            index.setdefault(item.name, item)
+        for category in self.sub_categories or ():
+            prefix = category.name + "/"
+            for path, item in category._path_index_().items():
+                index.setdefault(prefix + path, item)
+            category._add_parent_(self)
+        self._paths = index
+        return index
+
+    def _add_parent_(self, parent: Category) -> None:
+        """Helper function for linking a parent whose index includes this one"""
+        parents = self.__dict__.setdefault("_parents", [])
+        if not any(ref() is parent for ref in parents):
+            parents.append(weakref.ref(parent))
+
+    def _invalidate_(self) -> None:
+        """Helper function for dropping the path indexes that include this one
+
+        Parents only link themselves while building their index, which also
+        builds the index of this Category. So a Category without an index has
+        no parent with one either, and the walk stops there.
+        """
+        stack = [self]
+        while stack:
+            category = stack.pop()
+            category.__dict__.pop("_paths", None)
+            for ref in category.__dict__.get("_parents", ()):
+                parent = ref()
+                if parent is not None and "_paths" in parent.__dict__:
+                    stack.append(parent)
+
+    def __getstate__(self):
+        # Parent links are weak references, a copy rebuilds its indexes on first use
+        state = self.__dict__.copy()
+        state.pop("_paths", None)
+        state.pop("_parents", None)
+        return state
+
+
+def _plain_value(
+    item: Optional[Union[Parameter, SeriesSet]], path: str, default: Any
+) -> Any:
+    """Get the value of a Parameter without its value type wrapper"""
+    if item is None:
+        return default
+    if not isinstance(item, Parameter):
+        raise TypeError(f"'{path}' is a {type(item).__name__}, not a Parameter")
+    return item.value.value if item.value is not None else default
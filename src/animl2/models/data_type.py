@@ -1,11 +1,20 @@
+from __future__ import annotations
+
+import base64
+import io
 from ctypes import c_float, c_int32, c_int64
 from dataclasses import dataclass, field
 from datetime import datetime
-from typing import Annotated, Optional
+from typing import IO, TYPE_CHECKING, Annotated, Optional
 
 from ..core import TEXT, XmlModel
+from ..utils import streams
+from ..utils.datetimes import fromisoformat, parse_datetime
 from .base import AnIMLDocBase
 
+if TYPE_CHECKING:
+    from .sidecar import Sidecar
+
 SERIALIZE_BINARY = {
     "on_serialize": lambda x: x.decode("ascii") if x else None,
     "on_deserialize": lambda x: x.encode("ascii") if x else None,
@@ -30,7 +39,13 @@ SERIALIZE_FLOAT = {
 
 SERIALIZE_DATETIME = {
     "on_serialize": lambda x: x.isoformat() if x is not None else None,
-    "on_deserialize": lambda x: datetime.fromisoformat(x) if x else None,
+    "on_deserialize": lambda x: fromisoformat(x) if x else None,
+}
+
+# Timestamps repeat a few values many times, parse each one once
+SERIALIZE_TIMESTAMP = {
+    "on_serialize": lambda x: x.isoformat() if x is not None else None,
+    "on_deserialize": lambda x: parse_datetime(x) if x else None,
 }
 
 SERIALIZE_INT = {
@@ -44,6 +59,72 @@ SERIALIZE_LONG = {
 }
 
 
+class LargePayload:
+    """Mixin of value types with large payloads (PNG, SVG, EmbeddedXML)
+
+    PNG images are kept base64 encoded as loaded and decoded on first access
+    only, e.g. through `open`. SVG and EmbeddedXML values are plain text, held
+    in full as parsed. To keep either out of memory, `offload` them to a
+    sidecar file (or load the document with one, see `AnIMLDoc.loads`). Only
+    their location is kept then, and they are read back through its memory
+    map. They are restored inline when dumped or written.
+
+    The value types define `_payload_`, giving the payload as stored in the
+    sidecar file, and `_payload_text_`, giving the XML text of a stored one.
+    """
+
+    @property
+    def offloaded(self) -> bool:
+        """True if the payload is stored in a sidecar file, see `offload`"""
+        return self.value is None and self.__dict__.get("_sidecar") is not None
+
+    def offload(self, sidecar: Sidecar) -> None:
+        """Move the payload to a sidecar file, keeping only its location
+
+        value is set to None, assigning a new value brings it back inline.
+        Nothing is stored if there is no value.
+
+        Args:
+            sidecar (Sidecar): File to store the payload in
+        """
+        if self.value is None:
+            return
+        location = sidecar.append(self._payload_())
+        self.value = None
+        self.__dict__.pop("_payload", None)  # Decoded copy, if any
+        self._sidecar = location
+
+    def _dump_xml_text_(self):
+        if self.offloaded:
+            return self._payload_text_(self.__dict__["_sidecar"].view())
+        return super()._dump_xml_text_()
+
+
+class _TextPayload(LargePayload):
+    """Payload of text value types, stored as UTF-8 when offloaded
+
+    Not lazy: the value is the text as parsed, see `LargePayload`.
+    """
+
+    def open(self) -> IO[str]:
+        """Get a text stream reading the value, from the sidecar file if offloaded"""
+        if self.offloaded:
+            raw = self.__dict__["_sidecar"].view()
+            return io.TextIOWrapper(
+                streams.open_chunks(streams.iter_chunks(raw)), encoding="utf-8"
+            )
+        return io.StringIO(self.value or "")
+
+    def _payload_(self) -> bytes:
+        """Helper function for getting the text as stored in a sidecar file"""
+        return self.value.encode("utf-8")
+
+    @staticmethod
+    def _payload_text_(raw: memoryview) -> str:
+        """Helper function for getting the text of a stored payload"""
+        return str(raw, "utf-8")
+
+
 @dataclass
 class BooleanType(XmlModel, regclass=AnIMLDocBase):
     """
@@ -100,7 +181,7 @@ class DateTimeType(XmlModel, regclass=AnIMLDocBase):
 
 
 @dataclass
-class EmbeddedXmlType(XmlModel, regclass=AnIMLDocBase):
+class EmbeddedXmlType(_TextPayload, XmlModel, regclass=AnIMLDocBase):
     """
     Value governed by a different XML Schema.
 
@@ -173,7 +254,7 @@ class LongType(XmlModel, regclass=AnIMLDocBase):
 
 
 @dataclass
-class PNGType(XmlModel, regclass=AnIMLDocBase):
+class PNGType(LargePayload, XmlModel, regclass=AnIMLDocBase):
     """
     Base 64 encoded PNG image.
 
@@ -183,12 +264,62 @@ class PNGType(XmlModel, regclass=AnIMLDocBase):
     ```
 
     Attributes:
-        value (bytes): PNG image data
+        value (bytes): Base64 encoded PNG image data, see `data` for the image
     """
 
-    value: Annotated[Optional[bytes], TEXT] = None
+    value: Annotated[Optional[bytes], TEXT(**SERIALIZE_BINARY)] = None
     tag: str = "PNG"
 
+    @property
+    def data(self) -> memoryview:
+        """Decoded image, read-only
+
+        Decoded on first access and kept until value is replaced, use `open`
+        to read it without decoding all of it at once.
+        """
+        if self.offloaded:
+            return self.__dict__["_sidecar"].view()
+        payload = self.__dict__.get("_payload")
+        if payload is None or payload[0] is not self.value:
+            raw = b"".join(streams.b64decode_chunks(self.value or b""))
+            payload = (self.value, memoryview(raw))
+            self._payload = payload
+        return payload[1]
+
+    def open(self) -> IO[bytes]:
+        """Get a binary stream reading the image, decoded piece by piece"""
+        if self.offloaded:
+            return streams.open_chunks(streams.iter_chunks(self.data))
+        payload = self.__dict__.get("_payload")
+        if payload is not None and payload[0] is self.value:
+            return streams.open_chunks(streams.iter_chunks(payload[1]))
+        return streams.open_chunks(streams.b64decode_chunks(self.value or b""))
+
+    def _payload_(self) -> memoryview:
+        """Helper function for getting the decoded image, as stored in a sidecar file"""
+        return self.data
+
+    @staticmethod
+    def _payload_text_(raw: memoryview) -> str:
+        """Helper function for getting the base64 text of a stored image"""
+        return base64.b64encode(raw).decode("ascii")
+
+    def _write_xml_text_(self, write) -> None:
+        if self.offloaded:
+            # Encode piecewise, 3 byte groups encode without padding
+            for chunk in streams.iter_chunks(self.data, streams.CHUNK_SIZE // 4 * 3):
+                write(base64.b64encode(chunk))
+            return
+        # Base64 is plain ASCII, write it as is
+        for chunk in streams.iter_chunks(self.value or b""):
+            write(chunk)
+
+    def __getstate__(self):
+        # Views can not be pickled, the image is decoded again when needed
+        state = self.__dict__.copy()
+        state.pop("_payload", None)
+        return state
+
 
 @dataclass
 class StringType(XmlModel, regclass=AnIMLDocBase):
@@ -209,7 +340,7 @@ class StringType(XmlModel, regclass=AnIMLDocBase):
 
 
 @dataclass
-class SVGType(XmlModel, regclass=AnIMLDocBase):
+class SVGType(_TextPayload, XmlModel, regclass=AnIMLDocBase):
     """
     Value governed by the SVG DTD. Used to represent vector graphic images.
 
@@ -241,4 +372,4 @@ class Timestamp(XmlModel, regclass=AnIMLDocBase):
         value (datetime): Date and time value
     """
 
-    value: Annotated[datetime, TEXT(**SERIALIZE_DATETIME)] = field()
+    value: Annotated[datetime, TEXT(**SERIALIZE_TIMESTAMP)] = field()
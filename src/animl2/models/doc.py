@@ -1,14 +1,29 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from io import StringIO, TextIOWrapper
-from typing import IO, Annotated, Optional, Union, overload
-from xml.etree.ElementTree import ElementTree
+from io import IOBase, StringIO
+from os import PathLike
+from typing import IO, Annotated, Iterable, Iterator, Optional, Union, overload
 
-from ..core import ATTRIB, CHILD, XmlModel, scrub_namespace
+from ..core import (
+    ATTRIB,
+    CHILD,
+    XmlModel,
+    iterparse_model,
+    iterparse_models,
+    write_model,
+)
+from ..utils.index import PrefixIndex, TagIndex
 from .base import AnIMLDocBase
-from .experiment import ExperimentStep, ExperimentStepSet
+from .experiment import ExperimentStep, ExperimentStepSet, Result
+from .infrastructure import (
+    ExperimentDataBulkReference,
+    ExperimentDataReference,
+    SampleReference,
+)
 from .sample import Sample, SampleSet
+from .sidecar import Sidecar
+from .valuesets import IndividualValueSet
 
 VERSION: str = "0.90"
 XMLNS: str = "urn:org:astm:animl:schema:core:draft:0.90"
@@ -58,17 +73,48 @@ class AnIMLDoc(XmlModel, regclass=AnIMLDocBase):
     # signature_set: Annotated[Optional[SignatureSet], CHILD]
 
     @classmethod
-    def loads(cls, xml: Union[IO, str]) -> AnIMLDoc:
+    def loads(
+        cls,
+        xml: Union[IO, str],
+        validate: bool = True,
+        include: Optional[Iterable[str]] = None,
+        sidecar: Optional[Sidecar] = None,
+    ) -> AnIMLDoc:
+        """Load a document from an XML string or text stream
+
+        Args:
+            xml (IO | str): XML content
+            validate (bool): If False, skips validation of the loaded models. Use for \
+                trusted, previously validated documents only, see `validate()`.
+            include (Iterable[str] | None): Paths of the parts to load, e.g. \
+                `["SampleSet"]`, everything else is skipped while parsing. \
+                Loads the whole document if None, see `Selection` for the syntax.
+            sidecar (Sidecar | None): If given, encoded series data and images \
+                are moved to this file as they are parsed, see `Sidecar.store`
+        """
         if isinstance(xml, str):
             xml = StringIO(xml)
-        elif isinstance(xml, (TextIOWrapper,)):
+        elif isinstance(xml, IOBase):
             pass  # Nothing
         else:
             raise TypeError(f"Expected str or IO, got {type(xml)}")
-        et = ElementTree()
-        et.parse(source=xml)
-        scrub_namespace(et.getroot())
-        return cls.load_xml(et.getroot())
+        on_load = sidecar.store if sidecar is not None else None
+        # Models are built while parsing, no full element tree is kept
+        return iterparse_model(
+            cls, xml, validate=validate, include=include, on_load=on_load
+        )
+
+    def write(self, file: Union[str, PathLike, IO[bytes]]) -> None:
+        """Write the document as XML to a file, without building an element tree
+
+        Args:
+            file (str | PathLike | IO[bytes]): File name or binary file object
+        """
+        if isinstance(file, (str, PathLike)):
+            with open(file, "wb") as f:
+                write_model(self, f)
+        else:
+            write_model(self, file)
 
     @overload
     def append(self, item: ExperimentStep) -> ExperimentStep:
@@ -82,20 +128,222 @@ class AnIMLDoc(XmlModel, regclass=AnIMLDocBase):
         if isinstance(item, ExperimentStep):
             if self.experiment_set is None:
                 self.experiment_set = ExperimentStepSet()
+            self.experiment_set._listen_(self)  # Indexes the step, see _index_
             return self.experiment_set.append(item)
         elif isinstance(item, Sample):
             if self.sample_set is None:
                 self.sample_set = SampleSet()
+            self._index_(item)
             return self.sample_set.append(item)
         else:
             raise TypeError(f"Expected Sample or ExperimentStep, got {type(item)}")
 
+    def get_sample(self, sampleID: str) -> Optional[Sample]:
+        """Get a Sample by its sampleID, None if there is none, see `SampleSet.get`"""
+        if self.sample_set is None:
+            return None
+        return self.sample_set.get(sampleID)
+
+    def get_experiment_step(self, experimentStepID: str) -> Optional[ExperimentStep]:
+        """Get a top level ExperimentStep by its experimentStepID, None if there is none
+
+        See `ExperimentStepSet.get`.
+        """
+        if self.experiment_set is None:
+            return None
+        return self.experiment_set.get(experimentStepID)
+
+    def get_by_id(self, id: str) -> Optional[XmlModel]:
+        """Get the element with the given id (signature anchor), None if there is none
+
+        Uses an index of the whole document, built on first use and kept up to
+        date by `append`, also that of the ExperimentStepSets it indexed. A hit
+        whose id changed since rebuilds the index, misses take O(1). Call
+        `reindex` after changing the document otherwise, e.g. attaching or
+        removing elements directly.
+        """
+        if self.__dict__.get("_ids") is None:
+            self._build_indexes_()
+        model = self._ids.get(id)
+        if model is not None and getattr(model, "id", None) != id:
+            self._build_indexes_()  # Re-keyed since indexed
+            model = self._ids.get(id)
+        return model
+
+    def find_experiment_steps(self, prefix: str) -> list[ExperimentStep]:
+        """Get all ExperimentSteps whose experimentStepID starts with prefix
+
+        Includes steps nested in Results, ordered by experimentStepID. Uses an
+        index of the whole document like `get_by_id`, taking O(log n + k).
+        """
+        if self.__dict__.get("_steps") is None:
+            self._build_indexes_()
+        return self._steps.prefix(prefix)
+
+    @overload
+    def resolve(self, reference: ExperimentDataReference) -> Optional[ExperimentStep]:
+        """Get the (possibly nested) ExperimentStep referred to, None if missing"""
+
+    @overload
+    def resolve(self, reference: ExperimentDataBulkReference) -> list[ExperimentStep]:
+        """Get the ExperimentSteps whose experimentStepID starts with the prefix"""
+
+    @overload
+    def resolve(self, reference: SampleReference) -> Optional[Sample]:
+        """Get the Sample referred to, None if missing"""
+
+    def resolve(self, reference):
+        if isinstance(reference, ExperimentDataReference):
+            if self.__dict__.get("_steps") is None:
+                self._build_indexes_()
+            return self._steps.get(reference.experimentStepID)
+        elif isinstance(reference, ExperimentDataBulkReference):
+            return self.find_experiment_steps(reference.experimentStepIDPrefix)
+        elif isinstance(reference, SampleReference):
+            return self.get_sample(reference.sampleID)
+        else:
+            raise TypeError(f"Unable to resolve {type(reference).__name__}")
+
+    def find_tagged(
+        self, name: str, value: Optional[str] = None
+    ) -> list[Union[Sample, ExperimentStep]]:
+        """Get the Samples and ExperimentSteps carrying a Tag, in document order
+
+        Items tagged after the index was built come last, see `tag_index`.
+
+        Args:
+            name (str): Name of the Tag
+            value (str | None): Value of the Tag, any value if None
+        """
+        return self.tag_index().get(name, value)
+
+    def tag_index(self) -> TagIndex:
+        """Get the index of the Tags of all Samples and (nested) ExperimentSteps
+
+        Built on first use and kept up to date by `append`, also of the TagSets
+        (and Samples) it indexed, which add their new Tags to it. Tags added
+        after the index was built come after the others. Call `reindex` after
+        changing the document otherwise, e.g. assigning a TagSet. Combine the
+        indexes of many documents with `index_tags`.
+        """
+        if self.__dict__.get("_tags") is None:
+            self._build_tag_index_()
+        return self._tags
+
+    def reindex(self) -> None:
+        """Drop the document indexes, they are rebuilt on next use
+
+        See `get_by_id`, `find_experiment_steps` and `tag_index`.
+        """
+        self._ids = None
+        self._steps = None
+        self._tags = None
+
+    def __getstate__(self):
+        # Copies are not updated by the TagSets and ExperimentStepSets, build anew
+        state = self.__dict__.copy()
+        for name in ("_ids", "_steps", "_tags"):
+            state.pop(name, None)
+        return state
+
+    def _build_indexes_(self) -> None:
+        """Helper function for indexing the ids and steps of the whole document"""
+        self._ids: Optional[dict[str, XmlModel]] = {}
+        self._steps: Optional[PrefixIndex] = PrefixIndex()
+        for child in self._iter_xml_children_():
+            _index_tree(self, child, self._ids, self._steps, None)
+
+    def _build_tag_index_(self) -> None:
+        """Helper function for indexing the tags of the whole document"""
+        self._tags: Optional[TagIndex] = TagIndex()
+        for child in self._iter_xml_children_():
+            _index_tree(self, child, None, None, self._tags)
+
+    def _index_(self, model: XmlModel) -> None:
+        """Helper function for adding a model tree to the indexes built so far"""
+        ids = self.__dict__.get("_ids")
+        steps = self.__dict__.get("_steps")
+        _index_tree(self, model, ids, steps, self.__dict__.get("_tags"))
+
+
+def _index_tree(
+    doc: AnIMLDoc,
+    model: XmlModel,
+    ids: Optional[dict[str, XmlModel]],
+    steps: Optional[PrefixIndex],
+    tags: Optional[TagIndex],
+) -> None:
+    """Helper function for adding a model tree to the given indexes, if not None
+
+    The ExperimentStepSets walked report the steps appended later to doc.
+    """
+    if ids is None and tags is None:
+        return
+    stack = [model]
+    while stack:
+        x = stack.pop()
+        if ids is not None and steps is not None:
+            id = getattr(x, "id", None)
+            if isinstance(id, str):
+                ids.setdefault(id, x)
+            if isinstance(x, ExperimentStep):
+                steps.add(x.experimentStepID, x)
+        if tags is not None and isinstance(x, (Sample, ExperimentStep)):
+            if x.tag_set is not None:
+                x.tag_set._listen_(tags, x)
+                for tag in x.tag_set.tags or ():
+                    tags.add(tag.name, tag.value, x)
+            elif isinstance(x, Sample):
+                x._listen_(tags)  # Sample.append creates the TagSet
+        if isinstance(x, ExperimentStepSet):
+            x._listen_(doc)
+        if isinstance(x, IndividualValueSet):
+            continue  # Values have no ids or tags
+        stack.extend(reversed(list(x._iter_xml_children_())))
+
 
 def create_document():
     """Creates a new AnIML document"""
     return AnIMLDoc()
 
 
-def open_document(xml: Union[IO, str]):
-    """Opens an existing AnIML document"""
-    return AnIMLDoc.loads(xml)
+def open_document(
+    xml: Union[IO, str],
+    validate: bool = True,
+    include: Optional[Iterable[str]] = None,
+    sidecar: Optional[Sidecar] = None,
+):
+    """Opens an existing AnIML document, set validate=False for trusted documents
+
+    Use include to load only parts of the document, e.g. `include=["SampleSet"]`,
+    and sidecar to keep encoded series data and images in a memory mapped file.
+    """
+    return AnIMLDoc.loads(xml, validate=validate, include=include, sidecar=sidecar)
+
+
+def index_tags(documents: Iterable[AnIMLDoc]) -> TagIndex:
+    """Combine the tag indexes of many documents, e.g. a whole archive
+
+    Query the result like `AnIMLDoc.find_tagged`, e.g. `index.get("batch", "123")`
+    returns the tagged Samples and ExperimentSteps of all documents, in order.
+    """
+    return TagIndex.merged(x.tag_index() for x in documents)
+
+
+def iter_experiment_steps(
+    path: Union[str, PathLike, IO], skip_results: bool = False, validate: bool = True
+) -> Iterator[ExperimentStep]:
+    """Yields the ExperimentSteps of a document one by one, without loading all of it
+
+    Args:
+        path (str | PathLike | IO): File name or file object of the document
+        skip_results (bool): If True, Result elements are not loaded at all
+        validate (bool): If False, skips validation of the loaded steps
+    """
+    yield from iterparse_models(
+        AnIMLDoc,
+        path,
+        path=(ExperimentStepSet.tag, ExperimentStep.tag),
+        skip=(Result.tag,) if skip_results else (),
+        validate=validate,
+    )
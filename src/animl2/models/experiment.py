@@ -1,10 +1,12 @@
 from __future__ import annotations
 
+import weakref
 from dataclasses import dataclass, field
-from typing import Annotated, List, Optional, overload
+from typing import TYPE_CHECKING, Annotated, List, Optional, overload
 
 from ..core import ATTRIB, CHILD, XmlModel
-from ..utils.regex import NC_NAME
+from ..utils.index import KeyIndex
+from ..utils.regex import NC_NAME, TOKEN
 from .base import AnIMLDocBase
 from .category import Category
 from .infrastructure import Infrastructure
@@ -13,6 +15,9 @@ from .series import SeriesSet
 from .tags import TagSet
 from .technique import Technique
 
+if TYPE_CHECKING:
+    from .doc import AnIMLDoc
+
 
 @dataclass
 class ExperimentStep(XmlModel, regclass=AnIMLDocBase):
@@ -52,7 +57,7 @@ class ExperimentStep(XmlModel, regclass=AnIMLDocBase):
     comment: Annotated[Optional[str], ATTRIB] = None
     id: Annotated[Optional[str], ATTRIB(regex=NC_NAME)] = None
     sourceDataLocation: Annotated[Optional[str], ATTRIB] = None
-    templateUsed: Annotated[Optional[str], ATTRIB] = None
+    templateUsed: Annotated[Optional[str], ATTRIB(regex=TOKEN)] = None
 
     # Children
     tag_set: Annotated[Optional[TagSet], CHILD] = None
@@ -105,8 +110,37 @@ class ExperimentStepSet(XmlModel, regclass=AnIMLDocBase):
     def append(self, item: ExperimentStep) -> ExperimentStep:
         """Add and return an ExperimentStep to the set"""
         self.experiment_steps.append(item)
+        KeyIndex.attach(self, "experimentStepID").add(item)
+        for ref in self.__dict__.get("_listeners", ()):
+            doc = ref()
+            if doc is not None:
+                doc._index_(item)
         return item
 
+    def get(self, experimentStepID: str) -> Optional[ExperimentStep]:
+        """Get an ExperimentStep by its experimentStepID, None if there is none
+
+        Uses an index built on first use, see `KeyIndex`.
+        """
+        index = KeyIndex.attach(self, "experimentStepID")
+        return index.get(self.experiment_steps, experimentStepID)
+
+    def _listen_(self, doc: AnIMLDoc) -> None:
+        """Helper function for adding the steps appended later to the indexes of doc
+
+        The document is referenced weakly, it is not kept alive by its steps.
+        """
+        refs = [x for x in self.__dict__.get("_listeners", ()) if x() is not None]
+        if not any(x() is doc for x in refs):
+            refs.append(weakref.ref(doc))
+        self._listeners = refs
+
+    def __getstate__(self):
+        # A copy reports to the documents that index it again, not to these
+        state = self.__dict__.copy()
+        state.pop("_listeners", None)
+        return state
+
 
 @dataclass
 class Result(XmlModel, regclass=AnIMLDocBase):
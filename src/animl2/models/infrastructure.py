@@ -3,7 +3,7 @@ from enum import Enum
 from typing import Annotated, Optional, Union, overload
 
 from ..core import ATTRIB, CHILD, XmlModel
-from ..utils.regex import NC_NAME
+from ..utils.regex import NC_NAME, TOKEN
 from .base import AnIMLDocBase
 from .data_type import DoubleType, FloatType, IntType, LongType, Timestamp
 
@@ -41,8 +41,8 @@ class ExperimentDataReference(XmlModel, regclass=AnIMLDocBase):
 
     # Attributes
     dataPurpose: Annotated[PurposeType, ATTRIB]
-    experimentStepID: Annotated[str, ATTRIB]
-    role: Annotated[str, ATTRIB]
+    experimentStepID: Annotated[str, ATTRIB(regex=TOKEN)]
+    role: Annotated[str, ATTRIB(regex=TOKEN)]
     id: Annotated[Optional[str], ATTRIB(regex=NC_NAME)] = None
 
 
@@ -72,8 +72,8 @@ class ExperimentDataBulkReference(XmlModel, regclass=AnIMLDocBase):
 
     # Attributes
     dataPurpose: Annotated[PurposeType, ATTRIB]
-    experimentStepIDPrefix: Annotated[str, ATTRIB]
-    role: Annotated[str, ATTRIB]
+    experimentStepIDPrefix: Annotated[str, ATTRIB(regex=TOKEN)]
+    role: Annotated[str, ATTRIB(regex=TOKEN)]
     id: Annotated[Optional[str], ATTRIB(regex=NC_NAME)] = None
 
 
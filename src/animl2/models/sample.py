@@ -1,10 +1,12 @@
 from __future__ import annotations
 
+import weakref
 from dataclasses import dataclass, field
 from typing import Annotated, List, Optional, overload
 
 from ..core import ATTRIB, CHILD, XmlModel
-from ..utils.regex import NC_NAME
+from ..utils.index import KeyIndex, TagIndex
+from ..utils.regex import NC_NAME, TOKEN
 from .base import AnIMLDocBase
 from .category import Category
 from .tags import Tag, TagSet
@@ -59,7 +61,7 @@ class Sample(XmlModel, regclass=AnIMLDocBase):
 
     # Mandatory fields
     name: Annotated[str, ATTRIB]
-    sampleID: Annotated[str, ATTRIB]
+    sampleID: Annotated[str, ATTRIB(regex=TOKEN)]
 
     # Optional fields
     barcode: Annotated[Optional[str], ATTRIB] = None
@@ -82,9 +84,29 @@ class Sample(XmlModel, regclass=AnIMLDocBase):
     def append(self, tag):
         if self.tag_set is None:
             self.tag_set = TagSet()
+            for ref in self.__dict__.pop("_tag_indexes", ()):
+                index = ref()
+                if index is not None:
+                    self.tag_set._listen_(index, self)
         self.tag_set.append(tag)
         return tag
 
+    def _listen_(self, index: TagIndex) -> None:
+        """Helper function for indexing the Tags of a TagSet created by `append`
+
+        Used by document indexes that found this Sample without a TagSet.
+        """
+        refs = [x for x in self.__dict__.get("_tag_indexes", ()) if x() is not None]
+        if not any(x() is index for x in refs):
+            refs.append(weakref.ref(index))
+        self._tag_indexes = refs
+
+    def __getstate__(self):
+        # Only meaningful to the indexes of this process, like the TagSet listeners
+        state = self.__dict__.copy()
+        state.pop("_tag_indexes", None)
+        return state
+
 
 @dataclass
 class SampleSet(XmlModel, regclass=AnIMLDocBase):
@@ -120,4 +142,12 @@ class SampleSet(XmlModel, regclass=AnIMLDocBase):
         if self.samples is None:
             self.samples = list()
         self.samples.append(sample)
+        KeyIndex.attach(self, "sampleID").add(sample)
         return sample
+
+    def get(self, sampleID: str) -> Optional[Sample]:
+        """Get a Sample by its sampleID, None if there is none
+
+        Uses an index built on first use, see `KeyIndex`.
+        """
+        return KeyIndex.attach(self, "sampleID").get(self.samples, sampleID)
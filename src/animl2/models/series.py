@@ -1,14 +1,38 @@
+from __future__ import annotations
+
+import math
+import numbers
+from array import array
 from dataclasses import dataclass, field
 from enum import Enum
-from typing import Annotated, List, Optional, Union, overload
+from typing import (
+    Annotated,
+    Any,
+    Iterable,
+    List,
+    Mapping,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Union,
+    overload,
+)
 
 from ..core import ATTRIB, CHILD, XmlModel
+from ..utils import binary, datetimes
+from ..utils.index import KeyIndex
 from ..utils.regex import NC_NAME
 from .base import AnIMLDocBase
 from .data_type import SERIALIZE_BOOL, SERIALIZE_INT
 from .parameter import ParameterType
 from .unit import Unit
-from .valuesets import AutoIncrementedValueSet, EncodedValueSet, IndividualValueSet
+from .valuesets import (
+    VALUE_TYPES,
+    AutoIncrementedValueSet,
+    EncodedValueSet,
+    IndividualValueSet,
+    ValueArray,
+)
 
 
 class Dependency(str, Enum):
@@ -29,6 +53,27 @@ class PlotScale(str, Enum):
 AnIMLDocBase.register(PlotScale.__name__, PlotScale)
 
 
+class Column(NamedTuple):
+    """Values of a Series as a single buffer, see SeriesSet.to_columns
+
+    Attributes:
+        name (str): Name of the Series
+        seriesType (ParameterType): Data type of the values
+        independent (bool): True if the Series is independent, e.g. a time axis
+        values (Sequence): One value per row, an array.array or numpy.ndarray for \
+            numeric types and a list otherwise. Missing values are NaN for floats, \
+            0 for integers and None in lists.
+        mask (Sequence | None): True (1) for rows without a value, None if no value \
+            is missing. Bytes array.array, or numpy bool array.
+    """
+
+    name: str
+    seriesType: ParameterType
+    independent: bool
+    values: Any
+    mask: Any = None
+
+
 @dataclass
 class Series(XmlModel, regclass=AnIMLDocBase):
     """Container for multiple Values.
@@ -87,6 +132,178 @@ class Series(XmlModel, regclass=AnIMLDocBase):
         self.valuesets.append(item)
         return item
 
+    def to_array(self, length: Optional[int] = None, use_numpy: bool = False):
+        """Get the values of all value sets as a single array of seriesType
+
+        Each value set is placed at its startIndex..endIndex, value sets without
+        indices follow the previous one. Returns an array.array, or a
+        numpy.ndarray if use_numpy is True (requires numpy). Non-numeric values
+        are returned as a list, DateTime values as datetime64 with numpy.
+
+        Args:
+            length (int | None): Number of values in the Series (see SeriesSet.length), \
+                needed for AutoIncrementedValueSets without endIndex. Defaults to \
+                the end of the last value set.
+            use_numpy (bool): If True, return a numpy.ndarray
+        """
+        values, gaps = self._fill_(length, use_numpy)
+        if gaps:
+            raise ValueError(
+                f"Series '{self.seriesID}' has no values at index {gaps[0][0]}"
+            )
+        return values
+
+    def _fill_(self, length: Optional[int], use_numpy: bool) -> tuple[Any, list]:
+        """Helper function for placing all values in a single buffer
+
+        Numeric types are stored in an array.array or numpy.ndarray, other types
+        in a list, or a numpy.ndarray of objects (datetime64 for DateTime).
+        Missing values are NaN for floats, 0 for integers, NaT for datetime64
+        and None otherwise.
+
+        Returns:
+            tuple[Sequence, list[tuple[int, int]]]: Values, and the index ranges \
+                (end exclusive) without values
+        """
+        parts = self._value_ranges_(length, use_numpy)
+        n = length if length is not None else max((x[1] for x in parts), default=0)
+
+        # Find gaps (and overflow) before filling
+        gaps = []
+        pos = 0
+        for begin, end, _ in sorted(parts, key=lambda x: x[0]):
+            if end > n:
+                raise ValueError(f"Series '{self.seriesID}' has more than {n} values")
+            if begin > pos:
+                gaps.append((pos, begin))
+            pos = max(pos, end)
+        if pos < n:
+            gaps.append((pos, n))
+
+        if self.seriesType not in binary.BINARY_TYPES:
+            values = [None] * n
+            for begin, end, part in parts:
+                values[begin:end] = part
+            if use_numpy and self.seriesType == ParameterType.DateTime:
+                values = datetimes.to_datetime64(values)
+            elif use_numpy:
+                values = binary.require_numpy().array(values, dtype=object)
+            return values, gaps
+
+        binary_type = binary.get_binary_type(self.seriesType)
+        floating = binary_type.typecode in "fd"
+
+        if use_numpy:
+            np = binary.require_numpy()
+            if len(parts) == 1 and parts[0][:2] == (0, n):
+                return np.asarray(parts[0][2], dtype=binary_type.dtype), gaps
+            values = np.empty(n, dtype=binary_type.dtype)
+            for begin, end in gaps:
+                values[begin:end] = np.nan if floating else 0
+        else:
+            values = array(binary_type.typecode)
+            values.frombytes(bytes(n * values.itemsize))  # Zero filled
+            for begin, end in gaps if floating else ():
+                values[begin:end] = array(values.typecode, [math.nan]) * (end - begin)
+
+        for begin, end, part in parts:
+            if not use_numpy and (
+                not isinstance(part, array) or part.typecode != values.typecode
+            ):
+                part = array(values.typecode, part)
+            values[begin:end] = part
+        return values, gaps
+
+    def _value_ranges_(self, length: Optional[int], use_numpy: bool) -> list[tuple]:
+        """Helper function for decoding each value set, with the index range it covers
+
+        Returns:
+            list[tuple[int, int, Sequence]]: Start index, end index (exclusive) and \
+                values of each value set
+        """
+        parts = []
+        pos = 0
+        for valueset in self.valuesets or []:
+            begin = valueset.startIndex if valueset.startIndex is not None else pos
+            if isinstance(valueset, EncodedValueSet):
+                part = valueset.to_array(self.seriesType, use_numpy=use_numpy)
+            elif isinstance(valueset, IndividualValueSet):
+                if isinstance(valueset.values, ValueArray):
+                    part = valueset.values.data
+                else:
+                    part = [x.value for x in valueset.values]
+            elif isinstance(valueset, AutoIncrementedValueSet):
+                if valueset.endIndex is not None:
+                    count = valueset.endIndex - begin + 1
+                elif length is not None:
+                    count = length - begin
+                else:
+                    raise ValueError(
+                        f"Length of Series '{self.seriesID}' needed for values "
+                        "without endIndex"
+                    )
+                part = valueset.to_array(self.seriesType, count, use_numpy=use_numpy)
+            else:
+                raise TypeError(f"Unable to convert {type(valueset).__name__} to array")
+
+            end = begin + len(part)
+            if valueset.endIndex is not None and valueset.endIndex + 1 != end:
+                raise ValueError(
+                    f"Series '{self.seriesID}' has {len(part)} values for index "
+                    f"range {begin}..{valueset.endIndex}"
+                )
+            parts.append((begin, end, part))
+            pos = end
+        return parts
+
+
+def _mask(length: int, gaps: list[tuple[int, int]], use_numpy: bool):
+    """Create a mask that is True for the given index ranges"""
+    if use_numpy:
+        mask = binary.require_numpy().zeros(length, dtype=bool)
+        for begin, end in gaps:
+            mask[begin:end] = True
+        return mask
+
+    mask = array("b", bytes(length))
+    for begin, end in gaps:
+        mask[begin:end] = array("b", [1]) * (end - begin)
+    return mask
+
+
+def _safe_cast(values: Sequence[Any], dtype: ParameterType) -> Sequence[Any]:
+    """Convert a numpy array to the dtype of a binary type, if no values change
+
+    E.g. unsigned or boolean arrays given an explicit seriesType.
+    """
+    np = binary.numpy
+    if np is None or not isinstance(values, np.ndarray):
+        return values
+    target = binary.get_binary_type(dtype).dtype
+    if values.dtype != target and np.can_cast(values.dtype, target):
+        return values.astype(target)
+    return values
+
+
+def _infer_list_type(series_id: str, values: Sequence[Any]) -> ParameterType:
+    """Get the seriesType of a column that is not an array of a binary type"""
+    if isinstance(values, array):
+        kind = f"array typecode '{values.typecode}'"
+    elif binary.numpy is not None and isinstance(values, binary.numpy.ndarray):
+        kind = f"dtype '{values.dtype}'"
+    elif any(isinstance(x, bool) for x in values):
+        kind = "booleans"
+    elif all(isinstance(x, numbers.Integral) for x in values):
+        return ParameterType.Int64
+    elif all(isinstance(x, numbers.Real) for x in values):
+        return ParameterType.Float64
+    else:
+        kind = "non-numeric values"
+    raise ValueError(
+        f"Column '{series_id}': unable to infer the seriesType of {kind}, "
+        "pass it in types"
+    )
+
 
 @dataclass
 class SeriesSet(XmlModel, regclass=AnIMLDocBase):
@@ -110,10 +327,10 @@ class SeriesSet(XmlModel, regclass=AnIMLDocBase):
     """
 
     name: Annotated[str, ATTRIB]
-    id: Annotated[Optional[str], ATTRIB(regex=NC_NAME)]
-    length: Annotated[int, ATTRIB(**SERIALIZE_INT)]
+    id: Annotated[Optional[str], ATTRIB(regex=NC_NAME)] = None
+    length: Annotated[int, ATTRIB(**SERIALIZE_INT)] = 0
 
-    series: Annotated[list[Series], CHILD]
+    series: Annotated[list[Series], CHILD] = field(default_factory=list)
 
     @overload
     def append(self, item: Series) -> Series:
@@ -123,4 +340,127 @@ class SeriesSet(XmlModel, regclass=AnIMLDocBase):
         if self.series is None:
             self.series = list()
         self.series.append(item)
+        KeyIndex.attach(self, "seriesID").add(item)
         return item
+
+    def get(self, seriesID: str) -> Optional[Series]:
+        """Get a Series by its seriesID, None if there is none
+
+        Uses an index built on first use, see `KeyIndex`.
+        """
+        return KeyIndex.attach(self, "seriesID").get(self.series, seriesID)
+
+    @classmethod
+    def from_columns(
+        cls,
+        name: str,
+        columns: Mapping[str, Sequence[Any]],
+        types: Optional[Mapping[str, Union[ParameterType, str]]] = None,
+        encoding: str = "auto",
+        independent: Iterable[str] = (),
+        id: Optional[str] = None,
+    ) -> SeriesSet:
+        """Create a SeriesSet with one Series per column, without per-value objects
+
+        Numeric columns are stored as an EncodedValueSet ("base64") or as an
+        IndividualValueSet backed by a ValueArray ("individual"). With "auto",
+        columns with a constant step become an AutoIncrementedValueSet and other
+        numeric columns are encoded. Non-numeric columns are always individual.
+
+        Args:
+            name (str): Name of the SeriesSet
+            columns (Mapping[str, Sequence]): Values keyed by seriesID, all of the \
+                same length. array.array, numpy.ndarray (datetime64 for DateTime) \
+                or lists.
+            types (Mapping[str, ParameterType | str] | None): seriesType per column, \
+                defaults to the type of array columns, Int64 for lists of ints \
+                and Float64 for other lists of numbers. Required for other \
+                columns, e.g. unsigned or boolean arrays and lists of strings
+            encoding (str): "auto", "base64" or "individual"
+            independent (Iterable[str]): seriesIDs of the independent columns
+            id (str | None): Anchor point for digital signature
+
+        Raises:
+            ValueError: If a column has values out of range of its type, or \
+                invalid values otherwise, or its type can not be inferred
+        """
+        if encoding not in ("auto", "base64", "individual"):
+            raise ValueError(f"Unknown encoding '{encoding}'")
+        lengths = {len(x) for x in columns.values()}
+        if len(lengths) > 1:
+            raise ValueError("Columns must have the same length")
+        length = lengths.pop() if lengths else 0
+        types = types or {}
+        independent = set(independent)
+
+        series = []
+        for series_id, values in columns.items():
+            dtype = types.get(series_id) or binary.infer_type(values)
+            if datetimes.is_datetime64(values):
+                values = datetimes.from_datetime64(values)
+                dtype = dtype or ParameterType.DateTime
+            if dtype is None:
+                dtype = _infer_list_type(series_id, values)
+            dtype = ParameterType(dtype)
+            if dtype in binary.BINARY_TYPES:
+                values = _safe_cast(values, dtype)
+
+            valueset = None
+            try:
+                if dtype not in binary.BINARY_TYPES:
+                    model = VALUE_TYPES[dtype]
+                    valueset = IndividualValueSet(
+                        values=[model(value=x) for x in values]
+                    )
+                elif encoding == "individual":
+                    model = VALUE_TYPES[dtype]
+                    valueset = IndividualValueSet.from_array(model, values)
+                elif encoding == "auto":
+                    valueset = AutoIncrementedValueSet.from_array(values, dtype)
+                if valueset is None:
+                    valueset = EncodedValueSet.from_array(values, dtype)
+            except OverflowError:
+                raise ValueError(
+                    f"Column '{series_id}' out of range of {dtype.value}"
+                ) from None
+            except (TypeError, ValueError) as e:
+                raise ValueError(f"Column '{series_id}': {e}") from e
+            if length:
+                valueset.startIndex, valueset.endIndex = 0, length - 1
+
+            series.append(
+                Series(
+                    name=series_id,
+                    dependency=(
+                        Dependency.Independent
+                        if series_id in independent
+                        else Dependency.Dependent
+                    ),
+                    seriesID=series_id,
+                    seriesType=dtype,
+                    valuesets=[valueset],
+                )
+            )
+
+        return cls(name=name, id=id, length=length, series=series)
+
+    def to_columns(self, use_numpy: bool = False) -> dict[str, Column]:
+        """Get the values of each Series as a column of `length` rows
+
+        Args:
+            use_numpy (bool): If True, columns are numpy arrays (requires numpy)
+
+        Returns:
+            dict[str, Column]: Columns keyed by seriesID, in Series order
+        """
+        columns = {}
+        for series in self.series or []:
+            values, gaps = series._fill_(self.length, use_numpy)
+            columns[series.seriesID] = Column(
+                name=series.name,
+                seriesType=series.seriesType,
+                independent=series.dependency == Dependency.Independent,
+                values=values,
+                mask=_mask(self.length, gaps, use_numpy) if gaps else None,
+            )
+        return columns
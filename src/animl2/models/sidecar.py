@@ -0,0 +1,110 @@
+from __future__ import annotations
+
+import mmap
+import os
+from typing import NamedTuple, Optional, Union
+
+from ..core import XmlModel
+from .data_type import LargePayload
+from .valuesets import EncodedValueSet
+
+
+class SidecarSlice(NamedTuple):
+    """Location of an EncodedValueSet payload in a Sidecar
+
+    Attributes:
+        sidecar (Sidecar): File holding the payload
+        offset (int): Position of the first byte
+        length (int): Number of bytes
+    """
+
+    sidecar: Sidecar
+    offset: int
+    length: int
+
+    def view(self) -> memoryview:
+        """Get the payload as a read-only view of the memory mapped file"""
+        return self.sidecar.view(self.offset, self.length)
+
+
+class Sidecar:
+    """Binary file holding decoded payloads outside of the models
+
+    Holds the data of EncodedValueSets, and PNG, SVG and EmbeddedXML values.
+    Offloaded models keep only their offset into the file, their data is
+    read through a shared, read-only memory map. Processes mapping the same
+    file (e.g. forked workers, or a Sidecar reopened by path after pickling)
+    share the data through the OS page cache instead of each holding a copy.
+
+    Documents are still dumped as standard inline AnIML, see
+    `EncodedValueSet.offload`.
+
+    Args:
+        path (str | PathLike): File to store payloads in, created if missing. \
+            Payloads are appended to existing content.
+        writable (bool): If False, the file is only read
+    """
+
+    def __init__(self, path: Union[str, os.PathLike], writable: bool = True):
+        self.path = os.fspath(path)
+        self.writable = writable
+        self._file = open(self.path, "a+b" if writable else "rb")
+        self._map: Optional[mmap.mmap] = None
+
+    def __getstate__(self):
+        return {"path": self.path}
+
+    def __setstate__(self, state):
+        self.__init__(state["path"], writable=False)
+
+    def __enter__(self) -> Sidecar:
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    def append(self, data: Union[bytes, memoryview]) -> SidecarSlice:
+        """Store data at the end of the file"""
+        if not self.writable:
+            raise ValueError(f"Sidecar '{self.path}' is read-only")
+        offset = self._file.seek(0, os.SEEK_END)
+        self._file.write(data)
+        self._file.flush()
+        return SidecarSlice(self, offset, len(data))
+
+    def view(self, offset: int, length: int) -> memoryview:
+        """Get a read-only view of part of the file"""
+        if length == 0:
+            return memoryview(b"")
+        end = offset + length
+        if self._map is None or len(self._map) < end:
+            # Grown since mapped, views of the old map stay valid
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+            if len(self._map) < end:
+                raise ValueError(f"Sidecar '{self.path}' has no data at {offset}")
+        return memoryview(self._map)[offset:end]
+
+    def store(self, model: XmlModel) -> None:
+        """Move the payload of a single model to this file, if it has one
+
+        Payloads are those of EncodedValueSets and of PNG, SVG and EmbeddedXML
+        values, other models are left as they are. Children are not visited.
+        """
+        if isinstance(model, (EncodedValueSet, LargePayload)):
+            model.offload(self)
+
+    def offload(self, model: XmlModel) -> XmlModel:
+        """Move the payloads of all models in a tree to this file, see `store`
+
+        Returns:
+            XmlModel: The model, changed in place
+        """
+        self.store(model)
+        for child in model._iter_xml_children_():
+            self.offload(child)
+        return model
+
+    def close(self) -> None:
+        """Close the file, views that are still in use keep the mapping alive"""
+        self._map = None
+        self._file.close()
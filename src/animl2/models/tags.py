@@ -1,9 +1,12 @@
 from __future__ import annotations
 
+import weakref
 from dataclasses import dataclass, field
-from typing import Annotated, Optional, overload
+from typing import Annotated, Any, Optional, overload
 
 from ..core import ATTRIB, CHILD, XmlModel
+from ..utils.index import TagIndex
+from ..utils.regex import TOKEN
 from .base import AnIMLDocBase
 
 
@@ -23,7 +26,7 @@ class Tag(XmlModel, regclass=AnIMLDocBase):
 
     """
 
-    name: Annotated[str, ATTRIB]
+    name: Annotated[str, ATTRIB(regex=TOKEN)]
     value: Annotated[Optional[str], ATTRIB] = None
 
 
@@ -51,5 +54,31 @@ class TagSet(XmlModel, regclass=AnIMLDocBase):
         """Add a Tag to this TagSet"""
 
     def append(self, item):
+        if self.tags is None:
+            self.tags = list()
         self.tags.append(item)
+        for ref, owner in self.__dict__.get("_listeners", ()):
+            index = ref()
+            if index is not None:
+                index.add(item.name, item.value, owner)
         return item
+
+    def _listen_(self, index: TagIndex, owner: Any) -> None:
+        """Helper function for adding the Tags appended later to index, for owner
+
+        The index is referenced weakly, so dropping it ends the updates.
+        """
+        listeners = []
+        for ref, other in self.__dict__.get("_listeners", ()):
+            if ref() is index and other is owner:
+                return
+            if ref() is not None:
+                listeners.append((ref, other))
+        listeners.append((weakref.ref(index), owner))
+        self._listeners = listeners
+
+    def __getstate__(self):
+        # Weak references can not be pickled, indexes listen again when rebuilt
+        state = self.__dict__.copy()
+        state.pop("_listeners", None)
+        return state
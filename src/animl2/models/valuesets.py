@@ -1,10 +1,25 @@
+from __future__ import annotations
+
+import base64
+from array import array
+from collections.abc import MutableSequence
 from dataclasses import dataclass
-from typing import Annotated, List, Optional, Union
+from typing import (
+    TYPE_CHECKING,
+    Annotated,
+    Any,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Union,
+)
+from xml.etree import ElementTree as ET
 
 from ..core import ATTRIB, CHILD, TEXT, XmlModel
+from ..utils import binary, datetimes, numeric, streams
 from .base import AnIMLDocBase
 from .data_type import (
-    SERIALIZE_BINARY,
     SERIALIZE_INT,
     BooleanType,
     DateTimeType,
@@ -19,6 +34,39 @@ from .data_type import (
 )
 from .infrastructure import Increment, StartValue
 
+if TYPE_CHECKING:
+    from .sidecar import Sidecar
+
+WRITE_CHUNK_SIZE = 1 << 20  # Bytes of encoded data per write, see write_model
+
+# Base64 text is kept as loaded, it is only turned into bytes if value is used
+SERIALIZE_BASE64 = {
+    "on_serialize": lambda x: x.decode("ascii") if x else None,
+    "on_deserialize": lambda x: x if x else None,
+}
+
+
+# Value item model of each series/parameter type name
+VALUE_TYPES: dict[str, type[XmlModel]] = {
+    "Int32": IntType,
+    "Int64": LongType,
+    "Float32": FloatType,
+    "Float64": DoubleType,
+    "String": StringType,
+    "Boolean": BooleanType,
+    "DateTime": DateTimeType,
+    "EmbeddedXML": EmbeddedXmlType,
+    "PNG": PNGType,
+    "SVG": SVGType,
+}
+
+
+def _number(x: Any) -> Union[int, float]:
+    """Get the plain number of a StartValue/Increment or value item"""
+    while isinstance(x, XmlModel):
+        x = x.value
+    return x
+
 
 @dataclass
 class AutoIncrementedValueSet(XmlModel, regclass=AnIMLDocBase):
@@ -45,6 +93,113 @@ class AutoIncrementedValueSet(XmlModel, regclass=AnIMLDocBase):
     endIndex: Annotated[Optional[int], ATTRIB(**SERIALIZE_INT)] = None
     startIndex: Annotated[Optional[int], ATTRIB(**SERIALIZE_INT)] = None
 
+    @property
+    def start(self) -> Union[int, float]:
+        """First value, as a plain number"""
+        return _number(self.startValue)
+
+    @property
+    def step(self) -> Union[int, float]:
+        """Increment, as a plain number"""
+        return _number(self.increment)
+
+    def __bool__(self) -> bool:
+        return True  # A model, even if empty
+
+    def __len__(self) -> int:
+        if self.startIndex is None or self.endIndex is None:
+            raise ValueError("Length unknown, startIndex and endIndex are not set")
+        return max(self.endIndex - self.startIndex + 1, 0)
+
+    def __getitem__(self, index: int) -> Union[int, float]:
+        n = len(self)
+        if index < 0:
+            index += n
+        if not 0 <= index < n:
+            raise IndexError("AutoIncrementedValueSet index out of range")
+        return self.start + index * self.step
+
+    @classmethod
+    def from_array(
+        cls, values: Any, dtype: str, startIndex: int = 0
+    ) -> Optional[AutoIncrementedValueSet]:
+        """Create an AutoIncrementedValueSet if values have a constant step, else None
+
+        Values only qualify if to_array() reproduces them exactly, i.e. if each
+        value equals start + i * step, with start and step rounded to the type
+        (e.g. single precision for Float32) as they are after a reload.
+
+        Args:
+            values (Sequence): array.array, numpy.ndarray or list of numbers, at \
+                least two of them
+            dtype (ParameterType | str): Type of the values, one of Int32, Int64, \
+                Float32 or Float64
+            startIndex (int): Zero-based index of the first entry
+        """
+        n = len(values)
+        if n < 2:
+            return None
+        model = VALUE_TYPES[dtype]
+        np = binary.numpy
+        is_numpy = np is not None and isinstance(values, np.ndarray)
+
+        start, step = values[0], values[1] - values[0]
+        if is_numpy:
+            start, step = start.item(), step.item()
+        # Checked as they reload, i.e. rounded to the precision they are dumped in
+        typecode = binary.get_binary_type(dtype).typecode
+        try:
+            start, step = array(typecode, (start, step)).tolist()
+        except OverflowError:
+            return None  # Step out of range of the type
+        inst = cls(
+            startValue=StartValue(model(value=start)),
+            increment=Increment(model(value=step)),
+            startIndex=startIndex,
+            endIndex=startIndex + n - 1,
+        )
+
+        expected = inst.to_array(dtype, use_numpy=is_numpy)
+        if is_numpy:
+            return inst if np.array_equal(expected, values) else None
+        if not isinstance(values, array) or values.typecode != expected.typecode:
+            values = array(expected.typecode, values)
+        return inst if expected == values else None
+
+    def to_array(
+        self,
+        dtype: Optional[str] = None,
+        length: Optional[int] = None,
+        use_numpy: bool = False,
+    ):
+        """Compute the values into an array.array, or a numpy.ndarray if use_numpy
+
+        Each value is computed as start + i * step, so errors do not accumulate.
+
+        Args:
+            dtype (ParameterType | str | None): Type of the values, one of Int32, \
+                Int64, Float32 or Float64. Defaults to Int64 for integer start \
+                and step values, otherwise Float64.
+            length (int | None): Number of values, required if startIndex or \
+                endIndex is not set
+            use_numpy (bool): If True, return a numpy.ndarray (requires numpy)
+        """
+        start, step = self.start, self.step
+        n = len(self) if length is None else length
+        if dtype is None:
+            exact = isinstance(start, int) and isinstance(step, int)
+            dtype = "Int64" if exact else "Float64"
+        binary_type = binary.get_binary_type(dtype)
+
+        if use_numpy:
+            np = binary.require_numpy()
+            values = np.arange(n, dtype="<f8" if "f" in binary_type.dtype else "<i8")
+            return (start + values * step).astype(binary_type.dtype, copy=False)
+
+        if isinstance(start, int) and isinstance(step, int) and step != 0:
+            return array(binary_type.typecode, range(start, start + n * step, step))
+        return array(binary_type.typecode, (start + i * step for i in range(n)))
+
 
 @dataclass
 class EncodedValueSet(XmlModel, regclass=AnIMLDocBase):
@@ -55,6 +210,10 @@ class EncodedValueSet(XmlModel, regclass=AnIMLDocBase):
 
     ```
 
+    The data is held in one form only: base64 as loaded or assigned, until the
+    values are first accessed (see `data`), decoded from then on. value is
+    encoded again on access and when dumped or written, without being kept.
+
     Attributes:
         endIndex (int | None): Zero-based index of the last entry in this Value Set. The specification is inclusive.
         startIndex (int | None): Zero-based index of the first entry in this Value Set. The specification is inclusive.
@@ -62,11 +221,279 @@ class EncodedValueSet(XmlModel, regclass=AnIMLDocBase):
         value (bytes | None): Base64 encoded binary data
     """
 
-    value: Annotated[Optional[bytes], TEXT(**SERIALIZE_BINARY)]
+    value: Annotated[Optional[bytes], TEXT(**SERIALIZE_BASE64)]
 
     endIndex: Annotated[Optional[int], ATTRIB(**SERIALIZE_INT)] = None
     startIndex: Annotated[Optional[int], ATTRIB(**SERIALIZE_INT)] = None
 
+    @classmethod
+    def from_array(
+        cls,
+        values: Iterable[Any],
+        dtype: str,
+        startIndex: Optional[int] = None,
+        endIndex: Optional[int] = None,
+    ) -> EncodedValueSet:
+        """Create an EncodedValueSet from an array of numbers
+
+        Args:
+            values (Iterable): array.array, numpy.ndarray or any iterable of numbers
+            dtype (ParameterType | str): Type of the values, one of Int32, Int64, \
+                Float32 or Float64 (the seriesType of the parent Series)
+            startIndex (int | None): Zero-based index of the first entry
+            endIndex (int | None): Zero-based index of the last entry
+        """
+        raw = binary.to_bytes(values, dtype)
+        inst = cls(value=None, startIndex=startIndex, endIndex=endIndex)
+        inst._raw = memoryview(raw)  # Already decoded, encoded when dumped
+        return inst
+
+    def _get_value_(self) -> Optional[bytes]:
+        encoded = self.__dict__.get("_encoded")
+        if isinstance(encoded, str):
+            # Loaded text, replaced by its bytes (same size) on first access
+            encoded = self._encoded = encoded.encode("ascii")
+        if encoded is None and self.__dict__.get("_raw") is not None:
+            return base64.b64encode(self._raw)  # Not kept, see data
+        return encoded
+
+    def _set_value_(self, value: Optional[bytes]) -> None:
+        # Replaces the data in any form, including an offloaded one
+        self._encoded = value
+        self.__dict__.pop("_raw", None)
+        self.__dict__.pop("_sidecar", None)
+
+    @property
+    def data(self) -> memoryview:
+        """Decoded binary data, read-only
+
+        Decoded on first access, the base64 value is dropped then. Views the
+        memory mapped file if the data has been offloaded, see `offload`.
+        """
+        if self.offloaded:
+            return self._sidecar.view()
+        raw = self.__dict__.get("_raw")
+        if raw is None:
+            encoded = self.__dict__.get("_encoded")
+            raw = streams.b64decode(encoded) if encoded else b""
+        if not isinstance(raw, memoryview):
+            raw = memoryview(raw)
+        self._raw = raw
+        self._encoded = None
+        return raw
+
+    def to_array(self, dtype: str, use_numpy: bool = False):
+        """Decode the values into an array.array, or a numpy.ndarray if use_numpy
+
+        Args:
+            dtype (ParameterType | str): Type of the values, one of Int32, Int64, \
+                Float32 or Float64 (the seriesType of the parent Series)
+            use_numpy (bool): If True, return a read-only numpy.ndarray viewing \
+                the decoded data (requires numpy)
+        """
+        return binary.from_bytes(self.data, dtype, use_numpy=use_numpy)
+
+    def offload(self, sidecar: Sidecar) -> None:
+        """Move the decoded data to a sidecar file, keeping only its location
+
+        value is set to None and data views the memory mapped file instead.
+        The data is encoded again when dumped or written, so documents stay
+        standard inline AnIML. Assigning a new value brings it back inline.
+
+        Args:
+            sidecar (Sidecar): File to store the data in
+        """
+        location = sidecar.append(self.data)
+        self.value = None
+        self._sidecar = location
+
+    @property
+    def offloaded(self) -> bool:
+        """True if the data is stored in a sidecar file, see `offload`"""
+        return self.__dict__.get("_sidecar") is not None
+
+    def __eq__(self, other):
+        if not isinstance(other, EncodedValueSet):
+            return NotImplemented
+        if (self.startIndex, self.endIndex) != (other.startIndex, other.endIndex):
+            return False
+        if self.__dict__.get("_encoded") and other.__dict__.get("_encoded"):
+            return self.value == other.value  # Both still encoded
+        return self.data == other.data
+
+    def __getstate__(self):
+        # Views can not be pickled, the decoded data is copied into bytes
+        state = self.__dict__.copy()
+        if isinstance(state.get("_raw"), memoryview) and not self.offloaded:
+            state["_raw"] = state["_raw"].tobytes()
+        return state
+
+    def _dump_xml_text_(self):
+        encoded = self.__dict__.get("_encoded")
+        if isinstance(encoded, str):
+            return encoded  # As loaded
+        if encoded is None and (self.offloaded or "_raw" in self.__dict__):
+            return base64.b64encode(self.data).decode("ascii")
+        return encoded.decode("ascii") if encoded else None
+
+    def _write_xml_text_(self, write) -> None:
+        encoded = self.__dict__.get("_encoded")
+        if encoded is None:
+            if not self.offloaded and "_raw" not in self.__dict__:
+                return  # No value
+            # Encode piecewise, 3 byte groups encode without padding
+            data = self.data
+            size = WRITE_CHUNK_SIZE // 4 * 3
+            for i in range(0, len(data), size):
+                write(base64.b64encode(data[i : i + size]))
+            return
+        # Base64 is plain ASCII, write it as is instead of copying all of it
+        for i in range(0, len(encoded), WRITE_CHUNK_SIZE):
+            chunk = encoded[i : i + WRITE_CHUNK_SIZE]
+            write(chunk.encode("ascii") if isinstance(chunk, str) else chunk)
+
+
+# Installed after the dataclass is created, its __init__ assigns through it
+EncodedValueSet.value = property(
+    EncodedValueSet._get_value_, EncodedValueSet._set_value_
+)
+
+
+class ValueArray(MutableSequence):
+    """Homogeneous list of numeric values, stored in a compact array
+
+    Behaves like a list of DoubleType/FloatType/IntType/LongType items, but
+    keeps only the raw numbers. Items are created on access, so changing an
+    item returned by indexing does not change the array, assign it instead.
+    Accepts both value items of its type and plain numbers when set.
+
+    Args:
+        model (type): Value type of the items, e.g. DoubleType
+        data (Iterable): Raw values, an array.array of matching type is used as is
+
+    Raises:
+        ValueError: If a number is out of range of the type, e.g. of Int32
+    """
+
+    # Floats are kept as doubles so values read back exactly as parsed
+    TYPECODES: dict[type, str] = {
+        DoubleType: "d",
+        FloatType: "d",
+        IntType: binary.get_binary_type("Int32").typecode,
+        LongType: binary.get_binary_type("Int64").typecode,
+    }
+    TYPES: dict[type, str] = {
+        DoubleType: "Float64",
+        FloatType: "Float32",
+        IntType: "Int32",
+        LongType: "Int64",
+    }
+    MODELS: dict[str, type] = {x.tag: x for x in TYPECODES}
+
+    __slots__ = ("model", "data")
+
+    def __init__(self, model: type, data: Iterable[Any] = ()):
+        if model not in self.TYPECODES:
+            raise TypeError(f"Unsupported value type '{model.__name__}'")
+        code = self.TYPECODES[model]
+        if not isinstance(data, array) or data.typecode != code:
+            try:
+                data = array(code, data)
+            except OverflowError:
+                raise self._range_error_(model) from None
+        self.model = model
+        self.data = data
+
+    @classmethod
+    def from_values(cls, values: Iterable[Any]) -> Optional[ValueArray]:
+        """Get a ValueArray of value items, None if they are not all of one numeric type"""
+        values = list(values)
+        if not values:
+            return None
+        model = type(values[0])
+        if model not in cls.TYPECODES or any(type(x) is not model for x in values):
+            return None
+        try:
+            return cls(model, [x.value for x in values])
+        except (TypeError, ValueError):
+            return None  # Kept as a list, wrapped when dumped
+
+    @classmethod
+    def load_xml_elements(cls, elements: list[ET.Element]) -> Optional[ValueArray]:
+        """Parse value elements, None if they are not all of one numeric type"""
+        if not elements:
+            return None
+        model = cls.MODELS.get(elements[0].tag)
+        if model is None or any(x.tag != model.tag for x in elements):
+            return None
+        try:
+            data = numeric.parse_values([x.text for x in elements], cls.TYPES[model])
+        except (TypeError, ValueError, OverflowError):
+            return None
+        return cls(model, data)
+
+    def dump_xml_elements(self) -> list[ET.Element]:
+        """Dump the values as value elements, i.e. <D>...</D>"""
+        tag = self.model.tag
+        items = []
+        for text in numeric.format_values(self.data, self.TYPES[self.model]):
+            x = ET.Element(tag)
+            x.text = text
+            items.append(x)
+        return items
+
+    @classmethod
+    def _range_error_(cls, model: type) -> ValueError:
+        """Helper function for the error of values out of range of their type"""
+        return ValueError(
+            f"Field 'values' out of range of {cls.TYPES[model]} ({model.__name__})"
+        )
+
+    def _unwrap(self, value: Any):
+        if isinstance(value, self.model):
+            return value.value
+        if isinstance(value, XmlModel):
+            raise TypeError(
+                f"Expected {self.model.__name__}, got {type(value).__name__}"
+            )
+        return value
+
+    def __len__(self) -> int:
+        return len(self.data)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return ValueArray(self.model, self.data[index])
+        return self.model(value=self.data[index])
+
+    def __setitem__(self, index, value):
+        try:
+            if isinstance(index, slice):
+                self.data[index] = array(self.data.typecode, map(self._unwrap, value))
+            else:
+                self.data[index] = self._unwrap(value)
+        except OverflowError:
+            raise self._range_error_(self.model) from None
+
+    def __delitem__(self, index):
+        del self.data[index]
+
+    def insert(self, index: int, value: Any) -> None:
+        try:
+            self.data.insert(index, self._unwrap(value))
+        except OverflowError:
+            raise self._range_error_(self.model) from None
+
+    def __eq__(self, other):
+        if isinstance(other, ValueArray):
+            return self.model is other.model and self.data == other.data
+        if isinstance(other, list):
+            return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return f"ValueArray({self.model.__name__}, {self.data.tolist()!r})"
+
 
 @dataclass
 class IndividualValueSet(XmlModel, regclass=AnIMLDocBase):
@@ -85,9 +512,12 @@ class IndividualValueSet(XmlModel, regclass=AnIMLDocBase):
         startIndex (int | None): Zero-based index of the first entry in this Value Set. The specification is inclusive.
 
         values (list[BooleanType | DoubleType | DateTimeType | EmbeddedXmlType | FloatType | IntType | LongType | \
-            PNGType | StringType | SVGType]]): A set of Value elements.
+            PNGType | StringType | SVGType]]): A set of Value elements. Loaded as a ValueArray if all \
+            values are of the same numeric type.
     """
 
+    _load_whole_ = True
+
     values: Annotated[
         List[
             Union[
@@ -108,3 +538,49 @@ class IndividualValueSet(XmlModel, regclass=AnIMLDocBase):
 
     endIndex: Annotated[Optional[int], ATTRIB(**SERIALIZE_INT)] = None
     startIndex: Annotated[Optional[int], ATTRIB(**SERIALIZE_INT)] = None
+
+    @classmethod
+    def from_array(
+        cls,
+        model: type,
+        values: Iterable[Any],
+        startIndex: Optional[int] = None,
+        endIndex: Optional[int] = None,
+    ) -> IndividualValueSet:
+        """Create an IndividualValueSet of plain numbers, stored as a ValueArray
+
+        Args:
+            model (type): Value type, one of DoubleType, FloatType, IntType or LongType
+            values (Iterable): Numbers to store
+            startIndex (int | None): Zero-based index of the first entry
+            endIndex (int | None): Zero-based index of the last entry
+        """
+        return cls(
+            values=ValueArray(model, values), startIndex=startIndex, endIndex=endIndex
+        )
+
+    @classmethod
+    def _load_xml_children_(cls, x: ET.Element):
+        elements = list(x)
+        values = ValueArray.load_xml_elements(elements)
+        if values is not None:
+            return {"values": values}
+        if elements and all(e.tag == DateTimeType.tag for e in elements):
+            try:
+                parsed = datetimes.parse_datetimes([e.text for e in elements])
+            except (TypeError, ValueError):
+                pass  # Loaded one by one below, reporting the invalid element
+            else:
+                return {"values": [DateTimeType(value=v) for v in parsed]}
+        # Mixed or other values
+        return super()._load_xml_children_(x)
+
+    def _dump_xml_children_(self) -> list[ET.Element]:
+        if isinstance(self.values, ValueArray):
+            return self.values.dump_xml_elements()
+        return super()._dump_xml_children_()
+
+    def _iter_xml_children_(self) -> Iterator[XmlModel]:
+        if isinstance(self.values, ValueArray):
+            return iter(())  # Plain numbers, there are no child models to visit
+        return super()._iter_xml_children_()
@@ -0,0 +1,140 @@
+import array
+import base64
+import sys
+from typing import Any, Iterable, NamedTuple, Optional, Union
+
+from . import streams
+
+try:
+    import numpy
+except ImportError:  # Optional dependency
+    numpy = None
+
+
+class BinaryType(NamedTuple):
+    """Storage of a numeric series type in encoded (little-endian) form
+
+    Attributes:
+        typecode (str): `array.array` type code with the same item size
+        dtype (str): NumPy dtype, little-endian
+    """
+
+    typecode: str
+    dtype: str
+
+
+def _typecode(kind: str, size: int) -> str:
+    """Get the array type code of a given kind and item size, as C sizes vary"""
+    for code in {"i": "ilq", "f": "fd"}[kind]:
+        if array.array(code).itemsize == size:
+            return code
+    raise TypeError(f"No array type code for {size} byte values")
+
+
+# Keyed by series/parameter type name
+BINARY_TYPES: dict[str, BinaryType] = {
+    "Int32": BinaryType(_typecode("i", 4), "<i4"),
+    "Int64": BinaryType(_typecode("i", 8), "<i8"),
+    "Float32": BinaryType(_typecode("f", 4), "<f4"),
+    "Float64": BinaryType(_typecode("f", 8), "<f8"),
+}
+
+
+def get_binary_type(type_name: str) -> BinaryType:
+    """Get the binary storage of a numeric type, e.g. 'Float64'"""
+    try:
+        return BINARY_TYPES[type_name]
+    except KeyError:
+        raise ValueError(f"Type '{type_name}' can not be binary encoded") from None
+
+
+def infer_type(values: Any) -> Optional[str]:
+    """Get the numeric type name of an array.array or numpy.ndarray, None if unknown"""
+    if isinstance(values, array.array):
+        code = values.typecode
+        kind = "f" if code in "fd" else "i" if code in "bhilq" else "u"
+        size = values.itemsize
+    elif numpy is not None and isinstance(values, numpy.ndarray):
+        kind, size = values.dtype.kind, values.dtype.itemsize
+    else:
+        return None
+    for name, binary in BINARY_TYPES.items():
+        if binary.dtype[1:] == f"{kind}{size}":
+            return name
+    return None
+
+
+def require_numpy():
+    """Get the numpy module, raises if it is not installed"""
+    if numpy is None:
+        raise ImportError("numpy is required, install it with 'pip install numpy'")
+    return numpy
+
+
+def decode(data: bytes, type_name: str, use_numpy: bool = False):
+    """Decode base64 encoded little-endian values into an array
+
+    Args:
+        data (bytes): Base64 encoded values, may contain whitespace
+        type_name (str): Type of the values, e.g. 'Float64'
+        use_numpy (bool): If True, return a (read-only) numpy.ndarray \
+            instead of an array.array
+    """
+    raw = streams.b64decode(data) if data else b""
+    return from_bytes(raw, type_name, use_numpy=use_numpy)
+
+
+def from_bytes(raw: Union[bytes, memoryview], type_name: str, use_numpy: bool = False):
+    """Get the values of raw little-endian binary data as an array
+
+    Args:
+        raw (bytes | memoryview): Binary data
+        type_name (str): Type of the values, e.g. 'Float64'
+        use_numpy (bool): If True, return a numpy.ndarray viewing raw (read-only \
+            unless raw is writable) instead of an array.array copy
+    """
+    binary = get_binary_type(type_name)
+
+    if use_numpy:
+        np = require_numpy()
+        return np.frombuffer(raw, dtype=binary.dtype)
+
+    values = array.array(binary.typecode)
+    if len(raw) % values.itemsize:
+        raise ValueError(
+            f"Encoded data length {len(raw)} is not a multiple of {values.itemsize}"
+        )
+    values.frombytes(raw)
+    if sys.byteorder != "little":
+        values.byteswap()
+    return values
+
+
+def encode(values: Iterable[Any], type_name: str) -> bytes:
+    """Encode values as base64 little-endian binary data
+
+    Args:
+        values (Iterable): array.array, numpy.ndarray or any iterable of numbers
+        type_name (str): Type of the values, e.g. 'Float64'
+    """
+    return base64.b64encode(to_bytes(values, type_name))
+
+
+def to_bytes(values: Iterable[Any], type_name: str) -> bytes:
+    """Get values as raw little-endian binary data
+
+    Args:
+        values (Iterable): array.array, numpy.ndarray or any iterable of numbers
+        type_name (str): Type of the values, e.g. 'Float64'
+    """
+    binary = get_binary_type(type_name)
+
+    if numpy is not None and isinstance(values, numpy.ndarray):
+        return numpy.ascontiguousarray(values, dtype=binary.dtype).tobytes()
+
+    if not isinstance(values, array.array) or values.typecode != binary.typecode:
+        values = array.array(binary.typecode, values)
+    if sys.byteorder != "little":
+        values = array.array(binary.typecode, values)
+        values.byteswap()
+    return values.tobytes()
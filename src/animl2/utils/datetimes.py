@@ -0,0 +1,99 @@
+import re
+import sys
+from datetime import datetime, timezone
+from functools import lru_cache
+from typing import Any, Iterable, Optional
+
+from .binary import numpy, require_numpy
+
+PARSE_CACHE_SIZE = 4096  # Distinct texts kept by parse_datetime
+
+# Resolution of datetime64 arrays, the same as datetime
+DATETIME64 = "datetime64[us]"
+
+
+# Fractional seconds and the 'Z' suffix, which fromisoformat only takes from 3.11 on
+_FRACTION = re.compile(r"([.,])(\d+)")
+_UTC = re.compile(r"[Zz]$")
+
+
+def _fromisoformat_compat(text: str) -> datetime:
+    """Parse an ISO 8601 date/time on Python < 3.11, like fromisoformat on 3.11
+
+    Covers the xs:dateTime forms used by AnIML: fractional seconds of any
+    length and a 'Z' suffix. Other forms new in 3.11 are not supported.
+    """
+    try:
+        return datetime.fromisoformat(text)
+    except ValueError:
+        pass
+    if not isinstance(text, str):
+        raise TypeError(f"fromisoformat: argument must be str, not {type(text)}")
+    normalized = _UTC.sub("+00:00", text)
+    normalized = _FRACTION.sub(lambda m: "." + m[2][:6].ljust(6, "0"), normalized)
+    try:
+        return datetime.fromisoformat(normalized)
+    except ValueError:
+        raise ValueError(f"Invalid isoformat string: {text!r}") from None
+
+
+if sys.version_info >= (3, 11):
+    fromisoformat = datetime.fromisoformat
+else:
+    fromisoformat = _fromisoformat_compat
+
+
+@lru_cache(maxsize=PARSE_CACHE_SIZE)
+def parse_datetime(text: str) -> datetime:
+    """Parse an ISO 8601 date/time, caching the most recently used texts
+
+    For scalar fields repeating the same few values, e.g. Timestamps. The
+    returned datetime objects are immutable and thus shared between callers.
+    """
+    return fromisoformat(text)
+
+
+def parse_datetimes(texts: Iterable[str], use_numpy: bool = False):
+    """Parse ISO 8601 dates/times, all at once
+
+    Args:
+        texts (Iterable[str]): Text of each value
+        use_numpy (bool): If True, return a numpy datetime64 array, see `to_datetime64`
+
+    Raises:
+        ValueError: If a text is not a valid date/time (or is empty)
+    """
+    values = list(map(fromisoformat, texts))
+    return to_datetime64(values) if use_numpy else values
+
+
+def to_datetime64(values: Iterable[Optional[datetime]]):
+    """Get datetimes as a numpy datetime64 array (requires numpy)
+
+    datetime64 has no time zone, aware values are converted to UTC. None
+    becomes NaT.
+    """
+    np = require_numpy()
+    naive = [
+        (
+            x.astimezone(timezone.utc).replace(tzinfo=None)
+            if x is not None and x.tzinfo is not None
+            else x
+        )
+        for x in values
+    ]
+    return np.array(naive, dtype=DATETIME64)
+
+
+def is_datetime64(values: Any) -> bool:
+    """Check if values is a numpy datetime64 array"""
+    return (
+        numpy is not None
+        and isinstance(values, numpy.ndarray)
+        and values.dtype.kind == "M"
+    )
+
+
+def from_datetime64(values: Any) -> list[Optional[datetime]]:
+    """Get the values of a numpy datetime64 array as (naive) datetimes, NaT as None"""
+    return values.astype(DATETIME64).tolist()
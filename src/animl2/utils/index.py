@@ -0,0 +1,191 @@
+from bisect import bisect_left
+from operator import itemgetter
+from typing import Any, Iterable, Optional, Sequence
+
+
+class KeyIndex:
+    """Lookup of list items by the value of one of their attributes
+
+    Built on the first lookup and kept up to date through `add`, which the
+    append methods of the owning model call. The index maps keys to positions
+    in the list and checks the item found there on every hit, so items that
+    were replaced, moved or re-keyed in place are not returned. It is rebuilt
+    when the list length changed or a hit is stale, misses take O(1) otherwise.
+    Call `rebuild` after other changes, e.g. replacing an item with one under
+    a new key. Keys that occur more than once map to the first item.
+
+    Args:
+        key (str): Name of the attribute to index, e.g. 'sampleID'
+    """
+
+    __slots__ = ("key", "_map", "_count")
+
+    def __init__(self, key: str):
+        self.key = key
+        self._map: Optional[dict[Any, int]] = None
+        self._count = 0
+
+    @classmethod
+    def attach(cls, owner: Any, key: str) -> "KeyIndex":
+        """Get the index of an owner model, created on first use"""
+        name = f"_index_{key}"
+        index = owner.__dict__.get(name)
+        if index is None:
+            index = cls(key)
+            setattr(owner, name, index)
+        return index
+
+    def get(self, items: Optional[Sequence[Any]], value: Any) -> Optional[Any]:
+        """Get the first item with the given key value, None if there is none"""
+        items = items or ()
+        if self._map is None or self._count != len(items):
+            self.rebuild(items)
+        if value not in self._map:
+            return None
+        item = self._lookup(items, value)
+        if item is None:
+            self.rebuild(items)  # Moved or re-keyed since indexed
+            item = self._lookup(items, value)
+        return item
+
+    def add(self, item: Any) -> None:
+        """Record an item appended to the indexed list"""
+        if self._map is not None:
+            self._map.setdefault(getattr(item, self.key), self._count)
+            self._count += 1
+
+    def rebuild(self, items: Sequence[Any]) -> None:
+        """Index all items anew"""
+        index: dict[Any, int] = {}
+        for i, item in enumerate(items):
+            index.setdefault(getattr(item, self.key), i)
+        self._map = index
+        self._count = len(items)
+
+    def _lookup(self, items: Sequence[Any], value: Any) -> Optional[Any]:
+        """Helper function for getting the indexed item, if it still has the key"""
+        i = self._map.get(value)
+        if i is None or i >= len(items):
+            return None
+        item = items[i]
+        return item if getattr(item, self.key) == value else None
+
+
+class PrefixIndex:
+    """Sorted string keys, for exact and prefix lookups in O(log n + k)
+
+    Items added after a lookup are sorted in on the next one. Items with equal
+    keys stay in the order they were added.
+    """
+
+    __slots__ = ("_keys", "_items", "_pending")
+
+    def __init__(self):
+        self._keys: list[str] = []
+        self._items: list[Any] = []
+        self._pending: list[tuple[str, Any]] = []
+
+    def __len__(self) -> int:
+        return len(self._keys) + len(self._pending)
+
+    def add(self, key: str, item: Any) -> None:
+        """Add an item under a key"""
+        self._pending.append((key, item))
+
+    def get(self, key: str) -> Optional[Any]:
+        """Get the first item with the given key, None if there is none"""
+        self._sort()
+        i = bisect_left(self._keys, key)
+        if i < len(self._keys) and self._keys[i] == key:
+            return self._items[i]
+        return None
+
+    def prefix(self, prefix: str) -> list[Any]:
+        """Get all items whose key starts with prefix, ordered by key"""
+        self._sort()
+        keys = self._keys
+        i = bisect_left(keys, prefix)
+        j = i
+        while j < len(keys) and keys[j].startswith(prefix):
+            j += 1
+        return self._items[i:j]
+
+    def _sort(self) -> None:
+        if not self._pending:
+            return
+        # Mostly sorted already, timsort merges the new run in linear time
+        pairs = list(zip(self._keys, self._items)) + self._pending
+        pairs.sort(key=itemgetter(0))
+        self._keys = [k for k, _ in pairs]
+        self._items = [x for _, x in pairs]
+        self._pending = []
+
+
+class TagIndex:
+    """Inverted index from tag names and values to the items carrying them
+
+    Items are kept in the order they were added, an item carrying the same
+    tag twice in a row is recorded once. Indexes of several documents can be
+    combined with `merge` for queries over all of them.
+    """
+
+    __slots__ = ("_map", "__weakref__")
+
+    def __init__(self):
+        self._map: dict[str, dict[Optional[str], list[Any]]] = {}
+
+    def __len__(self) -> int:
+        return sum(len(x) for values in self._map.values() for x in values.values())
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._map
+
+    @classmethod
+    def merged(cls, indexes: Iterable["TagIndex"]) -> "TagIndex":
+        """Get a new index holding the entries of all indexes, in the given order"""
+        index = cls()
+        for other in indexes:
+            index.merge(other)
+        return index
+
+    def add(self, name: str, value: Optional[str], item: Any) -> None:
+        """Record that item carries the tag name=value"""
+        items = self._map.setdefault(name, {}).setdefault(value, [])
+        if not items or items[-1] is not item:
+            items.append(item)
+
+    def get(self, name: str, value: Optional[str] = None) -> list[Any]:
+        """Get the items tagged name=value, or with any value of name if None
+
+        Use `get_exact` for items whose tag has no value.
+        """
+        values = self._map.get(name)
+        if not values:
+            return []
+        if value is not None:
+            return list(values.get(value, ()))
+        if len(values) == 1:
+            return list(next(iter(values.values())))
+        found: list[Any] = []
+        seen: set[int] = set()
+        for items in values.values():
+            for item in items:
+                if id(item) not in seen:
+                    seen.add(id(item))
+                    found.append(item)
+        return found
+
+    def get_exact(self, name: str, value: Optional[str]) -> list[Any]:
+        """Get the items tagged name=value, where None matches tags without value"""
+        return list(self._map.get(name, {}).get(value, ()))
+
+    def values(self, name: str) -> list[Optional[str]]:
+        """Get the distinct values of a tag, in the order they were first seen"""
+        return list(self._map.get(name, ()))
+
+    def merge(self, other: "TagIndex") -> None:
+        """Add all entries of another index after the entries of this one"""
+        for name, values in other._map.items():
+            mine = self._map.setdefault(name, {})
+            for value, items in values.items():
+                mine.setdefault(value, []).extend(items)
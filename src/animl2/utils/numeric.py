@@ -0,0 +1,64 @@
+from array import array
+from typing import Iterable, Union
+
+from .binary import get_binary_type
+
+# Type names formatted after rounding/wrapping to their binary storage
+_ROUNDED = ("Float32", "Int32", "Int64")
+
+
+def _wrap(values: Iterable[int], typecode: str) -> array:
+    """Store integers in an array, wrapping out of range values like ctypes does"""
+    values = list(values)
+    try:
+        return array(typecode, values)
+    except OverflowError:
+        pass
+    unsigned = array(typecode.upper())
+    mask = (1 << (unsigned.itemsize * 8)) - 1
+    unsigned.extend(v & mask for v in values)
+    wrapped = array(typecode)
+    wrapped.frombytes(unsigned.tobytes())  # Reinterpret as signed
+    return wrapped
+
+
+def format_values(values: Iterable[Union[int, float]], type_name: str) -> list[str]:
+    """Format numbers as XML text, all at once
+
+    Gives the same strings as the value item serializers (e.g. `SERIALIZE_FLOAT`)
+    applied to each number, i.e. Float32 values are rounded to single precision
+    and Int32/Int64 values wrap around. None is not allowed.
+
+    Args:
+        values (Iterable): array.array or any iterable of numbers
+        type_name (str): Type of the values, one of Int32, Int64, Float32 or Float64
+    """
+    typecode = get_binary_type(type_name).typecode
+    if type_name not in _ROUNDED:
+        if isinstance(values, array):
+            values = values.tolist()  # Faster to iterate
+        return list(map(str, values))
+    if type_name == "Float32":
+        stored = array(typecode, values)  # Rounds like c_float
+    else:
+        stored = _wrap(values, typecode)
+    return list(map(str, stored.tolist()))
+
+
+def parse_values(texts: Iterable[str], type_name: str) -> array:
+    """Parse the XML text of numbers, all at once
+
+    Floats are kept as doubles, so values read back exactly as written.
+
+    Args:
+        texts (Iterable[str]): Text of each value
+        type_name (str): Type of the values, one of Int32, Int64, Float32 or Float64
+
+    Raises:
+        ValueError: If a text is not a number (or is empty)
+        OverflowError: If an integer is out of range of its type
+    """
+    binary = get_binary_type(type_name)
+    if type_name.startswith("Float"):
+        return array("d", map(float, texts))
+    return array(binary.typecode, map(int, texts))
@@ -1,2 +1,8 @@
 # 'Non-colonized Name' pattern
 NC_NAME = r"^[a-zA-Z_][\w\.\-]*$"
+
+# 'Token with up to 1024 characters' pattern (xs:token, maxLength 1024)
+TOKEN = r"^(?=.{0,1024}\Z)(?:[^ \t\n\r]+(?: [^ \t\n\r]+)*)?\Z"
+
+# SHA256 checksum pattern, hex encoded and lower cased
+SHA256 = r"^[0-9a-f]{64}\Z"
@@ -0,0 +1,77 @@
+import base64
+import io
+from typing import Iterable, Iterator, Optional, Union
+
+CHUNK_SIZE = 1 << 20  # Bytes read (or written) at a time
+
+_WHITESPACE = b" \t\r\n"
+
+
+class ChunkReader(io.RawIOBase):
+    """Read-only binary stream over an iterable of byte chunks
+
+    Wrap in an `io.BufferedReader` (see `open_chunks`) for line and sized reads.
+
+    Args:
+        chunks (Iterable[bytes]): Data, produced as it is read
+    """
+
+    def __init__(self, chunks: Iterable[Union[bytes, memoryview]]):
+        self._chunks: Iterator = iter(chunks)
+        self._current: Optional[memoryview] = None
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        while not self._current:
+            chunk = next(self._chunks, None)
+            if chunk is None:
+                return 0
+            self._current = memoryview(chunk).cast("B")
+        n = min(len(buffer), len(self._current))
+        buffer[:n] = self._current[:n]
+        self._current = self._current[n:]
+        return n
+
+
+def open_chunks(chunks: Iterable[Union[bytes, memoryview]]) -> io.BufferedReader:
+    """Get a buffered binary stream reading from byte chunks, see `ChunkReader`"""
+    return io.BufferedReader(ChunkReader(chunks))
+
+
+def iter_chunks(data: Union[bytes, memoryview], size: int = CHUNK_SIZE):
+    """Yield slices of data without copying it"""
+    data = memoryview(data)
+    for i in range(0, len(data), size):
+        yield data[i : i + size]
+
+
+def b64decode_chunks(
+    encoded: Union[bytes, memoryview], size: int = CHUNK_SIZE
+) -> Iterator[bytes]:
+    """Decode base64 data piecewise, ignoring line breaks and other whitespace
+
+    Raises:
+        ValueError: If the data is not valid base64
+    """
+    rest = b""
+    for chunk in iter_chunks(encoded, size):
+        chunk = rest + bytes(chunk).translate(None, _WHITESPACE)
+        n = len(chunk) // 4 * 4
+        rest = chunk[n:]
+        if n:
+            yield base64.b64decode(chunk[:n], validate=True)
+    if rest:
+        raise ValueError("Incomplete base64 data")
+
+
+def b64decode(encoded: Union[bytes, str, memoryview]) -> bytes:
+    """Decode base64 data at once, ignoring line breaks and other whitespace
+
+    Raises:
+        ValueError: If the data is not valid base64
+    """
+    if isinstance(encoded, str):
+        encoded = encoded.encode("ascii")
+    return b"".join(b64decode_chunks(encoded))
@@ -0,0 +1,47 @@
+import re
+from typing import Callable
+
+from .regex import NC_NAME, SHA256, TOKEN
+
+# Patterns are compiled once, for NCName and SHA256 the regex engine is faster
+# than any equivalent check written in python.
+_nc_name = re.compile(NC_NAME).match
+_sha256 = re.compile(SHA256).match
+
+
+def is_nc_name(value: str) -> bool:
+    """Check if value is a 'Non-colonized Name', same as matching `NC_NAME`"""
+    return _nc_name(value) is not None
+
+
+def is_token(value: str) -> bool:
+    """Check if value is a token with up to 1024 characters, same as matching `TOKEN`"""
+    return (
+        len(value) <= 1024
+        and "  " not in value
+        and value[:1] != " "
+        and value[-1:] != " "
+        and "\t" not in value
+        and "\n" not in value
+        and "\r" not in value
+    )
+
+
+def is_sha256(value: str) -> bool:
+    """Check if value is a lower cased, hex encoded SHA256, same as matching `SHA256`"""
+    return _sha256(value) is not None
+
+
+# Validators to use in place of the regex patterns they are equivalent to
+VALIDATORS: dict[str, Callable[[str], bool]] = {
+    NC_NAME: is_nc_name,
+    TOKEN: is_token,
+    SHA256: is_sha256,
+}
+
+
+def compile_validator(regex: str) -> Callable[[str], bool]:
+    """Get a validator for a regex pattern, compiling it if there is no dedicated one"""
+    if regex in VALIDATORS:
+        return VALIDATORS[regex]
+    return re.compile(regex).match
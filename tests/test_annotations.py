@@ -1,7 +1,9 @@
 import unittest
 import xml.etree.ElementTree as etree
 from dataclasses import dataclass
+from types import MappingProxyType
 from typing import Annotated, List, Optional, Set, Union
+from unittest import mock
 
 from helpers import create_dummy_regclass
 
@@ -164,3 +166,70 @@ class TestUnionTypes(unittest.TestCase):
 
         xml2 = "<TestUnionLoadModel><EE/></TestUnionLoadModel>"
         TestUnionLoadModel.load_xml(etree.fromstring(xml2))
+
+
+class TestResolveTypes(unittest.TestCase):
+    def test_Resolve(self):
+        ann = Annotation.parse("Optional[A]")
+        registry = MappingProxyType({"A": A})
+
+        self.assertEqual(ann.resolve_types(registry), (A,))
+        self.assertIs(ann.resolve_types(registry), ann.resolve_types(registry))
+
+    def test_Resolve_Builtin(self):
+        ann = Annotation.parse("Union[int, B]")
+        self.assertEqual(ann.resolve_types(MappingProxyType({"B": B})), (B, int))
+
+    def test_Resolve_Once(self):
+        ann = Annotation.parse("str")
+        registry = MappingProxyType({})
+
+        with mock.patch("animl2.core.annotations.locate", return_value=str) as m:
+            for _ in range(3):
+                ann.check_type_ex("abc", "name", registry)
+        self.assertEqual(m.call_count, 1)
+
+    def test_Resolve_NewRegistry(self):
+        ann = Annotation.parse("A")
+        self.assertEqual(ann.resolve_types(MappingProxyType({})), ())
+        self.assertEqual(ann.resolve_types(MappingProxyType({"A": A})), (A,))
+
+    def test_CheckType_CachedMismatch(self):
+        ann = Annotation.parse("A")
+        registry = MappingProxyType({"A": A})
+
+        with mock.patch.object(A, "__init__", side_effect=TypeError) as m:
+            for _ in range(3):
+                self.assertRaisesRegex(
+                    TypeError, "Type mismatch", ann.check_type_ex, 1, "name", registry
+                )
+        self.assertEqual(m.call_count, 1)  # Not tried again for int values
+
+    def test_CheckType_Conversion(self):
+        ann = Annotation.parse(float)
+        registry = MappingProxyType({})
+
+        ann.check_type_ex(1, "name", registry)
+        ann.check_type_ex("1.5", "name", registry)
+        self.assertRaises(ValueError, ann.check_type_ex, "a", "name", registry)
+        ann.check_type_ex("2", "name", registry)  # Not cached as a mismatch
+
+    def test_CheckType(self):
+        ann = Annotation.parse(Optional[int])
+        registry = MappingProxyType({})
+
+        ann.check_type_ex(1, "name", registry)
+        ann.check_type_ex(None, "name", registry)
+        ann.check_type_ex("1", "name", registry)  # Convertible
+        self.assertRaises(ValueError, ann.check_type_ex, "a", "name", registry)
+        self.assertRaisesRegex(
+            TypeError, "Type mismatch", ann.check_type_ex, A(), "name", registry
+        )
+        self.assertRaisesRegex(
+            ValueError,
+            "Field 'name' is not optional",
+            Annotation.parse(int).check_type_ex,
+            None,
+            "name",
+            registry,
+        )
@@ -65,6 +65,36 @@ class TestClassFromTag(unittest.TestCase):
             ValueError, "Type 'T_MultiFailClass' already registered", f
         )
 
+    def test_GetClassFail_MultipleTag(self):
+        regclass = create_dummy_regclass()
+
+        class T_MultiTagClass(XmlModel, regclass=regclass):
+            pass
+
+        class T_MultiTagClassA(XmlModel, regclass=create_dummy_regclass()):
+            tag = "T_MultiTagClass"
+
+        self.assertRaisesRegex(
+            ValueError,
+            "Multiple classes with tag 'T_MultiTagClass'",
+            regclass.register,
+            "OtherKey",
+            T_MultiTagClassA,
+        )
+
+    def test_TagIndex_Invalidate(self):
+        regclass = create_dummy_regclass()
+
+        class T_IndexClassA(XmlModel, regclass=regclass):
+            pass
+
+        self.assertEqual(regclass.get_tag_index(), {"T_IndexClassA": T_IndexClassA})
+
+        class T_IndexClassB(XmlModel, regclass=regclass):
+            pass
+
+        self.assertIs(T_IndexClassA.class_from_tag("T_IndexClassB"), T_IndexClassB)
+
 
 class TestCustomSerializer(unittest.TestCase):
     def test_DumpAttribute(self):
@@ -246,3 +276,40 @@ class TestTag(unittest.TestCase):
             pass
 
         self.assertEqual(TagModel_().tag, "TagModel_")
+
+
+class TestTrustedLoad(unittest.TestCase):
+    def setUp(self):
+        regclass = create_dummy_regclass()
+
+        @dataclass
+        class T_TrustedChild(XmlModel, regclass=regclass):
+            value: Annotated[str, ATTRIB(regex=r"^[a-z]+$")]
+
+        @dataclass
+        class T_Trusted(XmlModel, regclass=regclass):
+            child: Annotated[T_TrustedChild, CHILD]
+
+        self.Model = T_Trusted
+        self.Child = T_TrustedChild
+        self.et = ElementTree.fromstring(
+            '<T_Trusted><T_TrustedChild value="0"/></T_Trusted>'
+        )
+
+    def test_Load(self):
+        self.assertRaisesRegex(
+            ValueError, "value must match regex", self.Model.load_xml, self.et
+        )
+
+        model = self.Model.load_xml(self.et, validate=False)
+        self.assertEqual(model.child.value, "0")
+
+        # Validation is back on after loading
+        self.assertRaisesRegex(ValueError, "value must match regex", self.Child, "0")
+
+    def test_Validate(self):
+        model = self.Model.load_xml(self.et, validate=False)
+        self.assertRaisesRegex(ValueError, "value must match regex", model.validate)
+
+        model.child.value = "abc"
+        model.validate()  # No exception
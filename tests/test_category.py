@@ -1,9 +1,13 @@
+import pickle
 import unittest
 from xml.etree import ElementTree
 
 from animl2.core.base import XmlModel
 from animl2.models.category import Category
+from animl2.models.data_type import DoubleType, IntType
+from animl2.models.parameter import Parameter, ParameterType
 from animl2.models.sample import Sample
+from animl2.models.series import SeriesSet
 
 
 class TestCategory(unittest.TestCase):
@@ -33,3 +37,94 @@ class TestCategory(unittest.TestCase):
         self.assertIsInstance(sample.category[0], Category)
         self.assertEqual(sample.category[0].name, "Category 1")
         self.assertEqual(sample.category[0].id, "1234")
+
+
+class TestCategoryPaths(unittest.TestCase):
+    def setUp(self):
+        self.temperature = Parameter(
+            name="Temperature",
+            parameterType=ParameterType.Float64,
+            value=DoubleType(value=21.5),
+        )
+        self.runs = Parameter(
+            name="Runs", parameterType=ParameterType.Int32, value=IntType(value=3)
+        )
+        self.series_set = SeriesSet(name="Trace", length=0, id=None, series=[])
+        self.column = Category(
+            name="Column", parameters=[self.temperature], series_sets=[self.series_set]
+        )
+        self.root = Category(
+            name="Method", parameters=[self.runs], sub_categories=[self.column]
+        )
+
+    def test_Get(self):
+        self.assertIs(self.root.get("Runs"), self.runs)
+        self.assertIs(self.root.get("Column/Temperature"), self.temperature)
+        self.assertIs(self.root.get("Column/Trace"), self.series_set)
+        self.assertIs(self.column.get("Temperature"), self.temperature)
+        self.assertIsNone(self.root.get("Temperature"))
+        self.assertIsNone(self.root.get("Column"))
+
+    def test_GetMany(self):
+        self.assertEqual(
+            self.root.get_many(["Runs", "Missing", "Column/Temperature"]),
+            [self.runs, None, self.temperature],
+        )
+
+    def test_GetValue(self):
+        self.assertEqual(self.root.get_value("Column/Temperature"), 21.5)
+        self.assertEqual(self.root.get_value("Missing", default=0), 0)
+        with self.assertRaises(TypeError):
+            self.root.get_value("Column/Trace")
+
+    def test_GetValues(self):
+        self.assertEqual(
+            self.root.get_values(["Runs", "Column/Temperature", "Missing"]),
+            [3, 21.5, None],
+        )
+
+    def test_FirstWins(self):
+        other = Parameter(
+            name="Runs", parameterType=ParameterType.Int32, value=IntType(value=4)
+        )
+        self.root.append(other)
+        self.assertIs(self.root.get("Runs"), self.runs)
+
+    def test_NestedAppend(self):
+        self.assertIsNone(self.root.get("Column/Pressure"))
+        pressure = Parameter(name="Pressure", parameterType=ParameterType.Float64)
+        self.column.append(pressure)
+        self.assertIs(self.root.get("Column/Pressure"), pressure)
+        self.assertIsNone(self.root.get_value("Column/Pressure"))
+
+    def test_Append_OtherTree(self):
+        index = self.root._path_index_()
+        other = Category(name="Other")
+        other.get("Missing")
+        other.append(Parameter(name="Flow", parameterType=ParameterType.Float64))
+        self.assertIs(self.root._path_index_(), index)  # Not rebuilt
+
+        # Appending to a sub-category keeps the indexes of its siblings
+        detector = self.root.append(Category(name="Detector"))
+        self.root.get("Runs")
+        column = self.column._path_index_()
+        detector.append(Parameter(name="Gain", parameterType=ParameterType.Int32))
+        self.assertIs(self.column._path_index_(), column)
+        self.assertIsNotNone(self.root.get("Detector/Gain"))
+
+    def test_Pickle(self):
+        self.root.get("Runs")
+        root = pickle.loads(pickle.dumps(self.root))
+        self.assertEqual(root, self.root)
+        pressure = Parameter(name="Pressure", parameterType=ParameterType.Float64)
+        root.get("Runs")
+        root.sub_categories[0].append(pressure)
+        self.assertIs(root.get("Column/Pressure"), pressure)
+
+    def test_Reindex(self):
+        self.assertIsNone(self.root.get("Column/Pressure"))
+        pressure = Parameter(name="Pressure", parameterType=ParameterType.Float64)
+        self.column.parameters.append(pressure)
+        self.assertIsNone(self.root.get("Column/Pressure"))
+        self.root.reindex()
+        self.assertIs(self.root.get("Column/Pressure"), pressure)
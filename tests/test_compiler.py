@@ -0,0 +1,123 @@
+import unittest
+from dataclasses import dataclass, field
+from enum import Enum
+from typing import Annotated, Optional
+from unittest import mock
+from xml.etree import ElementTree
+
+from helpers import create_dummy_regclass
+
+from animl2.core import ATTRIB, CHILD, TEXT, XmlModel
+from animl2.core.compiler import CompiledModel, compile_model, get_compiled
+
+
+class CompiledEnum(str, Enum):
+    A = "a"
+    B = "b"
+
+
+def create_models():
+    regclass = create_dummy_regclass()
+    regclass.compile_models = True
+    regclass.register(CompiledEnum.__name__, CompiledEnum)
+
+    @dataclass
+    class CompiledChild(XmlModel, regclass=regclass):
+        value: Annotated[int, TEXT(on_serialize=str, on_deserialize=int)]
+
+    @dataclass
+    class CompiledModelA(XmlModel, regclass=regclass):
+        name: Annotated[str, ATTRIB(regex=r"^[a-z]+$")]
+        kind: Annotated[CompiledEnum, ATTRIB]
+        other: Annotated[Optional[str], ATTRIB(alias="other-name")] = None
+        single: Annotated[Optional[CompiledChild], CHILD] = None
+        many: Annotated[list[CompiledChild], CHILD] = field(default_factory=list)
+
+    return CompiledModelA, CompiledChild
+
+
+class TestCompiler(unittest.TestCase):
+    def test_Compile(self):
+        Model, _ = create_models()
+        compiled = get_compiled(Model)
+
+        self.assertIsInstance(compiled, CompiledModel)
+        self.assertIs(get_compiled(Model), compiled)  # Cached
+        self.assertIn("def load(x):", compiled.source)
+        self.assertIn("def dump(self):", compiled.source)
+
+    def test_Load(self):
+        Model, Child = create_models()
+        xml = """
+        <CompiledModelA name="abc" kind="b" other-name="x">
+            <CompiledChild>1</CompiledChild>
+            <CompiledChild>2</CompiledChild>
+        </CompiledModelA>
+        """
+        m = Model.load_xml(ElementTree.fromstring(xml))
+
+        self.assertEqual(m.name, "abc")
+        self.assertIs(m.kind, CompiledEnum.B)
+        self.assertEqual(m.other, "x")
+        self.assertEqual(m.single, Child(value=1))
+        self.assertEqual(m.many, [Child(value=2)])
+
+    def test_LoadFail(self):
+        Model, _ = create_models()
+
+        self.assertRaisesRegex(
+            ValueError,
+            "Missing attribute 'CompiledModelA.kind'",
+            Model.load_xml,
+            ElementTree.fromstring('<CompiledModelA name="abc"/>'),
+        )
+        self.assertRaisesRegex(
+            ValueError,
+            "name must match regex",
+            Model.load_xml,
+            ElementTree.fromstring('<CompiledModelA name="0" kind="a"/>'),
+        )
+        self.assertRaisesRegex(
+            ValueError,
+            "Expected tag 'CompiledModelA', got 'Other'",
+            Model.load_xml,
+            ElementTree.fromstring("<Other/>"),
+        )
+
+    def test_Dump_SameAsInterpreted(self):
+        Model, Child = create_models()
+        m = Model(
+            name="abc",
+            kind=CompiledEnum.A,
+            single=Child(value=1),
+            many=[Child(value=2)],
+        )
+
+        compiled = ElementTree.tostring(m.dump_xml())
+        m.regclass.compile_models = False
+        interpreted = ElementTree.tostring(m.dump_xml())
+
+        self.assertEqual(compiled, interpreted)
+
+    def test_Fallback(self):
+        Model, _ = create_models()
+
+        with mock.patch(
+            "animl2.core.compiler.compile_model", side_effect=SyntaxError("bad")
+        ):
+            with self.assertLogs("animl2.core.compiler", level="WARNING"):
+                self.assertIsNone(get_compiled(Model))
+
+        # Interpreter is still used
+        m = Model.load_xml(
+            ElementTree.fromstring('<CompiledModelA name="a" kind="a"/>')
+        )
+        self.assertEqual(m.name, "a")
+
+    def test_CompileModel(self):
+        _, Child = create_models()
+        compiled = compile_model(Child)
+
+        x = compiled.dump(Child(value=42))
+        self.assertEqual(x.text, "42")
+        self.assertEqual(compiled.load(x), Child(value=42))
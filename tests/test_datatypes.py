@@ -1,5 +1,7 @@
+import base64
 import unittest
 from datetime import datetime
+from xml.etree import ElementTree
 
 from animl2.core.base import XmlModel
 from animl2.models.data_type import (
@@ -14,6 +16,10 @@ from animl2.models.data_type import (
     StringType,
     SVGType,
 )
+from animl2.utils.streams import b64decode_chunks, open_chunks
+
+PNG = b"\x89PNG\r\n\x1a\n" + bytes(range(40))
+PNG_B64 = base64.b64encode(PNG).decode("ascii")
 
 
 class TestTypes(unittest.TestCase):
@@ -65,6 +71,27 @@ class TestTypes(unittest.TestCase):
         self.assertEqual(xml.text, None)
         self.assertEqual(xml.tag, "PNG")
 
+    def test_PNG_Load(self):
+        xml = ElementTree.fromstring(f"<PNG>{PNG_B64[:8]}\n{PNG_B64[8:]}</PNG>")
+        png = PNGType.load_xml(xml)
+        self.assertEqual(bytes(png.data), PNG)
+        self.assertEqual(PNGType(value=PNG_B64.encode()).dump_xml().text, PNG_B64)
+
+    def test_PNG_Open(self):
+        png = PNGType(value=PNG_B64.encode())
+        with png.open() as f:
+            self.assertEqual(f.read(3), PNG[:3])
+            self.assertEqual(f.read(), PNG[3:])
+        self.assertNotIn("_payload", png.__dict__)  # Not decoded as a whole
+
+    def test_PNG_Open_Invalid(self):
+        with self.assertRaises(ValueError):
+            PNGType(value=b"abc").open().read()
+
+    def test_SVG_Open(self):
+        with SVGType(value="<svg>\u00b5</svg>").open() as f:
+            self.assertEqual(f.read(), "<svg>\u00b5</svg>")
+
     def test_String(self):
         self.assertIsInstance(StringType(value="string"), XmlModel)
         xml = StringType(value="string").dump_xml()
@@ -76,3 +103,20 @@ class TestTypes(unittest.TestCase):
         xml = SVGType(value="<svg></svg>").dump_xml()
         self.assertEqual(xml.text, "<svg></svg>")
         self.assertEqual(xml.tag, "SVG")
+
+
+class TestPayloadStreams(unittest.TestCase):
+    def test_Decode_Chunks(self):
+        encoded = "\n".join(PNG_B64[i : i + 10] for i in range(0, len(PNG_B64), 10))
+        chunks = list(b64decode_chunks(encoded.encode(), size=7))
+        self.assertGreater(len(chunks), 1)
+        self.assertEqual(b"".join(chunks), PNG)
+
+    def test_Decode_Incomplete(self):
+        with self.assertRaises(ValueError):
+            list(b64decode_chunks(PNG_B64[:-1].encode(), size=8))
+
+    def test_Open_Chunks(self):
+        with open_chunks([b"ab", b"", memoryview(b"c\nd")]) as f:
+            self.assertEqual(f.readline(), b"abc\n")
+            self.assertEqual(f.read(), b"d")
@@ -0,0 +1,96 @@
+import unittest
+from datetime import datetime, timedelta, timezone
+from xml.etree import ElementTree
+
+from animl2.models.data_type import Timestamp
+from animl2.utils.binary import numpy
+from animl2.utils.datetimes import (
+    _fromisoformat_compat,
+    from_datetime64,
+    fromisoformat,
+    parse_datetime,
+    parse_datetimes,
+    to_datetime64,
+)
+
+
+class TestParseDatetime(unittest.TestCase):
+    def test_Cached(self):
+        parse_datetime.cache_clear()
+        a = parse_datetime("2021-01-01T00:00:00")
+        b = parse_datetime("2021-01-01T00:00:00")
+        self.assertIs(a, b)
+        self.assertEqual(a, datetime(2021, 1, 1))
+        self.assertEqual(parse_datetime.cache_info().hits, 1)
+        self.assertIsNotNone(parse_datetime.cache_info().maxsize)
+
+    def test_Timestamp(self):
+        parse_datetime.cache_clear()
+        x = ElementTree.fromstring("<Timestamp>2021-01-01T12:00:00Z</Timestamp>")
+        a, b = Timestamp.load_xml(x), Timestamp.load_xml(x)
+        self.assertIs(a.value, b.value)
+        self.assertEqual(a.value, datetime(2021, 1, 1, 12, tzinfo=timezone.utc))
+        self.assertEqual(a.dump_xml().text, "2021-01-01T12:00:00+00:00")
+
+    def test_Invalid(self):
+        with self.assertRaises(ValueError):
+            parse_datetime("2021-13-01")
+
+
+class TestFromIsoformatCompat(unittest.TestCase):
+    def test_Forms(self):
+        tests = [
+            ("2021-01-01T00:00:01", datetime(2021, 1, 1, 0, 0, 1)),
+            ("2021-01-01T00:00:01.5", datetime(2021, 1, 1, 0, 0, 1, 500000)),
+            ("2021-01-01T00:00:01.1234567", datetime(2021, 1, 1, 0, 0, 1, 123456)),
+            ("2021-01-01T12:00:00Z", datetime(2021, 1, 1, 12, tzinfo=timezone.utc)),
+            (
+                "2021-01-01T00:00:01.5+02:00",
+                datetime(2021, 1, 1, 0, 0, 1, 500000, timezone(timedelta(hours=2))),
+            ),
+        ]
+        for text, expected in tests:
+            with self.subTest(text=text):
+                self.assertEqual(_fromisoformat_compat(text), expected)
+                self.assertEqual(fromisoformat(text), expected)
+
+    def test_Invalid(self):
+        for text in ("2021-13-01", "2021-01-01T00:00:01.", "x"):
+            with self.subTest(text=text), self.assertRaises(ValueError):
+                _fromisoformat_compat(text)
+
+
+class TestParseDatetimes(unittest.TestCase):
+    TEXTS = ["2021-01-01T00:00:00", "2021-01-01T00:00:01.5", "2021-01-02"]
+
+    def test_List(self):
+        self.assertEqual(
+            parse_datetimes(self.TEXTS),
+            [
+                datetime(2021, 1, 1),
+                datetime(2021, 1, 1, 0, 0, 1, 500000),
+                datetime(2021, 1, 2),
+            ],
+        )
+
+    def test_Invalid(self):
+        with self.assertRaises(ValueError):
+            parse_datetimes(["2021-01-01", ""])
+
+    @unittest.skipIf(numpy is None, "numpy not installed")
+    def test_Numpy(self):
+        values = parse_datetimes(self.TEXTS, use_numpy=True)
+        self.assertEqual(values.dtype, numpy.dtype("datetime64[us]"))
+        self.assertEqual(from_datetime64(values), parse_datetimes(self.TEXTS))
+
+    @unittest.skipIf(numpy is None, "numpy not installed")
+    def test_Numpy_Aware(self):
+        tz = timezone(timedelta(hours=2))
+        values = to_datetime64([datetime(2021, 1, 1, 2, tzinfo=tz), None])
+        self.assertEqual(values[0], numpy.datetime64("2021-01-01T00:00:00"))
+        self.assertTrue(numpy.isnat(values[1]))
+        self.assertEqual(from_datetime64(values), [datetime(2021, 1, 1), None])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,7 +1,32 @@
+import os
+import tempfile
+import pickle
 import unittest
+from io import StringIO
+from unittest import mock
 
 from animl2.core import XmlModel
-from animl2.models.doc import VERSION, XMLNS, XMLNS_XSI, XSI_SCHEMALOCATION, AnIMLDoc
+from animl2.models import (
+    ExperimentDataBulkReference,
+    ExperimentDataReference,
+    ExperimentStep,
+    ExperimentStepSet,
+    Result,
+    Sample,
+    SampleReference,
+    SeriesSet,
+    Tag,
+    TagSet,
+)
+from animl2.models.doc import (
+    VERSION,
+    XMLNS,
+    XMLNS_XSI,
+    XSI_SCHEMALOCATION,
+    AnIMLDoc,
+    index_tags,
+    iter_experiment_steps,
+)
 
 
 class TestDoc(unittest.TestCase):
@@ -37,3 +62,275 @@ class TestDoc(unittest.TestCase):
         doc = AnIMLDoc.loads(txt)
         self.assertIsInstance(doc, AnIMLDoc)
         self.assertIsNone(doc.sample_set)
+
+    def test_Load_Trusted(self):
+        txt = '<AnIML version="0.90"><SampleSet id="0bad"/></AnIML>'
+        self.assertRaisesRegex(ValueError, "must match regex", AnIMLDoc.loads, txt)
+
+        doc = AnIMLDoc.loads(txt, validate=False)
+        self.assertEqual(doc.sample_set.id, "0bad")
+        self.assertRaisesRegex(ValueError, "must match regex", doc.validate)
+
+    def test_Validate(self):
+        txt = '<AnIML version="0.90"><SampleSet id="good"/></AnIML>'
+        doc = AnIMLDoc.loads(txt, validate=False)
+        doc.validate()  # No exception
+
+    def test_IterExperimentSteps(self):
+        steps = list(iter_experiment_steps("tests/resources/animl_0.90.xml"))
+        self.assertEqual([x.experimentStepID for x in steps], ["e1", "", ""])
+        self.assertEqual(steps[0].technique.name, "my_technique")
+
+    def test_IterExperimentSteps_SkipResults(self):
+        txt = """<AnIML><ExperimentStepSet>
+            <ExperimentStep name="a" experimentStepID="1">
+                <Result name="r"/>
+            </ExperimentStep>
+        </ExperimentStepSet></AnIML>"""
+
+        (step,) = iter_experiment_steps(StringIO(txt))
+        self.assertEqual(len(step.results), 1)
+
+        (step,) = iter_experiment_steps(StringIO(txt), skip_results=True)
+        self.assertIsNone(step.results)
+
+    def test_Load_Include(self):
+        txt = """<AnIML version="0.90">
+            <SampleSet><Sample name="s" sampleID="1"/></SampleSet>
+            <ExperimentStepSet>
+                <ExperimentStep name="a" experimentStepID="1"/>
+            </ExperimentStepSet>
+        </AnIML>"""
+
+        doc = AnIMLDoc.loads(txt, include=["SampleSet"])
+        self.assertEqual(doc.sample_set.samples[0].sampleID, "1")
+        self.assertIsNone(doc.experiment_set)
+
+    def test_Write(self):
+        doc = AnIMLDoc()
+        doc.append(Sample(name="s", sampleID="1"))
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "doc.animl")
+            doc.write(path)
+            with open(path, "rb") as f:
+                self.assertEqual(AnIMLDoc.loads(f), doc)
+
+
+class TestDocIndex(unittest.TestCase):
+    def setUp(self):
+        self.doc = AnIMLDoc()
+        for i in range(3):
+            self.doc.append(Sample(name=f"s{i}", sampleID=f"S{i}", id=f"sample{i}"))
+            self.doc.append(ExperimentStep(name=f"e{i}", experimentStepID=f"E{i}"))
+
+    def test_GetSample(self):
+        self.assertIs(self.doc.get_sample("S1"), self.doc.sample_set.samples[1])
+        self.assertIsNone(self.doc.get_sample("S9"))
+        self.assertIsNone(AnIMLDoc().get_sample("S1"))
+
+    def test_GetSample_Append(self):
+        self.doc.get_sample("S0")  # Build the index
+        s = self.doc.append(Sample(name="new", sampleID="S9"))
+        self.assertIs(self.doc.get_sample("S9"), s)
+
+        # Duplicates resolve to the first one
+        self.doc.append(Sample(name="dup", sampleID="S1"))
+        self.assertEqual(self.doc.get_sample("S1").name, "s1")
+
+    def test_GetSample_Modified(self):
+        self.doc.get_sample("S0")
+        s = Sample(name="direct", sampleID="S8")
+        self.doc.sample_set.samples.append(s)  # Bypasses append
+        self.assertIs(self.doc.get_sample("S8"), s)
+
+        s.sampleID = "S7"
+        self.assertIsNone(self.doc.get_sample("S8"))
+
+    def test_GetExperimentStep(self):
+        step = self.doc.get_experiment_step("E2")
+        self.assertIs(step, self.doc.experiment_set.experiment_steps[2])
+        self.doc.append(ExperimentStep(name="new", experimentStepID="E3"))
+        self.assertEqual(self.doc.get_experiment_step("E3").name, "new")
+        self.assertIsNone(self.doc.get_experiment_step("S1"))
+
+    def test_GetById(self):
+        self.assertIs(self.doc.get_by_id("sample2"), self.doc.sample_set.samples[2])
+        self.assertIsNone(self.doc.get_by_id("missing"))
+
+        step = ExperimentStep(name="new", experimentStepID="E3", id="step")
+        step.append(Result(name="r", id="result"))
+        self.doc.append(step)
+        self.assertIs(self.doc.get_by_id("result"), step.results[0])
+
+    def test_GetById_Reindex(self):
+        self.doc.get_by_id("sample0")
+        result = self.doc.experiment_set.experiment_steps[0].append(Result(name="r"))
+        result.series = SeriesSet.from_columns("set", {"x": [1.0]}, id="set")
+        self.assertIsNone(self.doc.get_by_id("set"))  # Attached directly
+        self.doc.reindex()
+        self.assertIs(self.doc.get_by_id("set"), result.series)
+
+        result.series.id = "other"
+        self.assertIsNone(self.doc.get_by_id("set"))  # Stale hit, rebuilt
+        self.assertIs(self.doc.get_by_id("other"), result.series)
+
+        # Removed elements stay in the index until reindexed
+        sample = self.doc.sample_set.samples.pop()
+        self.assertIs(self.doc.get_by_id("sample2"), sample)
+        self.doc.reindex()
+        self.assertIsNone(self.doc.get_by_id("sample2"))
+
+    def test_GetById_Miss(self):
+        self.doc.get_by_id("sample0")
+        with mock.patch.object(AnIMLDoc, "_build_indexes_") as build:
+            for _ in range(3):
+                self.assertIsNone(self.doc.get_by_id("missing"))
+        build.assert_not_called()
+
+
+class TestDocResolve(unittest.TestCase):
+    def setUp(self):
+        self.doc = AnIMLDoc()
+        self.doc.append(Sample(name="s", sampleID="S1"))
+        for i in (2, 1, 10):
+            step = self.doc.append(
+                ExperimentStep(name=f"e{i}", experimentStepID=f"run{i}")
+            )
+            result = step.append(Result(name="r"))
+            result.experiment_step = ExperimentStepSet()
+            result.experiment_step.append(
+                ExperimentStep(name=f"n{i}", experimentStepID=f"run{i}.sub")
+            )
+
+    def names(self, steps):
+        return [x.name for x in steps]
+
+    def test_FindExperimentSteps(self):
+        steps = self.doc.find_experiment_steps("run1")
+        self.assertEqual(self.names(steps), ["e1", "n1", "e10", "n10"])
+        self.assertEqual(self.doc.find_experiment_steps("x"), [])
+
+    def test_FindExperimentSteps_Append(self):
+        self.doc.find_experiment_steps("run")
+        self.doc.append(ExperimentStep(name="e11", experimentStepID="run11"))
+        self.assertEqual(self.names(self.doc.find_experiment_steps("run11")), ["e11"])
+
+    def test_Resolve_SetAppend(self):
+        ref = ExperimentDataReference(
+            dataPurpose="consumed", experimentStepID="run3", role="r"
+        )
+        self.assertIsNone(self.doc.resolve(ref))  # Builds the index
+        step = self.doc.experiment_set.append(
+            ExperimentStep(name="e3", experimentStepID="run3")
+        )
+        self.assertIs(self.doc.resolve(ref), step)
+        self.assertIs(self.doc.get_experiment_step("run3"), step)
+
+        # Nested sets report to the index once it walked them
+        result = step.append(Result(name="r"))
+        result.experiment_step = ExperimentStepSet()
+        self.doc.reindex()
+        self.doc.find_experiment_steps("run")
+        nested = result.experiment_step.append(
+            ExperimentStep(name="n3", experimentStepID="run3.sub")
+        )
+        ref.experimentStepID = "run3.sub"
+        self.assertIs(self.doc.resolve(ref), nested)
+        self.assertEqual(self.names(self.doc.find_experiment_steps("run3")), ["e3", "n3"])
+
+    def test_Resolve(self):
+        ref = ExperimentDataReference(
+            dataPurpose="consumed", experimentStepID="run2.sub", role="r"
+        )
+        self.assertEqual(self.doc.resolve(ref).name, "n2")
+        ref.experimentStepID = "run3"
+        self.assertIsNone(self.doc.resolve(ref))
+
+        bulk = ExperimentDataBulkReference(
+            dataPurpose="consumed", experimentStepIDPrefix="run1", role="r"
+        )
+        self.assertEqual(len(self.doc.resolve(bulk)), 4)
+
+        sample = SampleReference(role="r", sampleID="S1", samplePurpose="consumed")
+        self.assertIs(self.doc.resolve(sample), self.doc.sample_set.samples[0])
+
+        with self.assertRaises(TypeError):
+            self.doc.resolve(Sample(name="s", sampleID="S1"))
+
+
+class TestDocTags(unittest.TestCase):
+    def setUp(self):
+        self.doc = AnIMLDoc()
+        self.sample = self.doc.append(Sample(name="s", sampleID="S1"))
+        self.sample.append(Tag(name="batch", value="123"))
+        self.step = self.doc.append(ExperimentStep(name="e", experimentStepID="E1"))
+        self.step.tag_set = TagSet(tags=[Tag(name="batch", value="123")])
+        result = self.step.append(Result(name="r"))
+        result.experiment_step = ExperimentStepSet()
+        self.nested = result.experiment_step.append(
+            ExperimentStep(name="n", experimentStepID="E1.1")
+        )
+        self.nested.tag_set = TagSet(tags=[Tag(name="batch", value="456")])
+
+    def test_FindTagged(self):
+        self.assertEqual(self.doc.find_tagged("batch", "123"), [self.sample, self.step])
+        self.assertEqual(self.doc.find_tagged("batch", "456"), [self.nested])
+        self.assertEqual(len(self.doc.find_tagged("batch")), 3)
+        self.assertEqual(self.doc.find_tagged("other"), [])
+
+    def test_TagSetAppend(self):
+        self.assertEqual(self.doc.find_tagged("done"), [])
+        self.nested.tag_set.append(Tag(name="done"))
+        self.assertEqual(self.doc.find_tagged("done"), [self.nested])
+
+    def test_TagSetAppend_Incremental(self):
+        index = self.doc.tag_index()
+        other = AnIMLDoc()
+        step = other.append(ExperimentStep(name="x", experimentStepID="X1"))
+        step.tag_set = TagSet()
+        other.tag_index()
+        step.tag_set.append(Tag(name="batch", value="123"))
+        self.assertIs(self.doc.tag_index(), index)  # Not rebuilt
+        self.assertEqual(index.get("batch", "123"), [self.sample, self.step])
+        self.assertEqual(other.find_tagged("batch", "123"), [step])
+
+        # Only the owner of the TagSet is added
+        self.step.tag_set.append(Tag(name="batch", value="456"))
+        self.assertIs(self.doc.tag_index(), index)
+        self.assertEqual(self.doc.find_tagged("batch", "456"), [self.nested, self.step])
+
+    def test_SampleAppend_NewTagSet(self):
+        sample = self.doc.append(Sample(name="t", sampleID="S2"))
+        self.doc.tag_index()
+        sample.append(Tag(name="done"))
+        self.assertEqual(self.doc.find_tagged("done"), [sample])
+
+    def test_Pickle(self):
+        self.doc.tag_index()
+        doc = pickle.loads(pickle.dumps(self.doc))
+        doc.sample_set.samples[0].append(Tag(name="done"))
+        self.assertEqual(doc.find_tagged("done"), [doc.sample_set.samples[0]])
+
+    def test_DocAppend(self):
+        self.doc.tag_index()
+        sample = Sample(name="t", sampleID="S2")
+        sample.tag_set = TagSet(tags=[Tag(name="batch", value="456")])
+        self.doc.append(sample)
+        self.assertEqual(self.doc.find_tagged("batch", "456"), [self.nested, sample])
+
+    def test_Reindex(self):
+        self.doc.tag_index()
+        self.sample.tag_set.tags.clear()
+        self.doc.reindex()
+        self.assertEqual(self.doc.find_tagged("batch", "123"), [self.step])
+
+    def test_IndexTags(self):
+        other = AnIMLDoc()
+        step = other.append(ExperimentStep(name="x", experimentStepID="X1"))
+        step.tag_set = TagSet(tags=[Tag(name="batch", value="123")])
+        index = index_tags([self.doc, other])
+        self.assertEqual(index.get("batch", "123"), [self.sample, self.step, step])
+        self.assertEqual(self.doc.find_tagged("batch", "123"), [self.sample, self.step])
+
+
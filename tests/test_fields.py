@@ -67,6 +67,20 @@ class TestAttribute(unittest.TestCase):
             ),
         )
 
+    def test_Validator(self):
+        @dataclass
+        class A_Validator(XmlModel, regclass=create_dummy_regclass()):
+            value: Annotated[str, Field.Attribute(validator=str.isupper)]
+
+        # OK
+        A_Validator(value="GOOD")
+        # Bad
+        self.assertRaisesRegex(
+            ValueError,
+            "Invalid value for value: 'bad'",
+            lambda: A_Validator(value="bad"),
+        )
+
 
 class TestBase(unittest.TestCase):
     def test_ABC(self):
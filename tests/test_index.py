@@ -0,0 +1,97 @@
+import unittest
+from types import SimpleNamespace
+
+from animl2.utils.index import KeyIndex, PrefixIndex, TagIndex
+
+
+class TestKeyIndex(unittest.TestCase):
+    def test_Get(self):
+        items = [SimpleNamespace(k=i % 3, n=i) for i in range(5)]
+        index = KeyIndex("k")
+        self.assertEqual(index.get(items, 1).n, 1)
+        self.assertIsNone(index.get(items, 7))
+        self.assertIsNone(index.get(None, 1))
+
+    def test_Get_Replaced(self):
+        items = [SimpleNamespace(k=i, n=i) for i in range(3)]
+        index = KeyIndex("k")
+        self.assertEqual(index.get(items, 1).n, 1)
+
+        # Same length, so only the position check notices, misses do not
+        items[1] = SimpleNamespace(k=5, n=5)
+        self.assertIsNone(index.get(items, 5))
+        self.assertIsNone(index.get(items, 1))  # Stale hit, rebuilt
+        self.assertEqual(index.get(items, 5).n, 5)
+        items[0], items[2] = items[2], items[0]
+        self.assertEqual(index.get(items, 0).n, 0)
+        self.assertIs(index.get(items, 2), items[0])
+
+    def test_Attach(self):
+        owner = SimpleNamespace()
+        index = KeyIndex.attach(owner, "k")
+        self.assertIs(KeyIndex.attach(owner, "k"), index)
+        self.assertIsNot(KeyIndex.attach(owner, "n"), index)
+
+
+class TestPrefixIndex(unittest.TestCase):
+    def setUp(self):
+        self.index = PrefixIndex()
+        for key in ["b2", "a1", "b10", "b1", "c", "b1"]:
+            self.index.add(key, f"{key}#{len(self.index)}")
+
+    def test_Prefix(self):
+        self.assertEqual(self.index.prefix("b1"), ["b1#3", "b1#5", "b10#2"])
+        self.assertEqual(self.index.prefix("x"), [])
+        self.assertEqual(len(self.index.prefix("")), 6)
+
+    def test_Get(self):
+        self.assertEqual(self.index.get("b1"), "b1#3")  # First added
+        self.assertIsNone(self.index.get("b"))
+
+    def test_Add_After_Lookup(self):
+        self.index.get("a1")
+        self.index.add("a0", "new")
+        self.assertEqual(self.index.prefix("a"), ["new", "a1#1"])
+        self.assertEqual(len(self.index), 7)
+
+
+class TestTagIndex(unittest.TestCase):
+    def setUp(self):
+        self.index = TagIndex()
+        self.index.add("batch", "1", "a")
+        self.index.add("batch", "1", "a")  # Same item again
+        self.index.add("batch", "2", "b")
+        self.index.add("batch", "1", "c")
+        self.index.add("flag", None, "a")
+
+    def test_Get(self):
+        self.assertEqual(self.index.get("batch", "1"), ["a", "c"])
+        self.assertEqual(self.index.get("batch", "3"), [])
+        self.assertEqual(self.index.get("other"), [])
+        self.assertEqual(len(self.index), 4)
+
+    def test_Get_AnyValue(self):
+        self.index.add("batch", "3", "a")
+        self.assertEqual(self.index.get("batch"), ["a", "c", "b"])
+        self.assertEqual(self.index.get("flag"), ["a"])
+        self.assertEqual(self.index.get_exact("flag", None), ["a"])
+        self.assertEqual(self.index.get_exact("batch", None), [])
+
+    def test_Values(self):
+        self.assertEqual(self.index.values("batch"), ["1", "2"])
+        self.assertIn("flag", self.index)
+        self.assertNotIn("other", self.index)
+
+    def test_Merged(self):
+        other = TagIndex()
+        other.add("batch", "1", "x")
+        other.add("new", "v", "y")
+        merged = TagIndex.merged([self.index, other])
+        self.assertEqual(merged.get("batch", "1"), ["a", "c", "x"])
+        self.assertEqual(merged.get("new", "v"), ["y"])
+        self.assertEqual(self.index.get("batch", "1"), ["a", "c"])  # Unchanged
+        self.assertNotIn("new", self.index)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,70 @@
+import unittest
+from array import array
+
+from animl2.models.data_type import (
+    SERIALIZE_DOUBLE,
+    SERIALIZE_FLOAT,
+    SERIALIZE_INT,
+    SERIALIZE_LONG,
+)
+from animl2.utils.numeric import format_values, parse_values
+
+FLOATS = [0.0, -0.0, 1.0, 1 / 3, 3.141592653589793, 1e-45, 1e300, -1e300, 1e-320]
+FLOATS += [float("inf"), float("-inf"), float("nan"), 123456789.123, 2, -7]
+INTS = [0, 1, -1, 2**31 - 1, -(2**31), 2**31, -(2**31) - 1, 2**32 + 5, 2**63, -(2**64)]
+
+
+class TestFormatValues(unittest.TestCase):
+    def check(self, values, type_name, serializer):
+        expected = [serializer["on_serialize"](v) for v in values]
+        self.assertEqual(format_values(values, type_name), expected)
+
+    def test_Double(self):
+        self.check(FLOATS, "Float64", SERIALIZE_DOUBLE)
+        self.check(array("d", FLOATS), "Float64", SERIALIZE_DOUBLE)
+
+    def test_Float(self):
+        self.check(FLOATS, "Float32", SERIALIZE_FLOAT)
+        self.check(array("d", FLOATS), "Float32", SERIALIZE_FLOAT)
+
+    def test_Int(self):
+        self.check(INTS[:5], "Int32", SERIALIZE_INT)
+        self.check(INTS, "Int32", SERIALIZE_INT)  # Wraps around
+
+    def test_Long(self):
+        self.check(INTS[:-2], "Int64", SERIALIZE_LONG)
+        self.check(INTS, "Int64", SERIALIZE_LONG)
+
+    def test_Empty(self):
+        self.assertEqual(format_values([], "Float32"), [])
+
+    def test_Unsupported(self):
+        with self.assertRaises(ValueError):
+            format_values(["a"], "String")
+
+
+class TestParseValues(unittest.TestCase):
+    def test_Float(self):
+        texts = format_values(array("d", FLOATS), "Float64")
+        values = parse_values(texts, "Float64")
+        self.assertEqual(values.typecode, "d")
+        self.assertEqual(format_values(values, "Float64"), texts)
+
+        # Kept as parsed, not rounded
+        self.assertEqual(parse_values(["0.1"], "Float32").tolist(), [0.1])
+
+    def test_Int(self):
+        self.assertEqual(parse_values(["1", "-2"], "Int32").tolist(), [1, -2])
+        self.assertEqual(parse_values([str(2**40)], "Int64").tolist(), [2**40])
+        with self.assertRaises(OverflowError):
+            parse_values([str(2**31)], "Int32")
+
+    def test_Invalid(self):
+        with self.assertRaises(ValueError):
+            parse_values(["1", ""], "Float64")
+        with self.assertRaises(ValueError):
+            parse_values(["1.5"], "Int32")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,162 @@
+import unittest
+from dataclasses import dataclass, field
+from typing import Annotated, Optional, Union
+from xml.etree import ElementTree
+
+from helpers import create_dummy_regclass
+
+from animl2.core import ATTRIB, CHILD, TEXT, FieldPlan, XmlModel
+
+
+class TestFieldPlan(unittest.TestCase):
+    def setUp(self):
+        regclass = create_dummy_regclass()
+
+        @dataclass
+        class PlanChildA(XmlModel, regclass=regclass):
+            pass
+
+        @dataclass
+        class PlanChildB(XmlModel, regclass=regclass):
+            pass
+
+        @dataclass
+        class PlanModel(XmlModel, regclass=regclass):
+            name: Annotated[str, ATTRIB]
+            other: Annotated[Optional[str], ATTRIB(alias="other-name")] = None
+            first: Annotated[Optional[PlanChildA], CHILD] = None
+            either: Annotated[Optional[list[Union[PlanChildA, PlanChildB]]], CHILD] = (
+                field(default_factory=list)
+            )
+            text: Annotated[Optional[str], TEXT] = None
+
+        self.A = PlanChildA
+        self.B = PlanChildB
+        self.Model = PlanModel
+
+    def test_Plan(self):
+        plan = self.Model.get_field_plan()
+
+        self.assertIsInstance(plan, FieldPlan)
+        self.assertEqual(
+            [x.name for x in plan.fields], list(self.Model.__annotations__)
+        )
+        self.assertEqual(list(plan.attributes_by_name), ["name", "other-name"])
+        self.assertEqual([x.name for x in plan.children], ["first", "either"])
+        self.assertEqual(plan.text.name, "text")
+
+    def test_Plan_Cached(self):
+        self.assertIs(self.Model.get_field_plan(), self.Model.get_field_plan())
+
+    def test_Plan_Immutable(self):
+        plan = self.Model.get_field_plan()
+        with self.assertRaises(TypeError):
+            plan.attributes_by_name["new"] = None
+
+    def test_MatchChildren(self):
+        plan = self.Model.get_field_plan()
+
+        self.assertEqual(
+            [x.name for x in plan.match_children(self.A)], ["first", "either"]
+        )
+        self.assertEqual([x.name for x in plan.match_children(self.B)], ["either"])
+        self.assertEqual(plan.match_children(str), ())
+
+
+class TestChildRoutes(unittest.TestCase):
+    def test_Routes(self):
+        regclass = create_dummy_regclass()
+
+        @dataclass
+        class RouteChild(XmlModel, regclass=regclass):
+            pass
+
+        @dataclass
+        class RouteModel(XmlModel, regclass=regclass):
+            first: Annotated[Optional[RouteChild], CHILD] = None
+            many: Annotated[Optional[list[RouteChild]], CHILD] = None
+
+        route = RouteModel.get_field_plan().routes["RouteChild"]
+        self.assertIs(route.model, RouteChild)
+        self.assertEqual([x.name for x in route.fields], ["first", "many"])
+        self.assertEqual(route.lists, (False, True))
+
+    def test_FillNextSlot(self):
+        regclass = create_dummy_regclass()
+
+        @dataclass
+        class SlotChild(XmlModel, regclass=regclass):
+            value: Annotated[str, TEXT]
+
+        @dataclass
+        class SlotModel(XmlModel, regclass=regclass):
+            start: Annotated[SlotChild, CHILD]
+            end: Annotated[SlotChild, CHILD]
+            rest: Annotated[Optional[list[SlotChild]], CHILD] = None
+
+        xml = """
+        <SlotModel>
+            <SlotChild>1</SlotChild>
+            <SlotChild>2</SlotChild>
+            <SlotChild>3</SlotChild>
+            <SlotChild>4</SlotChild>
+        </SlotModel>
+        """
+        m = SlotModel.load_xml(ElementTree.fromstring(xml))
+
+        self.assertEqual(m.start.value, "1")
+        self.assertEqual(m.end.value, "2")
+        self.assertEqual([x.value for x in m.rest], ["3", "4"])
+
+    def test_NoFreeSlot(self):
+        regclass = create_dummy_regclass()
+
+        @dataclass
+        class FullChild(XmlModel, regclass=regclass):
+            pass
+
+        @dataclass
+        class FullModel(XmlModel, regclass=regclass):
+            first: Annotated[Optional[FullChild], CHILD] = None
+            second: Annotated[Optional[FullChild], CHILD] = None
+
+        xml = "<FullModel><FullChild/><FullChild/><FullChild/></FullModel>"
+        self.assertRaisesRegex(
+            ValueError,
+            "Unable to find field for child 'FullChild'",
+            FullModel.load_xml,
+            ElementTree.fromstring(xml),
+        )
+
+    def test_SingleSlot_LastWins(self):
+        regclass = create_dummy_regclass()
+
+        @dataclass
+        class OnlyChild(XmlModel, regclass=regclass):
+            value: Annotated[str, TEXT]
+
+        @dataclass
+        class OnlyModel(XmlModel, regclass=regclass):
+            only: Annotated[Optional[OnlyChild], CHILD] = None
+
+        xml = "<OnlyModel><OnlyChild>1</OnlyChild><OnlyChild>2</OnlyChild></OnlyModel>"
+        self.assertEqual(OnlyModel.load_xml(ElementTree.fromstring(xml)).only.value, "2")
+
+    def test_Unreachable(self):
+        regclass = create_dummy_regclass()
+
+        @dataclass
+        class LostChild(XmlModel, regclass=regclass):
+            pass
+
+        @dataclass
+        class LostModel(XmlModel, regclass=regclass):
+            many: Annotated[list[LostChild], CHILD] = field(default_factory=list)
+            lost: Annotated[Optional[LostChild], CHILD] = None
+
+        # Raised on class setup, not only when such a child is loaded
+        self.assertRaisesRegex(
+            ValueError,
+            "Unreachable field found for child 'LostChild'",
+            LostModel.get_field_plan,
+        )
@@ -0,0 +1,99 @@
+import unittest
+from array import array
+
+from animl2.core import Query
+from animl2.models import (
+    AnIMLDoc,
+    ExperimentStep,
+    Result,
+    Sample,
+    SeriesSet,
+    ValueArray,
+    open_document,
+)
+from animl2.models.data_type import IntType
+
+RESOURCE = "tests/resources/animl_0.90.xml"
+
+
+def create_doc(names):
+    doc = AnIMLDoc()
+    doc.append(Sample(name="sample", sampleID="S1"))
+    for i, name in enumerate(names):
+        step = doc.append(ExperimentStep(name=name, experimentStepID=f"E{i}"))
+        result = step.append(Result(name=f"result{i}"))
+        result.series = SeriesSet.from_columns(
+            "set",
+            {"time": array("d", [0.0, 0.5]), "abs": array("d", [1.0, 2.0])},
+            independent=["time"],
+            id=f"set{i}",
+        )
+    return doc
+
+
+class TestQuery(unittest.TestCase):
+    PATH = "ExperimentStepSet/ExperimentStep[@name='HPLC']/Result/SeriesSet/Series"
+
+    def setUp(self):
+        self.doc = create_doc(["HPLC", "UV", "HPLC"])
+
+    def test_Select(self):
+        series = self.doc.select(self.PATH + "[@seriesID='abs']")
+        steps = self.doc.experiment_set.experiment_steps
+        self.assertEqual(
+            series,
+            [steps[0].results[0].series.series[1], steps[2].results[0].series.series[1]],
+        )
+        for x in series:
+            self.assertEqual(x.seriesID, "abs")
+
+    def test_Select_Wildcard(self):
+        self.assertEqual(len(self.doc.select("*/*/Result")), 3)
+        self.assertEqual(len(self.doc.select("*")), 2)
+        self.assertEqual(len(self.doc.select("SampleSet/*")), 1)
+
+    def test_Select_Attributes(self):
+        # Enum and integer attributes compare as written to XML
+        independent = self.doc.select(self.PATH + "[@dependency='independent']")
+        self.assertEqual([x.seriesID for x in independent], ["time", "time"])
+        sets = self.doc.select("*/*/Result/SeriesSet[@length='2'][@id='set1']")
+        self.assertEqual(len(sets), 1)
+        self.assertEqual(self.doc.select("*/ExperimentStep[@unknown='x']"), [])
+
+    def test_Select_NoMatch(self):
+        self.assertEqual(self.doc.select("ExperimentStepSet/Sample"), [])
+        self.assertEqual(self.doc.select("Missing/ExperimentStep"), [])
+        self.assertEqual(AnIMLDoc().select(self.PATH), [])
+
+    def test_Select_Relative(self):
+        step = self.doc.experiment_set.experiment_steps[1]
+        self.assertEqual(step.select("Result/SeriesSet"), [step.results[0].series])
+
+    def test_Select_ValueArray(self):
+        with open(RESOURCE) as f:
+            doc = open_document(f)
+        path = "SampleSet/Sample/Category/Category/SeriesSet/Series/IndividualValueSet"
+        (valueset,) = doc.select(path)
+        self.assertIsInstance(valueset.values, ValueArray)
+
+        # Items of the array are matched like a list of value items
+        values = doc.select(path + "/I")
+        self.assertEqual(values, [IntType(x) for x in [1, 1, 2, 3, 5]])
+        self.assertEqual(doc.select(path + "/D"), [])
+        self.assertEqual(doc.select(path + "/*/I"), [])
+
+    def test_Compile(self):
+        self.assertIs(Query.compile(self.PATH), Query.compile(self.PATH))
+        with self.assertRaises(ValueError):
+            Query("")
+        with self.assertRaises(ValueError):
+            Query("A/[x]")
+
+    def test_RunMany(self):
+        docs = [self.doc, create_doc(["UV"]), create_doc(["HPLC"] * 4)]
+        query = Query.compile(self.PATH + "[@seriesID='time']")
+        self.assertEqual([len(x) for x in query.run_many(docs)], [2, 0, 4])
+
+
+if __name__ == "__main__":
+    unittest.main()
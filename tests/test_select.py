@@ -0,0 +1,108 @@
+import unittest
+from io import StringIO
+from xml.etree import ElementTree
+
+from animl2.core import Selection, iterparse_model, scrub_namespace
+from animl2.core.select import ALL, Step
+from animl2.models import AnIMLDoc
+
+RESOURCE = "tests/resources/animl_0.90.xml"
+
+XML = """<AnIML>
+    <SampleSet><Sample name="s" sampleID="1"/></SampleSet>
+    <ExperimentStepSet>
+        <ExperimentStep name="a" experimentStepID="S1">
+            <Technique name="t" uri="u"/>
+            <Result name="r1"/>
+        </ExperimentStep>
+        <ExperimentStep name="b" experimentStepID="S2">
+            <Result name="r2"/>
+        </ExperimentStep>
+    </ExperimentStepSet>
+</AnIML>"""
+
+
+class TestStep(unittest.TestCase):
+    def test_Parse(self):
+        self.assertEqual(Step.parse("Sample"), Step("Sample"))
+        self.assertEqual(Step.parse("*"), Step("*"))
+        self.assertEqual(
+            Step.parse("""Sample[@sampleID='a/b'][@name="n"]"""),
+            Step("Sample", (("sampleID", "a/b"), ("name", "n"))),
+        )
+
+    def test_Parse_Invalid(self):
+        for text in ["", "[@a='b']", "Sample[@a=b]", "Sample[a='b']", "Sample x"]:
+            with self.subTest(text=text):
+                self.assertRaisesRegex(
+                    ValueError, "Invalid path step", Step.parse, text
+                )
+
+    def test_Matches(self):
+        x = ElementTree.Element("Sample", sampleID="1")
+        self.assertTrue(Step("Sample").matches(x))
+        self.assertTrue(Step("*", (("sampleID", "1"),)).matches(x))
+        self.assertFalse(Step("Sample", (("sampleID", "2"),)).matches(x))
+        self.assertFalse(Step("Other").matches(x))
+
+
+class TestSelection(unittest.TestCase):
+    def test_Paths(self):
+        s = Selection(["A/B[@id='x/y']", "C"])
+        self.assertEqual(
+            s.paths, ((Step("A"), Step("B", (("id", "x/y"),))), (Step("C"),))
+        )
+
+    def test_Create(self):
+        s = Selection(["A"])
+        self.assertIs(Selection.create(s), s)
+        self.assertIsNone(Selection.create(None))
+        self.assertEqual(Selection.create("A").paths, s.paths)
+
+    def test_Empty(self):
+        self.assertRaisesRegex(ValueError, "Empty selection path", Selection, [""])
+
+    def test_Child(self):
+        s = Selection(["A/B"])
+        a = ElementTree.Element("A")
+        b = ElementTree.Element("B")
+
+        self.assertEqual(Selection.child(s.root, a), ((Step("B"),),))
+        self.assertIs(Selection.child(Selection.child(s.root, a), b), ALL)
+        self.assertEqual(Selection.child(s.root, b), ())
+        self.assertIs(Selection.child(ALL, b), ALL)
+
+    def test_Prune(self):
+        x = ElementTree.fromstring(XML)
+        pruned = Selection(["ExperimentStepSet/*/Result"]).prune(x)
+
+        self.assertEqual([c.tag for c in pruned], ["ExperimentStepSet"])
+        self.assertEqual([len(c) for c in pruned[0]], [1, 1])
+        self.assertEqual(len(x[1][0]), 2)  # Original is untouched
+
+
+class TestLoad(unittest.TestCase):
+    INCLUDE = ["ExperimentStepSet/ExperimentStep[@experimentStepID='S1']/Result"]
+
+    def check(self, doc: AnIMLDoc):
+        self.assertIsNone(doc.sample_set)
+        (step,) = doc.experiment_set.experiment_steps
+        self.assertEqual(step.experimentStepID, "S1")
+        self.assertIsNone(step.technique)
+        self.assertEqual([r.name for r in step.results], ["r1"])
+
+    def test_Iterparse(self):
+        self.check(iterparse_model(AnIMLDoc, StringIO(XML), include=self.INCLUDE))
+
+    def test_LoadXml(self):
+        self.check(AnIMLDoc.load_xml(ElementTree.fromstring(XML), include=self.INCLUDE))
+
+    def test_Subtree(self):
+        doc = iterparse_model(AnIMLDoc, RESOURCE, include=["SampleSet"])
+
+        et = ElementTree.parse(RESOURCE).getroot()
+        scrub_namespace(et)
+        full = AnIMLDoc.load_xml(et)
+
+        self.assertEqual(doc.sample_set, full.sample_set)
+        self.assertIsNone(doc.experiment_set)
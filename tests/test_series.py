@@ -1,9 +1,27 @@
+import math
 import unittest
+from array import array
+from datetime import datetime
 from xml.etree import ElementTree
 
 from animl2.core.base import XmlModel
 from animl2.models.series import Dependency, ParameterType, PlotScale, Series, SeriesSet
+from animl2.models.data_type import (
+    DateTimeType,
+    DoubleType,
+    IntType,
+    LongType,
+    StringType,
+)
+from animl2.models.infrastructure import Increment, StartValue
 from animl2.models.unit import SIUnit, Unit
+from animl2.models.valuesets import (
+    AutoIncrementedValueSet,
+    EncodedValueSet,
+    IndividualValueSet,
+    ValueArray,
+)
+from animl2.utils.binary import numpy
 
 
 class TestSeriesSet(unittest.TestCase):
@@ -95,3 +113,296 @@ class TestSeries(unittest.TestCase):
         self.assertEqual(s.dependency, Dependency.Independent)
         self.assertEqual(s.id, "A0")
         self.assertEqual(s.plotScale, PlotScale.none)
+
+    def test_ToArray(self):
+        self.example.append(EncodedValueSet.from_array([1, 2], ParameterType.Int32))
+        self.example.append(IndividualValueSet(values=[IntType(3), IntType(4)]))
+
+        self.assertEqual(list(self.example.to_array()), [1, 2, 3, 4])
+
+    def test_ToArray_Ranges(self):
+        # Placed by index range, not by order
+        self.example.append(IndividualValueSet(values=[IntType(7)], startIndex=7))
+        self.example.append(EncodedValueSet.from_array([5, 6], "Int32", startIndex=5))
+        self.example.append(
+            AutoIncrementedValueSet(
+                startValue=StartValue(IntType(0)),
+                increment=Increment(IntType(1)),
+                startIndex=0,
+                endIndex=4,
+            )
+        )
+        self.assertEqual(list(self.example.to_array()), [0, 1, 2, 3, 4, 5, 6, 7])
+
+    def test_ToArray_AutoIncremented(self):
+        self.example.append(
+            AutoIncrementedValueSet(
+                startValue=StartValue(IntType(10)), increment=Increment(IntType(-2))
+            )
+        )
+        self.assertRaisesRegex(ValueError, "needed", self.example.to_array)
+        self.assertEqual(list(self.example.to_array(length=3)), [10, 8, 6])
+
+    def test_ToArray_Gap(self):
+        self.example.append(EncodedValueSet.from_array([1], "Int32", startIndex=1))
+        self.assertRaisesRegex(ValueError, "no values at index", self.example.to_array)
+
+    def test_ToArray_Mismatch(self):
+        self.example.append(EncodedValueSet.from_array([1], "Int32", endIndex=1))
+        self.assertRaisesRegex(ValueError, "has 1 values", self.example.to_array)
+
+    @unittest.skipIf(numpy is None, "numpy not installed")
+    def test_ToArray_Numpy(self):
+        self.example.append(EncodedValueSet.from_array([1, 2], "Int32"))
+        self.example.append(IndividualValueSet(values=[IntType(3)]))
+
+        a = self.example.to_array(use_numpy=True)
+        self.assertEqual(a.dtype, numpy.dtype("<i4"))
+        self.assertEqual(a.tolist(), [1, 2, 3])
+
+
+class TestSeriesSetColumns(unittest.TestCase):
+    def setUp(self):
+        time = Series(
+            name="time",
+            dependency=Dependency.Independent,
+            seriesID="t",
+            seriesType=ParameterType.Float64,
+            valuesets=[
+                AutoIncrementedValueSet(
+                    startValue=StartValue(DoubleType(0.0)),
+                    increment=Increment(DoubleType(0.5)),
+                )
+            ],
+        )
+        signal = Series(
+            name="signal",
+            dependency=Dependency.Dependent,
+            seriesID="s",
+            seriesType=ParameterType.Int32,
+            valuesets=[EncodedValueSet.from_array([7, 8], "Int32", startIndex=1)],
+        )
+        label = Series(
+            name="label",
+            dependency=Dependency.Dependent,
+            seriesID="l",
+            seriesType=ParameterType.String,
+            valuesets=[IndividualValueSet(values=[StringType("a")])],
+        )
+        self.example = SeriesSet(
+            name="set", id=None, length=4, series=[time, signal, label]
+        )
+
+    def test_ToColumns(self):
+        columns = self.example.to_columns()
+        self.assertEqual(list(columns), ["t", "s", "l"])
+
+        t, s, label = columns.values()
+        self.assertTrue(t.independent)
+        self.assertEqual(t.values, array("d", [0.0, 0.5, 1.0, 1.5]))
+        self.assertIsNone(t.mask)
+
+        self.assertFalse(s.independent)
+        self.assertEqual(s.seriesType, ParameterType.Int32)
+        self.assertEqual(s.values.tolist(), [0, 7, 8, 0])
+        self.assertEqual(s.mask.tolist(), [1, 0, 0, 1])
+
+        self.assertEqual(label.values, ["a", None, None, None])
+        self.assertEqual(label.mask.tolist(), [0, 1, 1, 1])
+
+    def test_ToColumns_Float(self):
+        self.example.series[1].seriesType = ParameterType.Float32
+        self.example.series[1].valuesets[0] = EncodedValueSet.from_array(
+            [1.5], "Float32", startIndex=2
+        )
+        values = self.example.to_columns()["s"].values
+        self.assertTrue(math.isnan(values[0]))
+        self.assertEqual(values[2], 1.5)
+
+    @unittest.skipIf(numpy is None, "numpy not installed")
+    def test_ToColumns_Numpy(self):
+        t, s, label = self.example.to_columns(use_numpy=True).values()
+
+        self.assertEqual(t.values.dtype, numpy.dtype("<f8"))
+        self.assertEqual(s.values.dtype, numpy.dtype("<i4"))
+        self.assertEqual(s.mask.tolist(), [True, False, False, True])
+        self.assertEqual(label.values.dtype, numpy.dtype(object))
+
+        masked = numpy.ma.MaskedArray(s.values, mask=s.mask)
+        self.assertEqual(masked.sum(), 15)
+
+
+    @unittest.skipIf(numpy is None, "numpy not installed")
+    def test_ToColumns_DateTime(self):
+        times = [datetime(2021, 1, 1), datetime(2021, 1, 2)]
+        self.example.series[2].seriesType = ParameterType.DateTime
+        self.example.series[2].valuesets[0] = IndividualValueSet(
+            values=[DateTimeType(x) for x in times], startIndex=0
+        )
+        label = self.example.to_columns(use_numpy=True)["l"]
+        self.assertEqual(label.values.dtype, numpy.dtype("datetime64[us]"))
+        self.assertEqual(label.values.tolist(), times + [None, None])
+
+        s = SeriesSet.from_columns("set", {"t": label.values[:2]}, id="x")
+        self.assertEqual(s.series[0].seriesType, ParameterType.DateTime)
+        self.assertEqual(s.series[0].to_array(), times)
+
+
+    def test_Get(self):
+        self.assertIs(self.example.get("s"), self.example.series[1])
+        self.assertIsNone(self.example.get("x"))
+        x = self.example.append(
+            Series(
+                name="x",
+                dependency=Dependency.Dependent,
+                seriesID="x",
+                seriesType=ParameterType.Int32,
+            )
+        )
+        self.assertIs(self.example.get("x"), x)
+
+
+class TestSeriesSetFromColumns(unittest.TestCase):
+    def test_Auto(self):
+        s = SeriesSet.from_columns(
+            "set",
+            {
+                "t": array("d", [0.0, 0.5, 1.0]),
+                "y": array("i", [3, 1, 2]),
+                "n": ["a", "b", "c"],
+            },
+            types={"n": "String"},
+            independent=["t"],
+        )
+        self.assertEqual(s.length, 3)
+        t, y, n = s.series
+
+        self.assertEqual(t.dependency, Dependency.Independent)
+        self.assertEqual(t.seriesType, ParameterType.Float64)
+        self.assertIsInstance(t.valuesets[0], AutoIncrementedValueSet)
+        self.assertEqual(t.valuesets[0].endIndex, 2)
+
+        self.assertEqual(y.dependency, Dependency.Dependent)
+        self.assertEqual(y.seriesType, ParameterType.Int32)
+        self.assertIsInstance(y.valuesets[0], EncodedValueSet)
+
+        self.assertIsInstance(n.valuesets[0], IndividualValueSet)
+        self.assertEqual(n.valuesets[0].values[0], StringType("a"))
+
+        columns = s.to_columns()
+        self.assertEqual(columns["y"].values.tolist(), [3, 1, 2])
+        self.assertEqual(columns["n"].values, ["a", "b", "c"])
+
+    def test_Encoding(self):
+        columns = {"x": [1, 2, 3]}
+
+        s = SeriesSet.from_columns("set", columns, encoding="base64")
+        self.assertIsInstance(s.series[0].valuesets[0], EncodedValueSet)
+        self.assertEqual(s.series[0].seriesType, ParameterType.Int64)
+
+        s = SeriesSet.from_columns("set", columns, encoding="individual")
+        values = s.series[0].valuesets[0].values
+        self.assertEqual(values, ValueArray(LongType, [1, 2, 3]))
+
+        with self.assertRaisesRegex(ValueError, "Unknown encoding"):
+            SeriesSet.from_columns("set", columns, encoding="gzip")
+
+    def test_OutOfRange(self):
+        columns = {"n": [1, 2**40, 3]}
+        for encoding in ("auto", "base64", "individual"):
+            with self.subTest(encoding=encoding):
+                with self.assertRaisesRegex(ValueError, "Column 'n'.*range of Int32"):
+                    SeriesSet.from_columns(
+                        "set", columns, types={"n": "Int32"}, encoding=encoding
+                    )
+
+    def test_FloatSteps(self):
+        # Only auto incremented if start + i * step reproduces every value exactly
+        s = SeriesSet.from_columns("set", {"x": [0.0, 0.1, 0.2, 0.30000000000000004]})
+        self.assertIsInstance(s.series[0].valuesets[0], AutoIncrementedValueSet)
+
+        s = SeriesSet.from_columns("set", {"x": [0.0, 0.1, 0.2, 0.3]})
+        self.assertIsInstance(s.series[0].valuesets[0], EncodedValueSet)
+
+    def test_Length(self):
+        with self.assertRaisesRegex(ValueError, "same length"):
+            SeriesSet.from_columns("set", {"a": [1], "b": []})
+
+    def test_RoundTrip(self):
+        s = SeriesSet.from_columns("set", {"x": array("f", [1.5, 2.5, 4.0])}, id="a")
+        xml = ElementTree.tostring(s.dump_xml())
+        loaded = SeriesSet.load_xml(ElementTree.fromstring(xml))
+
+        self.assertEqual(loaded.to_columns()["x"].values, array("f", [1.5, 2.5, 4.0]))
+
+    def test_RoundTrip_Float32Steps(self):
+        # Start and step are not exact in single precision, as they are dumped
+        values = [0.13436424 + i * 0.84743374 for i in range(5)]
+        for columns in ({"x": values}, {"x": array("f", values)}):
+            with self.subTest(columns=columns):
+                s = SeriesSet.from_columns(
+                    "set", columns, types={"x": "Float32"}, id="a"
+                )
+                xml = ElementTree.tostring(s.dump_xml())
+                loaded = SeriesSet.load_xml(ElementTree.fromstring(xml))
+
+                column = loaded.to_columns()["x"].values
+                self.assertEqual(column, array("f", values))
+
+    def test_RoundTrip_NoId(self):
+        s = SeriesSet.from_columns("set", {"x": [1, 5, 2]})
+        xml = ElementTree.tostring(s.dump_xml())
+        loaded = SeriesSet.load_xml(ElementTree.fromstring(xml))
+        self.assertIsNone(loaded.id)
+        self.assertEqual(loaded, s)
+
+    def test_Empty(self):
+        s = SeriesSet.from_columns("set", {"x": [], "y": array("d")})
+        self.assertEqual(s.length, 0)
+        for series in s.series:
+            self.assertIsNone(series.valuesets[0].endIndex)
+        xml = s.dump_xml()
+        self.assertNotIn("endIndex", xml.find("Series/EncodedValueSet").attrib)
+        loaded = SeriesSet.load_xml(xml)
+        self.assertEqual(len(loaded.to_columns()["y"].values), 0)
+
+    def test_UnknownType(self):
+        for values, kind in [
+            (["a", "b"], "non-numeric values"),
+            ([True, False], "booleans"),
+            (array("B", [1, 2]), "array typecode 'B'"),
+        ]:
+            with self.subTest(kind=kind):
+                with self.assertRaisesRegex(ValueError, f"Column 'x'.*{kind}.*types"):
+                    SeriesSet.from_columns("set", {"x": values})
+
+        s = SeriesSet.from_columns("set", {"x": ["a", "b"]}, types={"x": "String"})
+        self.assertEqual(s.series[0].seriesType, ParameterType.String)
+        with self.assertRaisesRegex(ValueError, "Column 'x'"):
+            SeriesSet.from_columns("set", {"x": ["a", "b"]}, types={"x": "Float64"})
+
+    @unittest.skipIf(numpy is None, "numpy not installed")
+    def test_UnknownType_Numpy(self):
+        for dtype in ("u1", "u4", "?"):
+            with self.subTest(dtype=dtype):
+                values = numpy.ones(3, dtype=dtype)
+                with self.assertRaisesRegex(ValueError, "Column 'x'.*dtype"):
+                    SeriesSet.from_columns("set", {"x": values})
+                s = SeriesSet.from_columns("set", {"x": values}, types={"x": "Int64"})
+                self.assertEqual(s.to_columns()["x"].values.tolist(), [1, 1, 1])
+
+    @unittest.skipIf(numpy is None, "numpy not installed")
+    def test_Numpy(self):
+        s = SeriesSet.from_columns(
+            "set",
+            {"t": numpy.arange(5, dtype="<i8"), "y": numpy.ones(5, dtype="<f4")},
+            encoding="auto",
+        )
+        t, y = s.series
+        self.assertEqual(t.seriesType, ParameterType.Int64)
+        self.assertIsInstance(t.valuesets[0], AutoIncrementedValueSet)
+        self.assertEqual(y.seriesType, ParameterType.Float32)
+        self.assertIsInstance(y.valuesets[0], AutoIncrementedValueSet)  # Step 0
+
+        t = s.to_columns(use_numpy=True)["t"]
+        self.assertEqual(t.values.tolist(), [0, 1, 2, 3, 4])
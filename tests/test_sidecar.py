@@ -0,0 +1,203 @@
+import base64
+import os
+import pickle
+import tempfile
+import unittest
+from array import array
+from io import BytesIO
+from unittest import mock
+from xml.etree import ElementTree
+
+from animl2.core import write_model
+from animl2.models import (
+    AnIMLDoc,
+    ExperimentStep,
+    Result,
+    SeriesSet,
+    Sidecar,
+)
+from animl2.models.data_type import EmbeddedXmlType, PNGType, SVGType
+from animl2.models.parameter import ParameterType
+from animl2.models.valuesets import EncodedValueSet as EVS
+from animl2.models.valuesets import IndividualValueSet as IVS
+from animl2.models.valuesets import ValueArray
+from animl2.utils.binary import numpy
+
+RESOURCE = "tests/resources/animl_0.90.xml"
+
+
+class TestSidecar(unittest.TestCase):
+    def setUp(self):
+        fd, self.path = tempfile.mkstemp(suffix=".bin")
+        os.close(fd)
+        self.sidecar = Sidecar(self.path)
+
+    def tearDown(self):
+        self.sidecar.close()
+        os.remove(self.path)
+
+    def test_AppendView(self):
+        a = self.sidecar.append(b"abc")
+        b = self.sidecar.append(b"defgh")
+        self.assertEqual((a.offset, a.length), (0, 3))
+        self.assertEqual((b.offset, b.length), (3, 5))
+        self.assertEqual(bytes(a.view()), b"abc")
+        self.assertEqual(bytes(b.view()), b"defgh")
+        self.assertTrue(a.view().readonly)
+
+    def test_View_Grown(self):
+        a = self.sidecar.append(b"abc")
+        old = a.view()
+        b = self.sidecar.append(b"def")
+        self.assertEqual(bytes(b.view()), b"def")
+        self.assertEqual(bytes(old), b"abc")
+
+    def test_View_Empty(self):
+        self.assertEqual(bytes(self.sidecar.append(b"").view()), b"")
+
+    def test_View_Missing(self):
+        self.sidecar.append(b"abc")
+        with self.assertRaises(ValueError):
+            self.sidecar.view(2, 5)
+
+    def test_ReadOnly(self):
+        with Sidecar(self.path, writable=False) as s:
+            with self.assertRaises(ValueError):
+                s.append(b"abc")
+
+    def test_Offload(self):
+        values = array("d", [1.5, 2.5, 3.5])
+        s = EVS.from_array(values, ParameterType.Float64, startIndex=0, endIndex=2)
+        value = s.value
+        s.offload(self.sidecar)
+
+        self.assertTrue(s.offloaded)
+        self.assertIsNone(s.value)
+        self.assertEqual(s.to_array(ParameterType.Float64), values)
+        self.assertEqual(s, EVS(value=value, startIndex=0, endIndex=2))
+        self.assertEqual(os.path.getsize(self.path), 24)
+
+        # Restored inline on dump and write
+        self.assertEqual(s.dump_xml().text, value.decode("ascii"))
+        f = BytesIO()
+        write_model(s, f, xml_declaration=False)
+        self.assertEqual(ElementTree.fromstring(f.getvalue()).text, value.decode())
+
+    def test_Offload_Numpy(self):
+        if numpy is None:
+            self.skipTest("numpy not installed")
+        s = EVS.from_array(array("i", [1, 2, 3]), ParameterType.Int32)
+        s.offload(self.sidecar)
+        values = s.to_array(ParameterType.Int32, use_numpy=True)
+        self.assertEqual(values.tolist(), [1, 2, 3])
+        self.assertFalse(values.flags.writeable)
+
+    def test_Offload_Replaced(self):
+        s = EVS.from_array(array("i", [1, 2]), ParameterType.Int32)
+        s.offload(self.sidecar)
+        s.value = EVS.from_array(array("i", [3]), ParameterType.Int32).value
+        self.assertFalse(s.offloaded)
+        self.assertEqual(s.to_array(ParameterType.Int32), array("i", [3]))
+
+    def test_Offload_Write_Chunks(self):
+        values = array("d", range(100))
+        s = EVS.from_array(values, ParameterType.Float64)
+        value = s.value
+        s.offload(self.sidecar)
+        parts = []
+        with mock.patch("animl2.models.valuesets.WRITE_CHUNK_SIZE", 16):
+            s._write_xml_text_(parts.append)
+        self.assertGreater(len(parts), 1)
+        self.assertEqual(b"".join(parts), value)
+
+    def test_Pickle(self):
+        s = EVS.from_array(array("i", [1, 2, 3]), ParameterType.Int32)
+        s.offload(self.sidecar)
+        s.data  # Mapped
+        copy = pickle.loads(pickle.dumps(s))
+        self.assertFalse(copy._sidecar.sidecar.writable)
+        self.assertEqual(copy.to_array(ParameterType.Int32), array("i", [1, 2, 3]))
+        copy._sidecar.sidecar.close()
+
+    def test_Load(self):
+        doc = AnIMLDoc()
+        step = doc.append(ExperimentStep(name="Step", experimentStepID="S1"))
+        result = step.append(Result(name="Result"))
+        result.series = SeriesSet.from_columns(
+            "Set", {"x": array("d", [1, 2, 3])}, encoding="base64", id="SS1"
+        )
+        xml = ElementTree.tostring(doc.dump_xml(), encoding="unicode")
+
+        loaded = AnIMLDoc.loads(xml, sidecar=self.sidecar)
+        series = loaded.experiment_set.experiment_steps[0].results[0].series
+        evs = series.series[0].valuesets[0]
+        self.assertTrue(evs.offloaded)
+        self.assertEqual(os.path.getsize(self.path), 24)
+        self.assertEqual(loaded, doc)
+        self.assertEqual(ElementTree.tostring(loaded.dump_xml(), encoding="unicode"), xml)
+
+    def test_Load_Wrapped(self):
+        with open(RESOURCE) as f:
+            xml = f.read()
+        xml = xml.replace(">00010002000300040005<", ">\n  0001000200\n  0300040005\n<")
+        loaded = AnIMLDoc.loads(xml, sidecar=self.sidecar)
+        sample = loaded.sample_set.samples[0]
+        series = sample.category[0].sub_categories[0].series_sets[0].series
+        evs = series[2].valuesets[0]
+        self.assertTrue(evs.offloaded)
+        self.assertEqual(evs.data, base64.b64decode("00010002000300040005"))
+
+    def test_Offload_Tree(self):
+        ss = SeriesSet.from_columns(
+            "Set",
+            {"x": array("d", [1, 2]), "y": array("i", [3, 4])},
+            encoding="base64",
+            id="SS1",
+        )
+        self.assertIs(self.sidecar.offload(ss), ss)
+        self.assertTrue(all(s.valuesets[0].offloaded for s in ss.series))
+        self.assertEqual(os.path.getsize(self.path), 24)
+        self.assertEqual(ss.to_columns()["y"].values, array("i", [3, 4]))
+
+    def test_Offload_Document(self):
+        with open(RESOURCE) as f:
+            xml = f.read()
+        doc = AnIMLDoc.loads(xml)
+        expected = ElementTree.tostring(doc.dump_xml())
+
+        self.assertIs(self.sidecar.offload(doc), doc)  # Numeric values are skipped
+        sample = doc.sample_set.samples[0]
+        series = sample.category[0].sub_categories[0].series_sets[0].series
+        self.assertIsInstance(series[0].valuesets[0].values, ValueArray)
+        self.assertTrue(series[2].valuesets[0].offloaded)
+        self.assertEqual(ElementTree.tostring(doc.dump_xml()), expected)
+
+    def test_Offload_Payloads(self):
+        png = b"\x89PNG" + bytes(range(10))
+        s = IVS(
+            values=[
+                PNGType(value=base64.b64encode(png)),
+                SVGType(value="<svg>\u00b5</svg>"),
+                EmbeddedXmlType(value=None),
+            ]
+        )
+        xml = ElementTree.tostring(s.dump_xml())
+        self.sidecar.offload(s)
+
+        image, svg, embedded = s.values
+        self.assertTrue(image.offloaded and svg.offloaded)
+        self.assertFalse(embedded.offloaded)  # Nothing to store
+        self.assertEqual(bytes(image.data), png)
+        with image.open() as f:
+            self.assertEqual(f.read(), png)
+        with svg.open() as f:
+            self.assertEqual(f.read(), "<svg>\u00b5</svg>")
+
+        self.assertEqual(ElementTree.tostring(s.dump_xml()), xml)
+        f = BytesIO()
+        write_model(s, f, xml_declaration=False)
+        self.assertEqual(ElementTree.tostring(ElementTree.fromstring(f.getvalue())), xml)
+
+
+if __name__ == "__main__":
+    unittest.main()
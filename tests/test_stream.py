@@ -0,0 +1,143 @@
+import unittest
+from io import BytesIO, StringIO
+from unittest import mock
+from xml.etree import ElementTree
+
+from animl2.core import (
+    iterparse_model,
+    iterparse_models,
+    scrub_namespace,
+    strip_namespace,
+    write_model,
+)
+from animl2.models import AnIMLDoc, EncodedValueSet, Sample, SampleSet
+
+RESOURCE = "tests/resources/animl_0.90.xml"
+
+
+class TestIterparse(unittest.TestCase):
+    def test_SameAsLoadXml(self):
+        et = ElementTree.parse(RESOURCE).getroot()
+        scrub_namespace(et)
+
+        self.assertEqual(iterparse_model(AnIMLDoc, RESOURCE), AnIMLDoc.load_xml(et))
+
+    def test_Namespace(self):
+        xml = b"""<?xml version="1.0" encoding="UTF-8"?>
+        <AnIML xmlns="urn:org:astm:animl:schema:core:draft:0.90" version="0.90">
+            <SampleSet><Sample name="s" sampleID="1"/></SampleSet>
+        </AnIML>
+        """
+        doc = iterparse_model(AnIMLDoc, BytesIO(xml))
+
+        self.assertEqual(doc.sample_set.samples[0].sampleID, "1")
+
+    def test_Validate(self):
+        xml = '<SampleSet id="0bad"/>'
+        self.assertRaisesRegex(
+            ValueError, "must match regex", iterparse_model, SampleSet, StringIO(xml)
+        )
+
+        s = iterparse_model(SampleSet, StringIO(xml), validate=False)
+        self.assertEqual(s.id, "0bad")
+
+    def test_WrongRoot(self):
+        self.assertRaisesRegex(
+            ValueError,
+            "Expected tag 'AnIML', got 'SampleSet'",
+            iterparse_model,
+            AnIMLDoc,
+            StringIO("<SampleSet/>"),
+        )
+
+    def test_UnknownChild(self):
+        self.assertRaisesRegex(
+            ValueError,
+            "Unable to find class with tag 'Unknown'",
+            iterparse_model,
+            SampleSet,
+            StringIO("<SampleSet><Unknown/></SampleSet>"),
+        )
+
+    def test_StripNamespace(self):
+        self.assertEqual(strip_namespace("{urn:a:b}Tag"), "Tag")
+        self.assertEqual(strip_namespace("Tag"), "Tag")
+
+
+class TestIterparseModels(unittest.TestCase):
+    PATH = ("ExperimentStepSet", "ExperimentStep")
+
+    def test_Items(self):
+        doc = iterparse_model(AnIMLDoc, RESOURCE)
+        steps = list(iterparse_models(AnIMLDoc, RESOURCE, path=self.PATH))
+
+        self.assertEqual(steps, doc.experiment_set.experiment_steps)
+
+    def test_Root(self):
+        (doc,) = iterparse_models(AnIMLDoc, RESOURCE)
+        self.assertIsInstance(doc, AnIMLDoc)
+
+    def test_Skip(self):
+        xml = """<AnIML><ExperimentStepSet>
+            <ExperimentStep name="a" experimentStepID="1">
+                <Result name="r"><Unknown/></Result>
+            </ExperimentStep>
+        </ExperimentStepSet></AnIML>"""
+
+        (step,) = iterparse_models(
+            AnIMLDoc, StringIO(xml), path=self.PATH, skip=("Result",)
+        )
+        self.assertEqual(step.experimentStepID, "1")
+        self.assertIsNone(step.results)
+
+    def test_NoMatch(self):
+        xml = "<AnIML><SampleSet/></AnIML>"
+        self.assertEqual(list(iterparse_models(AnIMLDoc, StringIO(xml), self.PATH)), [])
+
+    def test_Validate(self):
+        xml = """<AnIML><ExperimentStepSet>
+            <ExperimentStep name="a" experimentStepID="1" id="0bad"/>
+        </ExperimentStepSet></AnIML>"""
+
+        items = iterparse_models(AnIMLDoc, StringIO(xml), self.PATH)
+        self.assertRaisesRegex(ValueError, "must match regex", list, items)
+
+        items = iterparse_models(AnIMLDoc, StringIO(xml), self.PATH, validate=False)
+        self.assertEqual(next(items).id, "0bad")
+        # Validation is back on outside of the generator
+        self.assertRaisesRegex(ValueError, "must match regex", SampleSet, id="0bad")
+
+
+class TestWriteModel(unittest.TestCase):
+    def test_SameAsDumpXml(self):
+        doc = iterparse_model(AnIMLDoc, RESOURCE)
+
+        stream = BytesIO()
+        write_model(doc, stream)
+        written = ElementTree.fromstring(stream.getvalue())
+        scrub_namespace(written)
+
+        self.assertEqual(AnIMLDoc.load_xml(written), doc)
+
+    def test_Escape(self):
+        s = SampleSet(samples=[Sample(name='a "<&>"', sampleID="1")])
+
+        stream = BytesIO()
+        write_model(s, stream, xml_declaration=False)
+
+        self.assertEqual(
+            stream.getvalue(),
+            b"<SampleSet><Sample name='a \"&lt;&amp;&gt;\"' sampleID=\"1\" />"
+            b"</SampleSet>",
+        )
+
+    def test_EncodedValueSet(self):
+        s = EncodedValueSet.from_array(range(100), "Int32", startIndex=0)
+
+        stream = mock.Mock()
+        with mock.patch("animl2.models.valuesets.WRITE_CHUNK_SIZE", 64):
+            write_model(s, stream, xml_declaration=False)
+
+        chunks = [c.args[0] for c in stream.write.call_args_list]
+        self.assertEqual(bytes(b"".join(chunks[1:-1])), s.value)
+        self.assertEqual(len(chunks), 2 + len(s.value) // 64 + 1)
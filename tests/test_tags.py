@@ -9,6 +9,11 @@ class Test_Tag(unittest.TestCase):
     def test_Inheritance(self):
         self.assertTrue(issubclass(Tag, XmlModel))
 
+    def test_InvalidName(self):
+        for name in (" tag", "tag  1", "tag\n", "t" * 1025):
+            with self.subTest(name=name), self.assertRaises(ValueError):
+                Tag(name=name)
+
     def test_Dump(self):
         obj = Tag(
             name="Tag 1",
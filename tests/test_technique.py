@@ -9,6 +9,13 @@ class Test_Extension(unittest.TestCase):
     def test_Inheritance(self):
         self.assertTrue(issubclass(Extension, XmlModel))
 
+    def test_AnyChecksum(self):
+        # The schema types sha256 as a token, the hex format is not enforced
+        for checksum in ("256", "ABCDEF", "a" * 65):
+            with self.subTest(checksum=checksum):
+                obj = Extension(name="Extension 1", uri="ext", sha256=checksum)
+                self.assertEqual(obj.sha256, checksum)
+
     def test_Dump(self):
         obj = Extension(
             name="Extension 1",
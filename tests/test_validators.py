@@ -0,0 +1,60 @@
+import re
+import unittest
+
+from animl2.utils.regex import NC_NAME, SHA256, TOKEN
+from animl2.utils.validators import compile_validator, is_nc_name, is_sha256, is_token
+
+
+class TestValidators(unittest.TestCase):
+    def check(self, validator, regex, tests):
+        for value, expected in tests:
+            with self.subTest(value=value):
+                self.assertEqual(validator(value), expected)
+                self.assertEqual(re.match(regex, value) is not None, expected)
+
+    def test_NCName(self):
+        tests = [
+            ("alpha", True),
+            ("Delta_Epsilon", True),
+            ("psi.omega-1", True),
+            ("_underscore", True),
+            ("", False),
+            ("123alpha", False),
+            ("beta gamma", False),
+            ("Alpha#Beta", False),
+        ]
+        self.check(is_nc_name, NC_NAME, tests)
+
+    def test_Token(self):
+        tests = [
+            ("", True),
+            ("token", True),
+            ("two words", True),
+            ("x" * 1024, True),
+            ("x" * 1025, False),
+            (" leading", False),
+            ("trailing ", False),
+            ("double  space", False),
+            ("tab\there", False),
+            ("new\nline", False),
+            ("newline\n", False),
+        ]
+        self.check(is_token, TOKEN, tests)
+
+    def test_SHA256(self):
+        tests = [
+            ("0123456789abcdef" * 4, True),
+            ("0123456789ABCDEF" * 4, False),
+            ("0123456789abcdef" * 3, False),
+            ("0123456789abcdeg" * 4, False),
+            ("0123456789abcdef" * 4 + "\n", False),
+        ]
+        self.check(is_sha256, SHA256, tests)
+
+    def test_Compile(self):
+        self.assertIs(compile_validator(NC_NAME), is_nc_name)
+        self.assertIs(compile_validator(TOKEN), is_token)
+
+        validator = compile_validator(r"^a+$")
+        self.assertTrue(validator("aaa"))
+        self.assertFalse(validator("b"))
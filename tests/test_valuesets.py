@@ -1,11 +1,30 @@
+import base64
+import pickle
+import struct
 import unittest
+from array import array
+from datetime import datetime, timedelta, timezone
+from io import StringIO
+from unittest import mock
 from xml.etree import ElementTree
 
-from animl2.core import XmlModel
-from animl2.models.data_type import DoubleType, FloatType, IntType, LongType
+from animl2.core import XmlModel, iterparse_model
+from animl2.models.base import AnIMLDocBase
+from animl2.models.infrastructure import Increment, StartValue
+from animl2.models.data_type import (
+    DateTimeType,
+    DoubleType,
+    FloatType,
+    IntType,
+    LongType,
+    StringType,
+)
+from animl2.models.parameter import ParameterType
 from animl2.models.valuesets import AutoIncrementedValueSet as AIVS
 from animl2.models.valuesets import EncodedValueSet as EVS
 from animl2.models.valuesets import IndividualValueSet as IVS
+from animl2.models.valuesets import ValueArray
+from animl2.utils.binary import numpy
 
 
 class TestAutoIncrSets(unittest.TestCase):
@@ -116,3 +135,252 @@ class TestIndividualValueSet(unittest.TestCase):
         self.assertEqual(s.startIndex, 0)
         self.assertEqual(s.endIndex, 10)
         self.assertEqual(len(s.values), 2)
+
+    def test_FromArray(self):
+        s = EVS.from_array([1.5, -2.0], "Float64", startIndex=0, endIndex=1)
+
+        self.assertEqual(s.value, base64.b64encode(struct.pack("<2d", 1.5, -2.0)))
+        self.assertEqual(s.startIndex, 0)
+        self.assertEqual(s.endIndex, 1)
+
+    def test_ToArray(self):
+        s = EVS(value=base64.b64encode(struct.pack("<3i", 1, -2, 3)))
+
+        a = s.to_array(ParameterType.Int32)
+        self.assertIsInstance(a, array)
+        self.assertEqual(list(a), [1, -2, 3])
+
+    def test_RoundTrip(self):
+        for dtype, values in [
+            ("Int32", [0, 2**31 - 1, -(2**31)]),
+            ("Int64", [0, 2**63 - 1, -(2**63)]),
+            ("Float32", [0.5, -1.25]),
+            ("Float64", [0.1, 1e300]),
+        ]:
+            with self.subTest(dtype=dtype):
+                s = EVS.from_array(values, dtype)
+                self.assertEqual(list(s.to_array(dtype)), values)
+
+    def test_Data(self):
+        raw = struct.pack("<2q", 1, 2)
+        s = EVS(value=base64.b64encode(raw))
+
+        self.assertEqual(s.data, raw)
+        self.assertIs(s.data, s.data)  # Decoded once
+        self.assertTrue(s.data.readonly)
+
+        s.value = base64.b64encode(raw[:8])
+        self.assertEqual(s.data, raw[:8])
+
+    def test_Data_SingleCopy(self):
+        raw = struct.pack("<2q", 1, 2)
+        encoded = base64.b64encode(raw)
+        txt = f"<EncodedValueSet>{encoded.decode()}</EncodedValueSet>"
+        s = iterparse_model(EVS, StringIO(txt), validate=False)
+        self.assertIsInstance(s.__dict__["_encoded"], str)  # Text as loaded
+
+        self.assertEqual(s.data, raw)
+        self.assertIsNone(s.__dict__["_encoded"])  # Dropped once decoded
+        self.assertEqual(s.value, encoded)  # Encoded again, not kept
+        self.assertIsNone(s.__dict__["_encoded"])
+        self.assertEqual(s.dump_xml().text, encoded.decode())
+
+        s.value = base64.b64encode(raw[:8])
+        self.assertNotIn("_raw", s.__dict__)
+        self.assertEqual(s.data, raw[:8])
+
+    def test_Pickle(self):
+        s = EVS.from_array([1.5, 2.5], "Float64", startIndex=0, endIndex=1)
+        loaded = pickle.loads(pickle.dumps(s))
+        self.assertEqual(loaded, s)
+        self.assertEqual(loaded.to_array("Float64").tolist(), [1.5, 2.5])
+
+    def test_Data_FromArray(self):
+        s = EVS.from_array([1.0], "Float64")
+        with mock.patch("base64.b64decode") as b64decode:
+            self.assertEqual(s.to_array("Float64").tolist(), [1.0])
+        b64decode.assert_not_called()
+
+    def test_ToArray_Whitespace(self):
+        encoded = base64.encodebytes(struct.pack("<6i", *range(6))).decode()
+        txt = f"<EncodedValueSet>\n    {encoded[:12]}\n    {encoded[12:]}  </EncodedValueSet>"
+        s = iterparse_model(EVS, StringIO(txt), validate=False)
+        self.assertEqual(s.to_array("Int32").tolist(), list(range(6)))
+
+    def test_ToArray_Invalid(self):
+        s = EVS(value=base64.b64encode(b"12345"))
+        self.assertRaisesRegex(ValueError, "not a multiple of 4", s.to_array, "Int32")
+        self.assertRaisesRegex(ValueError, "can not be binary", s.to_array, "String")
+
+    @unittest.skipIf(numpy is None, "numpy not installed")
+    def test_Numpy(self):
+        values = numpy.arange(5, dtype="<f4")
+        s = EVS.from_array(values, "Float32")
+
+        a = s.to_array("Float32", use_numpy=True)
+        self.assertIsInstance(a, numpy.ndarray)
+        self.assertEqual(a.dtype, numpy.dtype("<f4"))
+        self.assertTrue((a == values).all())
+
+
+class TestValueArray(unittest.TestCase):
+    def test_Sequence(self):
+        a = ValueArray(DoubleType, [1.0, 2.5])
+
+        self.assertEqual(len(a), 2)
+        self.assertEqual(a[1], DoubleType(value=2.5))
+        self.assertEqual(a[-1:], ValueArray(DoubleType, [2.5]))
+        self.assertEqual(a, [DoubleType(value=1.0), DoubleType(value=2.5)])
+
+        a.append(DoubleType(value=3.0))
+        a.append(4)
+        a[0] = 0.5
+        del a[1]
+        self.assertEqual(list(a.data), [0.5, 3.0, 4.0])
+
+    def test_WrongType(self):
+        a = ValueArray(IntType, [1])
+        self.assertRaisesRegex(TypeError, "Expected IntType", a.append, LongType(2))
+        self.assertRaises(TypeError, ValueArray, StringType)
+
+    def test_FromValues(self):
+        a = ValueArray.from_values([IntType(1), IntType(2)])
+        self.assertEqual(a, ValueArray(IntType, [1, 2]))
+
+        self.assertIsNone(ValueArray.from_values([]))
+        self.assertIsNone(ValueArray.from_values([IntType(1), LongType(2)]))
+        self.assertIsNone(ValueArray.from_values([StringType("a")]))
+        self.assertIsNone(ValueArray.from_values([IntType(2**40)]))  # Not 32 bits
+
+    def test_OutOfRange(self):
+        msg = "out of range of Int32"
+        self.assertRaisesRegex(ValueError, msg, ValueArray, IntType, [1, 2**31])
+        a = ValueArray(IntType, [1])
+        self.assertRaisesRegex(ValueError, msg, a.append, IntType(-(2**31) - 1))
+        self.assertRaisesRegex(ValueError, msg, a.__setitem__, 0, 2**40)
+        self.assertRaisesRegex(ValueError, msg, a.__setitem__, slice(0, 1), [2**40])
+        self.assertEqual(list(a.data), [1])
+        ValueArray(LongType, [2**40])  # Fits in 64 bits
+
+
+class TestIndividualValueSetArray(unittest.TestCase):
+    TXT = "<IndividualValueSet><D>1.5</D><D>-2</D><D>1e300</D></IndividualValueSet>"
+
+    def check(self, s: IVS):
+        self.assertIsInstance(s.values, ValueArray)
+        self.assertEqual(s.values.model, DoubleType)
+        self.assertEqual(list(s.values.data), [1.5, -2.0, 1e300])
+
+    def test_Load(self):
+        self.check(IVS.load_xml(ElementTree.fromstring(self.TXT)))
+
+    def test_Load_Compiled(self):
+        with mock.patch.object(AnIMLDocBase, "compile_models", True):
+            self.check(IVS.load_xml(ElementTree.fromstring(self.TXT)))
+            xml = IVS.from_array(DoubleType, [1.0]).dump_xml()
+        self.assertEqual([x.text for x in xml], ["1.0"])
+
+    def test_Load_Stream(self):
+        self.check(iterparse_model(IVS, StringIO(self.TXT)))
+
+    def test_Load_Mixed(self):
+        txt = "<IndividualValueSet><D>1.5</D><I>2</I></IndividualValueSet>"
+        s = IVS.load_xml(ElementTree.fromstring(txt))
+        self.assertEqual(s.values, [DoubleType(1.5), IntType(2)])
+
+    def test_Dump(self):
+        s = IVS.from_array(IntType, [1, 2], startIndex=0, endIndex=1)
+        xml = s.dump_xml()
+
+        self.assertEqual(xml.attrib["endIndex"], "1")
+        self.assertEqual([(x.tag, x.text) for x in xml], [("I", "1"), ("I", "2")])
+
+    def test_Validate(self):
+        s = IVS.from_array(LongType, [1, 2])
+        s.validate()  # No exception
+
+
+UTC_PLUS_2 = timezone(timedelta(hours=2))
+
+
+class TestIndividualValueSetDateTime(unittest.TestCase):
+    TXT = (
+        "<IndividualValueSet>"
+        "<DateTime>2021-01-01T00:00:00</DateTime>"
+        "<DateTime>2021-01-01T00:00:01.500000+02:00</DateTime>"
+        "</IndividualValueSet>"
+    )
+
+    def test_Load(self):
+        s = IVS.load_xml(ElementTree.fromstring(self.TXT))
+        self.assertEqual(
+            s.values,
+            [
+                DateTimeType(datetime(2021, 1, 1)),
+                DateTimeType(datetime(2021, 1, 1, 0, 0, 1, 500000, tzinfo=UTC_PLUS_2)),
+            ],
+        )
+        xml = ElementTree.tostring(s.dump_xml(), encoding="unicode")
+        self.assertEqual(xml, self.TXT)
+
+    def test_Load_Invalid(self):
+        txt = "<IndividualValueSet><DateTime>x</DateTime></IndividualValueSet>"
+        with self.assertRaises(ValueError):
+            IVS.load_xml(ElementTree.fromstring(txt))
+
+
+class TestAutoIncrementedArray(unittest.TestCase):
+    def create(self, start, step, startIndex=0, endIndex=4):
+        return AIVS(
+            startValue=StartValue(start),
+            increment=Increment(step),
+            startIndex=startIndex,
+            endIndex=endIndex,
+        )
+
+    def test_Sequence(self):
+        s = self.create(IntType(5), IntType(2))
+
+        self.assertEqual(len(s), 5)
+        self.assertEqual(s[0], 5)
+        self.assertEqual(s[-1], 13)
+        self.assertRaises(IndexError, s.__getitem__, 5)
+        self.assertEqual(list(s), [5, 7, 9, 11, 13])
+
+    def test_UnknownLength(self):
+        s = self.create(IntType(0), IntType(1), endIndex=None)
+        self.assertRaisesRegex(ValueError, "Length unknown", len, s)
+        self.assertTrue(s)
+
+    def test_ToArray(self):
+        a = self.create(IntType(5), IntType(2)).to_array()
+        self.assertEqual(a.tolist(), [5, 7, 9, 11, 13])
+
+        a = self.create(DoubleType(0.0), DoubleType(0.1)).to_array("Float64", 3)
+        self.assertEqual(a.typecode, "d")
+        self.assertEqual(a.tolist(), [0.0, 0.1, 0.2])
+
+        a = self.create(IntType(0), IntType(0)).to_array("Int32", 2)
+        self.assertEqual(a.tolist(), [0, 0])
+
+    def test_FromArray_Float32(self):
+        # Exact in double, but not once start and step are stored in single precision
+        values = [0.13436424 + i * 0.84743374 for i in range(5)]
+        self.assertIsNotNone(AIVS.from_array(values, "Float64"))
+        self.assertIsNone(AIVS.from_array(values, "Float32"))
+
+        s = AIVS.from_array(array("f", [0.5, 0.75, 1.0]), "Float32")
+        self.assertEqual((s.start, s.step), (0.5, 0.25))
+
+    def test_FromArray_StepOutOfRange(self):
+        self.assertIsNone(AIVS.from_array([-(2**31), 2**31 - 1], "Int32"))
+
+    @unittest.skipIf(numpy is None, "numpy not installed")
+    def test_ToArray_Numpy(self):
+        a = self.create(DoubleType(1.0), DoubleType(0.5)).to_array(use_numpy=True)
+        self.assertEqual(a.dtype, numpy.dtype("<f8"))
+        self.assertEqual(a.tolist(), [1.0, 1.5, 2.0, 2.5, 3.0])
+
+        a = self.create(IntType(1), IntType(3)).to_array("Int32", use_numpy=True)
+        self.assertEqual(a.dtype, numpy.dtype("<i4"))
+        self.assertEqual(a.tolist(), [1, 4, 7, 10, 13])